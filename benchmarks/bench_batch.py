@@ -0,0 +1,40 @@
+'''Benchmark: gradient of f(x) = sum_i x[i]*x[i+1] + sin(x[i]) at N sample
+points, one J_F call per point against a single J_F_batch call.
+
+USAGE
+=====
+    python benchmarks/bench_batch.py            # uses ./hotAD
+    python benchmarks/bench_batch.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F, J_F_batch
+
+M = 10
+
+def chain(x):
+    s = 0
+    for i in range(len(x) - 1):
+        s = s + x[i] * x[i+1] + ef.sin(x[i])
+    return [s]
+
+def pointwise(X):
+    return np.array([J_F(chain, list(x))[1] for x in X])
+
+def batched(X):
+    return J_F_batch(chain, X)[1]
+
+if __name__ == "__main__":
+    print("{:>7} {:>16} {:>16}".format("N", "J_F loop (ms)", "J_F_batch (ms)"))
+    for N in (10, 100, 1000, 10000):
+        X = np.random.RandomState(0).uniform(-1, 1, (N, M))
+        loop = min(timeit.repeat(lambda: pointwise(X), number = 1, repeat = 3))
+        batch = min(timeit.repeat(lambda: batched(X), number = 1, repeat = 3))
+        print("{:>7} {:>16.1f} {:>16.1f}".format(N, 1e3 * loop, 1e3 * batch))
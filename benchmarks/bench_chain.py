@@ -0,0 +1,46 @@
+'''Benchmark: cost of one call of each elementary function at an AutoDiff object
+with the Hessian, depending on 1, 8 or 64 variables, and at a batch of 100
+points of one variable, followed by a product of sines with x ** 3 and 2 ** x
+terms (all unary chain rules) of 50 variables.
+
+USAGE
+=====
+    python benchmarks/bench_chain.py            # uses ./hotAD
+    python benchmarks/bench_chain.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.AutoDiffObject import AutoDiff
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+
+NAMES = ("sin", "cos", "tan", "log", "exp", "sqrt", "logit", "arcsin", "arccos", "arctan")
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 5)) / number
+
+def point(k):
+    xs = [AutoDiff(0.5 / k, "c%dv%d" % (k, i), H = True) for i in range(k)]
+    return sum(xs[1:], xs[0]) if k > 1 else xs[0]
+
+def terms(xs):
+    f = 0
+    for i, x in enumerate(xs):
+        f = f + ef.sin(x) * ef.cos(x) + x ** 3 + 2 ** x
+    return f
+
+if __name__ == "__main__":
+    args = (("1 var", point(1)), ("8 vars", point(8)), ("64 vars", point(64)),
+            ("batch 100", AutoDiff(np.full(100, 0.5), "b", H = True)))
+    print("{:>7}".format("us") + "".join("{:>12}".format(label) for label, _ in args))
+    for name in NAMES:
+        f = getattr(ef, name)
+        print("{:>7}".format(name) + "".join("{:>12.2f}".format(1e6 * best_of(lambda: f(a), 2000))
+                                            for _, a in args))
+    xs = [AutoDiff(0.1 * i, "t%d" % i, H = True) for i in range(50)]
+    print("sum of 50 terms: {:.2f} ms".format(1e3 * best_of(lambda: terms(xs), 20)))
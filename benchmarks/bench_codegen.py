@@ -0,0 +1,53 @@
+'''Benchmark: cost of one gradient, and of one gradient and Hessian, of
+f(x) = sum_i x[i]*x[i+1] + sin(x[i]) at a new point, by a TracedFunction that
+replays its tape against a CompiledFunction running code generated from the same
+tape, as Newton and Mini do after their first iterates. Also reports the
+one-time cost of generating and compiling the code.
+
+USAGE
+=====
+    python benchmarks/bench_codegen.py            # uses ./hotAD
+    python benchmarks/bench_codegen.py /path/to/hotAD
+'''
+import os
+import sys
+import time
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import Mini
+from hotAD.ReverseAD import TracedFunction
+from hotAD.CodeGen import CompiledFunction
+
+def chain(x):
+    s = 0
+    for i in range(len(x) - 1):
+        s = s + x[i] * x[i+1] + ef.sin(x[i])
+    return [s]
+
+def rosenbrock(x):
+    return [100 * (x[1] - x[0] * x[0]) * (x[1] - x[0] * x[0]) + (1 - x[0]) * (1 - x[0])]
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>6} {:>3} {:>12} {:>15} {:>13}".format("m", "H", "replay (ms)", "generated (ms)", "compile (ms)"))
+    for m, H in ((10, False), (100, False), (1000, False), (10, True), (50, True)):
+        x = [0.1 * i for i in range(m)]
+        y = [0.2 * i for i in range(m)]
+        traced, generated = TracedFunction(chain), CompiledFunction(chain)
+        traced.jacobian(x, H)
+        generated.jacobian(x, H)
+        start = time.perf_counter()
+        generated.function(H)
+        compile_time = time.perf_counter() - start
+        print("{:>6} {:>3} {:>12.3f} {:>15.3f} {:>13.1f}".format(m, "yes" if H else "no",
+              1e3 * best_of(lambda: traced.jacobian(y, H), 20),
+              1e3 * best_of(lambda: generated.jacobian(y, H), 20), 1e3 * compile_time))
+    for method in ("quasi-newton-BFGS", "newton"):
+        print("\nMini(rosenbrock, [1, 0.5], method = {!r}): {:.3f} ms".format(method,
+              1e3 * best_of(lambda: Mini(rosenbrock, [1, 0.5], method = method), 20)))
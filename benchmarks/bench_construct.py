@@ -0,0 +1,44 @@
+'''Benchmark: cost of the intermediate AutoDiff objects of an expression graph.
+Times one binary operation on single-variable objects (where construction is
+most of the work) and a chain f = sum_i sin(x[i]) * x[i+1] of m variables, and
+measures the memory of one intermediate result: the instance (with its
+attribute dict, if any) and everything it holds.
+
+USAGE
+=====
+    python benchmarks/bench_construct.py            # uses ./hotAD
+    python benchmarks/bench_construct.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.AutoDiffObject import AutoDiff
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 5)) / number
+
+def graph(x):
+    nodes = []
+    for i in range(len(x) - 1):
+        nodes.append(ef.sin(x[i]))
+        nodes.append(nodes[-1] * x[i+1])
+        nodes.append(nodes[-1] + x[i])
+    return nodes
+
+if __name__ == "__main__":
+    a, b = AutoDiff(1.5, "a"), AutoDiff(2.5, "a")
+    print("a * b: {:.2f} us".format(1e6 * best_of(lambda: a * b, 20000)))
+    print("a + 1: {:.2f} us".format(1e6 * best_of(lambda: a + 1, 20000)))
+    m = 200
+    x = [AutoDiff(1.0 + 0.01 * i, "x{}".format(i)) for i in range(m)]
+    print("graph (m = {}): {:.2f} ms".format(m, 1e3 * best_of(lambda: graph(x), 20)))
+    nodes = graph(x)
+    instance = sys.getsizeof(nodes[1]) + (sys.getsizeof(nodes[1].__dict__) if hasattr(nodes[1], "__dict__") else 0)
+    print("instance: {} bytes".format(instance))
+    print("instance with value and tangent vector: {} bytes".format(
+        instance + sys.getsizeof(nodes[1].val) + sys.getsizeof(nodes[1]._grad)))
@@ -0,0 +1,39 @@
+'''Benchmark: size of the traced graph of the Rosenbrock sum
+f(x) = sum_i 100*(x[i+1] - x[i]*x[i])*(x[i+1] - x[i]*x[i]) + (1 - x[i])*(1 - x[i]),
+which repeats each of its subterms, with and without common subexpression
+elimination on the tape, and the cost of one tape replay and gradient.
+
+USAGE
+=====
+    python benchmarks/bench_cse.py            # uses ./hotAD
+    python benchmarks/bench_cse.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ReverseAD import Tape
+
+def rosenbrock(x):
+    s = 0
+    for i in range(len(x) - 1):
+        s = s + 100 * (x[i+1] - x[i] * x[i]) * (x[i+1] - x[i] * x[i]) + (1 - x[i]) * (1 - x[i])
+    return s
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>6} {:>5} {:>7} {:>13} {:>12}".format("m", "cse", "nodes", "deduplicated", "replay (ms)"))
+    for m in (10, 100, 1000):
+        x = [0.1 * i for i in range(m)]
+        y = [0.2 * i for i in range(m)]
+        for cse in (False, True):
+            tape = Tape(cse = cse)
+            f = rosenbrock(tape.variables(x))
+            replay = lambda: tape.replay(y) and tape.gradient(f)
+            print("{:>6} {:>5} {:>7} {:>13} {:>12.3f}".format(m, "on" if cse else "off", len(tape),
+                                                          tape.deduplicated, 1e3 * best_of(replay, 20)))
@@ -0,0 +1,33 @@
+'''Benchmark: cost of one call of each elementary function, at a Python float,
+a NumPy float64 scalar, a length-100 array and an AutoDiff object of one
+variable (without and with the Hessian).
+
+USAGE
+=====
+    python benchmarks/bench_dispatch.py            # uses ./hotAD
+    python benchmarks/bench_dispatch.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.AutoDiffObject import AutoDiff
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+
+NAMES = ("sin", "cos", "tan", "log", "exp", "sqrt", "logit", "arcsin", "arccos", "arctan")
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 5)) / number
+
+if __name__ == "__main__":
+    args = (("float", 0.5), ("float64", np.float64(0.5)), ("array", np.full(100, 0.5)),
+            ("AutoDiff", AutoDiff(0.5, "x")), ("AutoDiff H", AutoDiff(0.5, "x", H = True)))
+    print("{:>7}".format("us") + "".join("{:>12}".format(label) for label, _ in args))
+    for name in NAMES:
+        f = getattr(ef, name)
+        print("{:>7}".format(name) + "".join("{:>12.2f}".format(1e6 * best_of(lambda: f(a), 20000))
+                                            for _, a in args))
@@ -0,0 +1,51 @@
+'''Benchmark: cost of a first-order gradient as the number of variables grows.
+
+The objective is the chained sum f(x) = sum_i x[i]*x[i+1] + sin(x[i]), built
+directly from AutoDiff variables (single-character names, so the script also
+runs against older versions of hotAD) and, for larger m, through J_F.
+
+USAGE
+=====
+    python benchmarks/bench_gradient.py            # uses ./hotAD
+    python benchmarks/bench_gradient.py /path/to/hotAD
+'''
+import os
+import string
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.AutoDiffObject import AutoDiff
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F
+
+NAMES = string.ascii_letters + string.digits
+
+def chain(x):
+    s = 0
+    for i in range(len(x) - 1):
+        s = s + x[i] * x[i+1] + ef.sin(x[i])
+    return s
+
+def gradient_autodiff(m):
+    x = [AutoDiff(0.1 * i, NAMES[i]) for i in range(m)]
+    return chain(x).der
+
+def gradient_J_F(m):
+    return J_F(lambda x: [chain(x)], [0.1 * i for i in range(m)])[1]
+
+def best_of(fn, m, number):
+    return min(timeit.repeat(lambda: fn(m), number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>6} {:>18}".format("m", "AutoDiff (ms)"))
+    for m in (4, 8, 16, 32, 62):
+        print("{:>6} {:>18.3f}".format(m, 1e3 * best_of(gradient_autodiff, m, 5)))
+    try:
+        print("\n{:>6} {:>18}".format("m", "J_F (ms)"))
+        for m in (100, 200, 400, 800):
+            print("{:>6} {:>18.3f}".format(m, 1e3 * best_of(gradient_J_F, m, 1)))
+    except TypeError as err:
+        print("J_F not available for m > 10 in this version:", err)
@@ -0,0 +1,46 @@
+'''Benchmark: cost of J_F(F, x, H=True) for a banded (sparse) Hessian, and of
+one Hessian-vector product hvp(F, x, v) where available.
+
+The objective is f(x) = sum_i x[i]*x[i+1] + sin(x[i]), whose Hessian has
+about 3m nonzero entries.
+
+USAGE
+=====
+    python benchmarks/bench_hessian.py            # uses ./hotAD
+    python benchmarks/bench_hessian.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F
+
+def chain(x):
+    s = 0
+    for i in range(len(x) - 1):
+        s = s + x[i] * x[i+1] + ef.sin(x[i])
+    return s
+
+def hessian_J_F(m):
+    return J_F(lambda x: [chain(x)], [0.1 * i for i in range(m)], H = True)[2]
+
+def hessian_vector(m):
+    from hotAD.ADfun import hvp
+    return hvp(lambda x: [chain(x)], [0.1 * i for i in range(m)], [1.0] * m)
+
+if __name__ == "__main__":
+    print("{:>6} {:>18}".format("m", "J_F H=True (ms)"))
+    for m in (25, 50, 100, 200):
+        best = min(timeit.repeat(lambda: hessian_J_F(m), number = 1, repeat = 3))
+        print("{:>6} {:>18.2f}".format(m, 1e3 * best))
+    try:
+        print("\n{:>6} {:>18}".format("m", "hvp (ms)"))
+        for m in (200, 2000, 20000):
+            best = min(timeit.repeat(lambda: hessian_vector(m), number = 1, repeat = 3))
+            print("{:>6} {:>18.2f}".format(m, 1e3 * best))
+    except ImportError:
+        print("hvp not available in this version")
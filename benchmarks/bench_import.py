@@ -0,0 +1,49 @@
+'''Benchmark: cold-start import time of hotAD, measured in a fresh interpreter
+for each sample (so that nothing is cached in sys.modules), against a recorded
+budget. NumPy alone is timed for reference. Exits with status 1 when the best
+time of any import is over its budget.
+
+USAGE
+=====
+    python benchmarks/bench_import.py            # uses ./hotAD
+    python benchmarks/bench_import.py /path/to/hotAD
+'''
+import os
+import sys
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PATH = sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD')
+
+#Budget of each import in milliseconds (best of SAMPLES fresh interpreters), None
+#for the reference
+BUDGET = [("import numpy", None),
+          ("import hotAD", 5),
+          ("from hotAD.AutoDiffObject import AutoDiff", 250),
+          ("from hotAD.ElementaryFunctions import ElementaryFunctions", 250),
+          ("from hotAD.ADfun import J_F, Newton, Mini", 300),
+          ("import hotAD; hotAD.J_F", 300)]
+SAMPLES = 7
+
+CHILD = '''
+import time
+start = time.perf_counter()
+exec(%r)
+print(1e3 * (time.perf_counter() - start))
+'''
+
+def cold(statement):
+    env = dict(os.environ, PYTHONPATH = PATH)
+    return min(float(subprocess.check_output([sys.executable, "-c", CHILD % statement], env = env))
+               for _ in range(SAMPLES))
+
+if __name__ == "__main__":
+    over = False
+    print("{:<60} {:>10} {:>12}".format("statement", "ms", "budget (ms)"))
+    for statement, budget in BUDGET:
+        ms = cold(statement)
+        over = over or (budget is not None and ms > budget)
+        print("{:<60} {:>10.1f} {:>12}".format(statement, ms, "-" if budget is None else budget))
+    if over:
+        print("over budget")
+        sys.exit(1)
@@ -0,0 +1,53 @@
+'''Benchmark: accumulation of f(x) = sum_i x[i]*x[i+1] + sin(x[i]) with
+s = s + term (or s += term, the same), with s.add_inplace(term) and with
+ef.sum, through J_F with and without the Hessian.
+
+USAGE
+=====
+    python benchmarks/bench_inplace.py            # uses ./hotAD
+    python benchmarks/bench_inplace.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F
+from hotAD.AutoDiffObject import AutoDiff
+
+def chain(x):
+    s = 0
+    for i in range(len(x) - 1):
+        s = s + x[i] * x[i+1] + ef.sin(x[i])
+    return [s]
+
+def add(s, term):
+    #J_F first calls F at plain numbers, to count its outputs
+    return s.add_inplace(term) if isinstance(s, AutoDiff) else s + term
+
+def chain_inplace(x):
+    s = x[0] * x[1]
+    s = add(s, ef.sin(x[0]))
+    for i in range(1, len(x) - 1):
+        s = add(s, x[i] * x[i+1])
+        s = add(s, ef.sin(x[i]))
+    return [s]
+
+def chain_sum(x):
+    return [ef.sum([x[i] * x[i+1] + ef.sin(x[i]) for i in range(len(x) - 1)])]
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>5} {:>3} {:>14} {:>16} {:>12}".format("m", "H", "s = s + (ms)", "add_inplace (ms)", "ef.sum (ms)"))
+    for m, H in ((100, False), (1000, False), (50, True), (100, True), (200, True)):
+        x = [0.1 * i for i in range(m)]
+        functions = [chain, chain_inplace, chain_sum]
+        if not H:
+            functions = [lambda x, f = f: f(x) + [x[0]] for f in functions]
+        print("{:>5} {:>3} {:>14.2f} {:>16.2f} {:>12.2f}".format(m, "yes" if H else "no",
+              *[1e3 * best_of(lambda: J_F(f, x, H = H), 3) for f in functions]))
@@ -0,0 +1,39 @@
+'''Benchmark: J_F for an n-vector function against the number of input
+directions propagated per forward pass (the chunk size).
+
+The function has outputs F_i(x) = s_i, the running sums of
+x[i]*x[i+1] + sin(x[i]), sampled every 50 entries.
+
+USAGE
+=====
+    python benchmarks/bench_jacobian.py            # uses ./hotAD
+    python benchmarks/bench_jacobian.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F, _chunk_size
+
+def running_sums(x):
+    s = 0
+    out = []
+    for i in range(len(x) - 1):
+        s = s + x[i] * x[i+1] + ef.sin(x[i])
+        out.append(s)
+    return out[::50]
+
+def jacobian(m, chunk):
+    return J_F(running_sums, [0.1 * i for i in range(m)], chunk = chunk)[1]
+
+if __name__ == "__main__":
+    print("{:>6} {:>8} {:>12}".format("m", "chunk", "J_F (ms)"))
+    for m in (1000, 12000):
+        for chunk in sorted({m // 8, m // 2, m, _chunk_size(m)}):
+            best = min(timeit.repeat(lambda: jacobian(m, chunk), number = 1, repeat = 2))
+            auto = " (auto)" if chunk == _chunk_size(m) else ""
+            print("{:>6} {:>8} {:>12.1f}{}".format(m, chunk, 1e3 * best, auto))
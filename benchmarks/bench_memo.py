@@ -0,0 +1,42 @@
+'''Benchmark: J_F on the chain objective f(x) = sum_i x[i]*x[i+1] + sin(x[i])
+(gradient, and gradient with Hessian) and on the banded residual of
+bench_sparse_jacobian (Jacobian), called at a new point each time and at the
+same point again, with the results cache of J_F turned on (cache = True).
+
+USAGE
+=====
+    python benchmarks/bench_memo.py            # uses ./hotAD
+    python benchmarks/bench_memo.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+import itertools
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F
+
+def chain(x):
+    s = 0
+    for i in range(len(x) - 1):
+        s = s + x[i] * x[i+1] + ef.sin(x[i])
+    return [s]
+
+def band(x):
+    m = len(x)
+    return [2*x[i] - (x[i-1] if i > 0 else 0) - (x[i+1] if i < m-1 else 0) + 0.1*ef.exp(x[i]) - 1 for i in range(m)]
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>6} {:>5} {:>3} {:>15} {:>16}".format("F", "m", "H", "new point (ms)", "same point (ms)"))
+    for F, m, H in ((chain, 100, False), (chain, 30, True), (band, 100, False)):
+        points = itertools.cycle([[0.01 * (i + k) for i in range(m)] for k in range(1000)])
+        x = [0.01 * i for i in range(m)]
+        print("{:>6} {:>5} {:>3} {:>15.3f} {:>16.3f}".format(F.__name__, m, "yes" if H else "no",
+              1e3 * best_of(lambda: J_F(F, next(points), H = H, cache = True), 20),
+              1e3 * best_of(lambda: J_F(F, x, H = H, cache = True), 20)))
@@ -0,0 +1,54 @@
+'''Benchmark: the best of three calls of Newton on a banded system, and of Mini with the newton
+and quasi-newton-BFGS methods on a banded objective, with m in the hundreds.
+Each call starts from a new function object, as a user calling Newton or Mini
+would.
+
+USAGE
+=====
+    python benchmarks/bench_newton.py            # uses ./hotAD
+    python benchmarks/bench_newton.py /path/to/hotAD
+'''
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ADfun import Newton, Mini
+
+def banded_system():
+    def F(x):
+        m = len(x)
+        return [x[i] * x[i] * x[i] + 3 * x[i] - (x[i-1] if i > 0 else 0) - (x[i+1] if i < m - 1 else 0) - 1
+                for i in range(m)]
+    return F
+
+def banded_objective():
+    def F(x):
+        s = 0
+        for i in range(len(x) - 1):
+            s = s + (x[i] - 1) * (x[i] - 1) + 0.5 * (x[i] - x[i+1]) * (x[i] - x[i+1]) + 0.1 * x[i] * x[i] * x[i] * x[i]
+        return [s]
+    return F
+
+def seconds(fn, repeat = 3):
+    ''' Best time of repeat calls of fn, and what fn returns '''
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        iterations = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, iterations
+
+if __name__ == "__main__":
+    print("{:<22} {:>5} {:>6} {:>10}".format("call", "m", "iter", "time (s)"))
+    for m in (100, 300):
+        x = [0.5] * m
+        t, i = seconds(lambda: Newton(banded_system(), x)['number of iter: '])
+        print("{:<22} {:>5} {:>6} {:>10.3f}".format("Newton", m, i, t))
+    for method in ("newton", "quasi-newton-BFGS"):
+        for m in (100, 400):
+            x = [0.5] * m
+            t, i = seconds(lambda: Mini(banded_objective(), x, method = method)['number of iter'])
+            print("{:<22} {:>5} {:>6} {:>10.3f}".format("Mini " + method, m, i, t))
@@ -0,0 +1,53 @@
+'''Benchmark: detection of the Jacobian sparsity pattern of the banded residual
+F_i = 2 x[i] - x[i-1] - x[i+1] + 0.1 exp(x[i]) of m unknowns, from its tape, for
+growing m, and of the sum of x[i]^2, whose one row is dense and whose input
+set is extended term by term, and of the Hessian sparsity pattern of the chain
+sum((x[i+1] - x[i])^2 + exp(x[i])). The cost should grow linearly in m.
+
+USAGE
+=====
+    python benchmarks/bench_pattern.py            # uses ./hotAD
+    python benchmarks/bench_pattern.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ReverseAD import Tape
+from hotAD.Sparsity import jacobian_pattern, hessian_pattern
+
+def band(x):
+    m = len(x)
+    return [2*x[i] - (x[i-1] if i > 0 else 0) - (x[i+1] if i < m-1 else 0) + 0.1*ef.exp(x[i]) for i in range(m)]
+
+def squares(x):
+    f = 0
+    for v in x:
+        f = f + v * v
+    return [f]
+
+def chain(x):
+    f = 0
+    for i in range(len(x) - 1):
+        f = f + (x[i+1] - x[i]) * (x[i+1] - x[i]) + ef.exp(x[i])
+    return f
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>7} {:>10} {:>10} {:>13}".format("m", "band (s)", "sum (s)", "Hessian (s)"))
+    for m in (5000, 20000, 80000):
+        times = []
+        for F in (band, squares):
+            tape = Tape()
+            outputs = F(tape.variables([0.1] * m))
+            times.append(best_of(lambda: jacobian_pattern(tape, outputs), 1))
+        tape = Tape()
+        f = chain(tape.variables([0.1] * m))
+        times.append(best_of(lambda: hessian_pattern(tape, f), 1))
+        print("{:>7} {:>10.3f} {:>10.3f} {:>13.3f}".format(m, *times))
@@ -0,0 +1,33 @@
+'''Benchmark: cost of one power of an AutoDiff object of m variables with the
+Hessian on, for a constant exponent (x^3, x^-2, x^0.5) and an AutoDiff exponent
+(x^y), through ElementaryFunctions.power and through the ** operator.
+
+USAGE
+=====
+    python benchmarks/bench_power.py            # uses ./hotAD
+    python benchmarks/bench_power.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.AutoDiffObject import AutoDiff
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 5)) / number
+
+if __name__ == "__main__":
+    has_pow = hasattr(AutoDiff, "__pow__")
+    print("{:>4} {:>8} {:>15} {:>10}".format("m", "exponent", "ef.power (us)", "** (us)"))
+    for m in (2, 20):
+        xs = [AutoDiff(1.0 + 0.1 * i, "x{}".format(i), H = True) for i in range(m)]
+        x = sum(xs[1:], xs[0]) / m
+        y = x * 0.5
+        for label, power in (("3", 3), ("-2", -2), ("0.5", 0.5), ("y", y)):
+            power_time = 1e6 * best_of(lambda: ef.power(x, power), 2000)
+            op_time = 1e6 * best_of(lambda: x ** power, 2000) if has_pow else float("nan")
+            print("{:>4} {:>8} {:>15.1f} {:>10.1f}".format(m, label, power_time, op_time))
@@ -0,0 +1,35 @@
+'''Benchmark: reduction of m prebuilt terms t_i = sin(x[i]) * x[i+1] of a
+separable objective, with + and * pairwise against the fused ef.sum and
+ef.prod, with and without the Hessian.
+
+USAGE
+=====
+    python benchmarks/bench_reductions.py            # uses ./hotAD
+    python benchmarks/bench_reductions.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+import functools
+import operator
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.AutoDiffObject import AutoDiff
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>5} {:>3} {:>10} {:>13} {:>10} {:>14}".format("m", "H", "+ (ms)", "ef.sum (ms)", "* (ms)", "ef.prod (ms)"))
+    for m, H in ((100, False), (1000, False), (50, True), (200, True)):
+        x = [AutoDiff(1.0 + 0.001 * i, "x{}".format(i), H = H) for i in range(m + 1)]
+        terms = [ef.sin(x[i]) * x[i+1] for i in range(m)]
+        number = 5 if m > 100 else 20
+        times = [best_of(lambda: functools.reduce(operator.add, terms), number),
+                 best_of(lambda: ef.sum(terms), number),
+                 best_of(lambda: functools.reduce(operator.mul, terms), number),
+                 best_of(lambda: ef.prod(terms), number)]
+        print("{:>5} {:>3} {:>10.2f} {:>13.2f} {:>10.2f} {:>14.2f}".format(m, "yes" if H else "no", *(1e3 * t for t in times)))
@@ -0,0 +1,42 @@
+'''Benchmark: cost of one gradient of f(x) = sum_i x[i]*x[i+1] + sin(x[i])
+inside an iteration, by J_F (F traced on every call) against a TracedFunction
+that replays its tape, as Mini does at its first iterates.
+
+USAGE
+=====
+    python benchmarks/bench_replay.py            # uses ./hotAD
+    python benchmarks/bench_replay.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F, Mini
+from hotAD.ReverseAD import TracedFunction
+
+def chain(x):
+    s = 0
+    for i in range(len(x) - 1):
+        s = s + x[i] * x[i+1] + ef.sin(x[i])
+    return [s]
+
+def rosenbrock(x):
+    return [100 * (x[1] - x[0] * x[0]) * (x[1] - x[0] * x[0]) + (1 - x[0]) * (1 - x[0])]
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>6} {:>14} {:>14}".format("m", "J_F (ms)", "replay (ms)"))
+    for m in (10, 100, 1000):
+        x = [0.1 * i for i in range(m)]
+        y = [0.2 * i for i in range(m)]
+        traced = TracedFunction(chain)
+        traced.jacobian(x)
+        print("{:>6} {:>14.3f} {:>14.3f}".format(m, 1e3 * best_of(lambda: J_F(chain, y), 20),
+                                                 1e3 * best_of(lambda: traced.jacobian(y), 20)))
+    print("\nMini(rosenbrock, [1, 0.5]): {:.2f} ms".format(1e3 * best_of(lambda: Mini(rosenbrock, [1, 0.5]), 5)))
@@ -0,0 +1,46 @@
+'''Benchmark: size of the traced graph, and cost of one replay and gradient, of a
+masked least-squares objective f(x) = sum_i w[i]*(x[i] - 1)**2 * 1.0 + 0 with a
+0/1 mask w, whose F also computes a diagnostic exp(x[i]) it does not return. The
+tape is built as before (no folding, no pruning) and with constant folding,
+algebraic identities and pruning of nodes the output does not depend on.
+
+USAGE
+=====
+    python benchmarks/bench_simplify.py            # uses ./hotAD
+    python benchmarks/bench_simplify.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ReverseAD import Tape
+
+def masked(x):
+    s = 0
+    diagnostics = []
+    for i in range(len(x)):
+        w = i % 2
+        s = s + w * (x[i] - 1) ** 2 * 1.0 + 0
+        diagnostics.append(ef.exp(x[i]))
+    return s
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>6} {:>9} {:>7} {:>12}".format("m", "simplify", "nodes", "replay (ms)"))
+    for m in (10, 100, 1000):
+        x = [0.1 * i for i in range(m)]
+        y = [0.2 * i for i in range(m)]
+        for simplify in (False, True):
+            tape = Tape(simplify = simplify)
+            f = masked(tape.variables(x))
+            if simplify:
+                f, = tape.prune([f])
+            replay = lambda: tape.replay(y) and tape.gradient(f)
+            print("{:>6} {:>9} {:>7} {:>12.3f}".format(m, "on" if simplify else "off", len(tape),
+                                                      1e3 * best_of(replay, 20)))
@@ -0,0 +1,59 @@
+'''Benchmark: gradient and Hessian of the chained Rosenbrock function
+f(x) = sum_i 100 (x[i+1] - x[i]^2)^2 + (1 - x[i])^2 of m unknowns (partially
+separable, tridiagonal Hessian), dense from J_F and the compiled function
+against the sparse Hessian recovered from one Hessian-vector product per star
+color, and Mini(method = "newton") with and without it on the convex
+f(x) = sum_i (x[i+1] - x[i])^2 + exp(x[i]) - x[i].
+
+USAGE
+=====
+    python benchmarks/bench_sparse_hessian.py            # uses ./hotAD
+    python benchmarks/bench_sparse_hessian.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ReverseAD import TracedFunction
+from hotAD.CodeGen import CompiledFunction
+from hotAD.ADfun import J_F, Mini
+
+def chain(x):
+    f = 0
+    for i in range(len(x) - 1):
+        f = f + 100*(x[i+1] - x[i]*x[i])*(x[i+1] - x[i]*x[i]) + (1 - x[i])*(1 - x[i])
+    return [f]
+
+def convex(x):
+    f = 0
+    for i in range(len(x) - 1):
+        f = f + (x[i+1] - x[i])*(x[i+1] - x[i]) + ef.exp(x[i]) - x[i]
+    return [f]
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>5} {:>12} {:>15} {:>13} {:>7}".format("m", "J_F (ms)", "compiled (ms)", "sparse (ms)", "colors"))
+    for m in (50, 200, 800):
+        x = [0.5 + 0.001 * i for i in range(m)]
+        dense = CompiledFunction(chain)
+        sparse = TracedFunction(chain)
+        for _ in range(2):
+            dense.jacobian(x, H = True)
+        sparse.sparse_jacobian(x, H = True)
+        number = 1 if m > 200 else 3
+        print("{:>5} {:>12.2f} {:>15.2f} {:>13.2f} {:>7}".format(
+            m, 1e3 * best_of(lambda: J_F(chain, x, H = True), number),
+            1e3 * best_of(lambda: dense.jacobian(x, H = True), number),
+            1e3 * best_of(lambda: sparse.sparse_jacobian(x, H = True), number),
+            sparse.hessian_sparsity[1].max() + 1))
+    for m in (50, 200):
+        x = [1.0] * m
+        print("Mini newton, m = {}: dense {:.1f} ms, sparse {:.1f} ms".format(m,
+            1e3 * best_of(lambda: Mini(convex, x, method = "newton"), 1),
+            1e3 * best_of(lambda: Mini(convex, x, method = "newton", sparse = True), 1)))
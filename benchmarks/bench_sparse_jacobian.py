@@ -0,0 +1,43 @@
+'''Benchmark: Jacobian of the banded residual F_i = 2 x[i] - x[i-1] - x[i+1] +
+0.1 exp(x[i]) - 1 of m unknowns (a discretized boundary value problem), dense
+from J_F and the traced function against the sparse Jacobian recovered from one
+tangent sweep per column color, and Newton with and without it.
+
+USAGE
+=====
+    python benchmarks/bench_sparse_jacobian.py            # uses ./hotAD
+    python benchmarks/bench_sparse_jacobian.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ReverseAD import TracedFunction
+from hotAD.ADfun import J_F, Newton
+
+def band(x):
+    m = len(x)
+    return [2*x[i] - (x[i-1] if i > 0 else 0) - (x[i+1] if i < m-1 else 0) + 0.1*ef.exp(x[i]) - 1 for i in range(m)]
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>5} {:>12} {:>14} {:>13} {:>7}".format("m", "J_F (ms)", "traced (ms)", "sparse (ms)", "colors"))
+    for m in (50, 200, 800):
+        x = [0.01 * i for i in range(m)]
+        dense = TracedFunction(band)
+        sparse = TracedFunction(band)
+        dense.jacobian(x)
+        sparse.sparse_jacobian(x)
+        number = 3 if m > 200 else 10
+        print("{:>5} {:>12.2f} {:>14.2f} {:>13.2f} {:>7}".format(
+            m, 1e3 * best_of(lambda: J_F(band, x), number), 1e3 * best_of(lambda: dense.jacobian(x), number),
+            1e3 * best_of(lambda: sparse.sparse_jacobian(x), number), sparse.sparsity[1].max() + 1))
+    x = [0.0] * 400
+    print("Newton, m = 400: dense {:.1f} ms, sparse {:.1f} ms".format(
+        1e3 * best_of(lambda: Newton(band, x), 1), 1e3 * best_of(lambda: Newton(band, x, sparse = True), 1)))
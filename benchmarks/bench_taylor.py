@@ -0,0 +1,42 @@
+'''Benchmark: directional derivatives of order K of
+f(x) = sum_i x[i]*x[i+1] + sin(x[i]) along a direction v with Taylor mode
+(ADfun.taylor), against the second directional derivative v^T H v from the full
+Hessian of J_F, which is the highest order available without Taylor mode.
+
+USAGE
+=====
+    python benchmarks/bench_taylor.py            # uses ./hotAD
+    python benchmarks/bench_taylor.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F, taylor
+
+def chain(x):
+    s = 0
+    for i in range(len(x) - 1):
+        s = s + x[i] * x[i+1] + ef.sin(x[i])
+    return [s]
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+def hessian_direction(x, v):
+    H = J_F(chain, x, H = True)[2]
+    return v @ H @ v
+
+if __name__ == "__main__":
+    m = 50
+    x = [0.1 * i for i in range(m)]
+    v = np.ones(m)
+    print("m = {}: v^T H v from J_F(H = True): {:.2f} ms".format(m, 1e3 * best_of(lambda: hessian_direction(x, v), 5)))
+    print("{:>4} {:>14}".format("K", "taylor (ms)"))
+    for K in (2, 4, 8, 16, 32):
+        print("{:>4} {:>14.2f}".format(K, 1e3 * best_of(lambda: taylor(chain, x, v, K), 5)))
@@ -0,0 +1,39 @@
+'''Benchmark: Mini by gradient descent run to its cap of 5000 iterations on
+sum((x[i] - 1)^2) of m variables, keeping every iterate in the trace (the
+default), only the last 10 (trace = 10) or none (trace = False).
+
+USAGE
+=====
+    python benchmarks/bench_trace.py            # uses ./hotAD
+    python benchmarks/bench_trace.py /path/to/hotAD
+'''
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, sys.argv[1] if len(sys.argv) > 1 else os.path.join(HERE, '..', 'hotAD'))
+
+from hotAD.ADfun import Mini
+
+def squares(x):
+    f = 0
+    for v in x:
+        f = f + (v - 1) * (v - 1)
+    return [f]
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number = number, repeat = 3)) / number
+
+if __name__ == "__main__":
+    print("{:>5} {:>10} {:>12} {:>15}".format("m", "all (ms)", "last 10 (ms)", "none (ms)"))
+    for m in (2, 100, 400):
+        x = [0.5] * m
+        run = lambda **kw: Mini(squares, x, method = "gradient-descent", rate = 1e-5, **kw)
+        row = [1e3 * best_of(lambda: run(), 1)]
+        try:
+            row += [1e3 * best_of(lambda: run(trace = 10), 1), 1e3 * best_of(lambda: run(trace = False), 1)]
+        except TypeError:
+            #Mini without the trace argument
+            row += [float("nan")] * 2
+        print("{:>5} {:>10.1f} {:>12.1f} {:>15.1f}".format(m, *row))
@@ -1,423 +1,859 @@
-
-import numbers
-import numpy as np
-import matplotlib.pyplot as plt
-from hotAD.AutoDiffObject import *
-from hotAD.ElementaryFunctions import ElementaryFunctions as ef
-
-#Our method J_F that takes in the user defined function and vector list x
-def J_F(F, x, H = False):              #F as a length n list, x as a length m list 
-    ''' Takes in user defined n-vector function F and m-vector list x, and 
-        calculate the function value at x, the jacobian matrix of F evaluated
-        at x.
-        When the function F is an one-vector function, the Hessian matrix of F
-        can be calculated in output as well. 
-        
-        RETURNS
-        ========
-        H = False: Returns a list with the function value F(x) and Jacobian 
-            J_F(x), as [F(x), J_F(x)];
-        H = True and len(F) = 1: Returns a list as above, in addition to the 
-            Hessian matrix H_F(x), as [F(x), J_F(x), H_F(x)].
-        
-        NOTES
-        =====
-        PRE:
-             - F: A user defined function that returns a length n list
-             - x: A length m list of numeric types
-             - H: when True: F needs to be a one-vector function, and the 
-                 Hessian matrix of F will be calculated as well; 
-                 When False: No restriction on F, no second derivative information
-                 will be outputted
-        
-        POST:
-             - Return [F(x), J_F(x)] or [F(x), J_F(x), H_F(x)] as described above
-        EXAMPLES
-        =========
-        >>> F = lambda x: [x[0] * 3 + x[1] * x[2], x[2] - x[0] * x[1] + x[0]]
-        >>> print(J_F(F, [2, 3, 4])[0])
-        [18.  0.]
-        >>> print(J_F(F, [2, 3, 4])[1][0])
-        [3. 4. 3.]
-        >>> print(J_F(F, [2, 3, 4])[1][1])
-        [-2. -2.  1.]
-                        
-        >>> F2 = lambda x: [x[0] * 3 + x[1] * x[2] + x[3]*x[3]]
-        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[0][0])
-        82.0
-        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[1][0])
-        [ 3.  4.  3. 16.]
-        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[2][0])
-        [0. 0. 0. 0.]
-        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[2][1])
-        [0. 0. 1. 0.]
-        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[2][2])
-        [0. 1. 0. 0.]
-        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[2][3])
-        [0. 0. 0. 2.]
-        
-        '''
-    
-    n = len(F(x))
-    m = len(x)
-    
-    if H != True and H != False:
-        raise ValueError ("H needs to be either True or False!")
-    
-    #If H = True: Require len(F) = 1, to output the Hessian matrix
-    if H == True and n != 1:
-        raise ValueError ("F needs to be a function from R^n to R!")
-    
-    #Convert x to AutoDiffObject
-    xCal = [0.0] * m
-    for i in range(0, m):
-        if H == False:
-            xCal[i] = AutoDiff(x[i], "{}".format(i))
-        if H == True:
-            xCal[i] = AutoDiff(x[i], "{}".format(i), H = True)
-        
-    J_F = np.zeros((n, m))                     #to store Jacobian matrix information later
-    F1 = np.array([0.0]*n)                      #to store function value later
-    if H == True: 
-        H_F = np.zeros((m, m))                 
-
-    Fcal = F(xCal)    #This is a list of AutoDiffObjects, [F0(xCal), F1[xCal], ... F(n-1)[xCal]]
-
-    #Fcal[i].val has information of function value of Fi evaluated at input x; it is of a numeric type
-    #Fcal[i].der has information of partial derivatives of Fi with respect to each x component; it is of type dictionary
-
-    for i in range(0, n):
-        F1[i] = Fcal[i].val        
-          
-        for j in range(0, m):
-            if str(j) in Fcal[i].der:
-                J_F[i, j] = Fcal[i].der["{}".format(j)]
-            else: 
-                J_F[i, j] = 0
-            
-            if H == True: 
-                H_F[j, j] = Fcal[i].der2["{}".format(j)]
-                for k in range(0, m):
-                    if j != k:
-                        H_F[j, k] = Fcal[i].der2["{}{}".format(j, k)]
-    
-    
-    #This returns a list with the function value F(x) and Jacobian J_F(x)
-    if H == False: 
-        return [F1, J_F]     
-   
-    #This returns a list with the function value F(x) and Jacobian J_F(x) and Hessian matrix H_F
-    if H == True: 
-        return [F1, J_F, H_F]
-
-
-
-#Optimization & Root Finding
-#full Newton: root-finding
-#Require len(F) = len(x)
-def Newton(F, x, criteria = 10**(-8), max_iter = 5000):
-    ''' Takes in user defined n-vector function F and m-vector list x, and 
-        returns the root closest to the initial guess (x).
-        
-        RETURNS
-        ========
-        A dictionary with:
-            - x_min: the root found
-            - F(x_min): the value of the function at the found root
-            - number of iter(ations) it took to iteratively find the root
-              
-        NOTES
-        =====
-        PRE:
-             - F: A user defined function that returns a length n list
-             - x: A length m list of numeric types with an initial guess for the root
-             - criteria: the minimum stopping criterion for step size in Newton's method.
-                         Default value is set to 10^(-8)
-             - max_iter = 5000: maximum iterations for the newton's method to stop, default set to 5000
-
-        
-        POST:
-             - Returns a dictionary with the root found (x_min), the value of the function at the root (F(x_min))
-               and the number of iterations taken to find the root (number of iter)
-               
-        EXAMPLES
-        =========
-        >>> import numpy as np
-        >>> x = [0.2,0.1]
-        >>> F = lambda x: [x[0] * x[0], x[1] + x[0]]
-        >>> np.isclose(Newton(F,x)['x_min: '][0], 0)
-        True
-        >>> np.isclose(Newton(F,x)['F(x_min): '][0], 0)
-        True
-        >>> Newton(F,x)['number of iter: ']
-        25
-        
-        '''    
-    x_k = np.array(x)
-    rel_step = 1
-    i = 0
-    
-    if len(F(x)) != len(x):
-        raise ValueError ("Need to be a system of n functions with n unknowns!")
-        
-    else: 
-        xk_1 = 100*x_k  
-        while i < max_iter and np.linalg.norm(x_k-xk_1)>criteria:
-            JF_k = J_F(F, list(x_k))
-            F_k = JF_k[0]
-            J_k = JF_k[1]
-            deltaX = np.linalg.solve(J_k, -F_k)
-            
-            
-            xk_1 = x_k
-            x_k = x_k + deltaX
-            i += 1
-        
-        return {"x_min: ": x_k, "F(x_min): ": J_F(F, list(x_k))[0], "number of iter: ": i}
-
-
-
-
-#Optimization: Minimization for F from R^n to R
-def Mini(F, x, method = "quasi-newton-BFGS", criteria = 10**(-8), max_iter_GD = 5000, rate = 0.0001, plot = False):
-
-    '''
-    For optimization problems. Minimize an one-vector function F that takes in 
-    n variables, F: R^n -> R. Optimization methods provided are: newton, quasi-newton-BFGS,
-    and gradient-descent. 
-    
-        
-    RETURNS
-    ========
-    All methods returns as a dictionary:
-        "x_min": the minimization point x calculated
-        "min F(x)": the function value evaluated at minimization point x_min
-        "number of iter": number of iterations
-        "trace": a history of all the x_k calculated in the iterations 
-        "Jacobian F(x_min)": First derivative information evaluated at minimization point x_min,
-                    calculated with our Automatic Differentiation library
-        
-    In addtion:
-        
-    "newton" method also output in the dictionary:
-        "Hessian F(x_min)": Hessian matrix evaluated at minimization point x_min, calculated
-                    with our Automatic Differentiation library
-                    
-    "quasi-newton-BFGS" method also output in the dictionary:
-        "Hessian approximate": The approximated Hessian matrix in the last iteration, calculated 
-                    in the BFGS algorithm
-    
-    NOTES
-    =====
-    PRE:
-        - F: A user defined function that returns a length 1 list
-        - x: A length n list of numeric types
-        - method = "quasi-newton-BFGS": Optimization method choice, default
-                to "quasi-newton-BFGS". Other options are "newton" and "gradient-descent"
-        - criteria = 10**(-8): Criteria to stop iterations for the optimization 
-                methods, |x_k-xk_1| < criteria;
-                Note: For "gradient-descent" method, since the method can converge very slowly,
-                the stopping criteria is to stop once reaching maximum iteration steps that can 
-                be defined by the user or when |x_k-xk_1| < criteria
-        - max_iter_GD = 5000: maximum iterations for the chosen method to stop, default set to 5000
-        - rate = 0.0001: learning rate of the gradient-descent method, default to 0.0001
-        - plot = False (or 0): if plot = True (or 1), require len(x) = 1 or len(x) = 2;
-                If plot = True, a plot of the iteration trace will show up
-        
-        
-    POST: 
-        - return a dictionary of minimization information as described above
-        
-    EXAMPLES
-    =========
-    >>> F3 = lambda x:[100*(x[1]-x[0]*x[0])*(x[1]-x[0]*x[0]) + (1-x[0])*(1-x[0])]
-    >>> Mini(F3, [1, 0.5])['x_min']
-    array([1., 1.])
-    >>> Mini(F3, [1, 0.5])['min F(x)']
-    array([1.93577378e-21])
-    >>> Mini(F3, [1, 0.5])['Jacobian F(x_min)']
-    array([-1.04250164e-09,  5.55377966e-10])
-    >>> Mini(F3, [1, 0.5])['Hessian approximate']
-    array([[0.49616688, 0.99235036],
-           [0.99235036, 1.98973386]])
-    >>> Mini(F3, [1, 0.5])['number of iter']
-    31
-    
-    >>> Mini(F3, [1, 0.5], method = "newton")['x_min']
-    array([1., 1.])
-    >>> Mini(F3, [1, 0.5], method = "newton")['min F(x)']
-    array([0.])
-    >>> Mini(F3, [1, 0.5], method = "newton")['Jacobian F(x_min)']
-    array([0., 0.])
-    >>> Mini(F3, [1, 0.5], method = "newton")['Hessian F(x_min)']
-    array([[ 802., -400.],
-           [-400.,  200.]])
-    >>> Mini(F3, [1, 0.5], method = "newton")['number of iter']
-    2
-    
-    >>> Mini(F3, [1, 0.9],method = "gradient-descent")['x_min']
-    array([0.96727347, 0.9354844 ])
-    >>> Mini(F3, [1, 0.9], method = "gradient-descent")['min F(x)']
-    array([0.00107281])
-    >>> Mini(F3, [1, 0.9], method = "gradient-descent")['number of iter']
-    5000
-    
-    '''
-    
-    #Catch errors:
-    if len(F(x))!= 1:
-        raise ValueError ("F needs to be a function from R^n to R!")
-    
-    if plot not in [True, False]:
-        raise ValueError ("Enter True or False for whether a plot should be output.")
-    
-    if plot == True:
-        if len(x) != 1 and len(x) != 2:
-            raise ValueError ("Cannot make plots of the iteration steps, since x is of more than 2 dimensions!")
-    
-    if method != "newton" and method != "quasi-newton-BFGS" and method != "gradient-descent":
-        raise ValueError ("Optimization methods provided are newton, quasi-newton-BFGS and gradient-descent. Please choose one from them.")
-        
-    if isinstance(rate, numbers.Real) == False:
-        raise TypeError ("Rate must be a numeric value.")
-        
-    
-    if method == "newton":
-        x_k = np.array(x)
-        x_trace = x_k
-        i = 0
-        
-        xk_1 = 100*x_k
-    
-        while i < max_iter_GD and np.linalg.norm(x_k-xk_1)>criteria:
-            
-            JH_k = J_F(F, list(x_k), H = True) 
-        
-            J_k = JH_k[1][0]
-            H_k = JH_k[2]   
-        
-            deltaX = np.linalg.solve(H_k, -J_k)
-            xk_1 = x_k
-            x_k = x_k + deltaX
-            
-            x_trace = np.vstack([x_trace, x_k])
-            i += 1
-        
-        JH_k = J_F(F, list(x_k), H = True) 
-            
-        result = {"x_min": x_k, "min F(x)": JH_k[0], "Jacobian F(x_min)": JH_k[1][0], "Hessian F(x_min)": JH_k[2], "number of iter": i,  "trace":x_trace}
-   
-        
-    if method == "quasi-newton-BFGS":  #H_k is Inverse Hessian approximation
-        x_k = np.array(x)
-
-        x_trace = x_k
-        i = 0
-        I = np.eye(len(x),len(x))
-        
-        H_k = I
-        
-        JF_k = J_F(F, list(x_k))
-        J_k = JF_k[1][0]
-        
-        xk_1 = 100*x_k
-        
-            
-        while i < max_iter_GD and np.linalg.norm(x_k-xk_1)>criteria:
-            deltaX = - np.matmul(H_k, J_k)
-            
-            xk_1 = x_k
-            x_k = x_k + deltaX
-            
-            if np.linalg.norm(x_k-xk_1) != 0: 
-                x_trace = np.vstack([x_trace, x_k])
-            
-                JF_k2 = J_F(F, list(x_k))
-                J_k2 = JF_k2[1][0]
-            
-                yk = J_k2 - J_k    #vector
-            
-            
-                rouk = 1/(yk.T @ deltaX)    #number
-                H_k = np.matmul(np.matmul((I - np.outer((deltaX * rouk), yk.T)), H_k), (I - np.outer((rouk * yk), deltaX.T))) + np.outer((rouk * deltaX), deltaX.T) 
-        
-                J_k = J_k2
-                i += 1
-        
-        result = {"x_min": x_k, "min F(x)": JF_k2[0], "Jacobian F(x_min)": JF_k2[1][0], "Hessian approximate": H_k,  "number of iter": i,  "trace":x_trace}
-        
-        
-    if method == "gradient-descent":
-        x_k = np.array(x)
-        x_trace = x_k
-        i=0
-        xk_1 = 100*x_k
-        while i < max_iter_GD and np.linalg.norm(x_k-xk_1)>criteria:
-            JF_k = J_F(F, x_k)
-            J_k = JF_k[1][0]
-            
-            sk = -J_k
-            xk_1 = x_k
-            x_k = x_k + rate * sk
-            
-            x_trace = np.vstack([x_trace, x_k])
-            i += 1
-            
-        JF_k = J_F(F, x_k)
-            
-        result = {"x_min": x_k, "min F(x)": JF_k[0], "Jacobian F(x_min)": JF_k[1][0], "number of iter": i,  "trace":x_trace}
-        
-    if len(x) == 2: 
-        if plot == True:
-            
-            trace = result["trace"]
-            lx = trace[:, 0]
-            ly = trace[:, 1]
-            xmin = np.amin(lx)
-            xmax = np.amax(lx)
-            deltx = xmax - xmin
-            ymin = np.amin(ly)
-            ymax = np.amax(ly)
-            delty = ymax - ymin
-            
-            x = np.linspace(xmin-deltx*0.2, xmax+deltx*0.2, 100)
-            y = np.linspace(ymin-delty*0.2, ymax+delty*0.2, 100)
-
-            plt.figure(figsize = (12, 8))
-            X, Y = np.meshgrid(x, y)
-            Z = F([X, Y])[0]
-            plt.contour(X, Y, Z, 100, cmap='RdGy');
-            
-            plt.plot(lx, ly, 'go-')
-            plt.plot(lx[0], ly[0], marker='*', markersize=15, color="blue", label = "start point")
-            plt.plot(lx[-1], ly[-1], marker='*', markersize=15, color="purple", label = "end point")
-            plt.legend()
-
-    if len(x) == 1: 
-        if plot == True:
-            
-            trace = result["trace"]
-            lx = trace.T[0]
-            ly = []
-            for i in range(0, len(lx)):
-                ly.append(F([lx[i]]))
-            
-            xmin = np.amin(lx)
-            xmax = np.amax(lx)
-            deltx = xmax - xmin
-            
-            
-            x = np.linspace(xmin-deltx*0.2, xmax+deltx*0.2, int(30*1.4*deltx))
-            y = []
-            for i in range(0, len(x)):
-                y.append(F([x[i]]))
-            
-            plt.figure(figsize = (12, 8))
-            plt.plot(x, y, 'k--', label = "F(x)")
-            
-            plt.plot(lx, ly, 'go-')
-            plt.plot(lx[0], ly[0], marker='*', markersize=15, color="blue", label = "start point")
-            plt.plot(lx[-1], ly[-1], marker='*', markersize=15, color="purple", label = "end point")
-            plt.legend()
-
-    return result
+
+import numbers
+import os
+import functools
+import numpy as np
+from hotAD.AutoDiffObject import *
+from hotAD.AutoDiffObject import _pad
+from hotAD.ReverseAD import Tape, TracedFunction
+from hotAD.CodeGen import CompiledFunction, compiled
+from hotAD.Memo import EvaluationCache, memo
+from hotAD.TaylorAD import TaylorAD
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+
+#Tangents of width k are kept hot in cache across consecutive operations when
+#this many of them (operands, results and temporaries) fit in the L2 cache
+_LIVE_TANGENTS = 32
+
+@functools.lru_cache(maxsize = 1)
+def _cache_size():
+    ''' Returns the size in bytes of the L2 cache of the first CPU, or 1 MiB when it
+    cannot be determined (sysconf reports 0 or -1 for unknown on some systems) '''
+    try:
+        size = os.sysconf("SC_LEVEL2_CACHE_SIZE")
+        if size > 0:
+            return size
+    except (ValueError, OSError, AttributeError):
+        pass
+    root = "/sys/devices/system/cpu/cpu0/cache"
+    try:
+        for index in sorted(os.listdir(root)):
+            with open(os.path.join(root, index, "level")) as f:
+                if f.read().strip() != "2":
+                    continue
+            with open(os.path.join(root, index, "size")) as f:
+                size = f.read().strip()
+            units = {"K": 2**10, "M": 2**20, "G": 2**30}
+            size = int(size[:-1]) * units[size[-1]] if size[-1] in units else int(size)
+            if size > 0:
+                return size
+    except (OSError, ValueError):
+        pass
+    return 2**20
+
+def _chunk_size(m):
+    ''' Returns the number of input directions J_F propagates per forward pass for
+    m inputs: as many as fit the cache budget, split evenly over the passes '''
+    k = max(1, min(m, _cache_size() // (8 * _LIVE_TANGENTS)))
+    passes = -(-m // k)
+    return -(-m // passes)
+
+def _seed(j, width):
+    ''' Unit tangent e_j of the given width, or an empty tangent when j is outside the chunk '''
+    if 0 <= j < width:
+        seed = np.zeros(width)
+        seed[j] = 1.0
+        return seed
+    return np.zeros(0)
+
+#Our method J_F that takes in the user defined function and vector list x
+def J_F(F, x, H = False, chunk = None, sparse = False, cache = False):    #F as a length n list, x as a length m list 
+    ''' Takes in user defined n-vector function F and m-vector list x, and 
+        calculate the function value at x, the jacobian matrix of F evaluated
+        at x.
+        When the function F is an one-vector function, the Hessian matrix of F
+        can be calculated in output as well. Without the Hessian, the gradient
+        of an one-vector function is computed in reverse mode, and the Jacobian
+        of an n-vector function in forward passes that each propagate a chunk
+        of input directions.
+        
+        RETURNS
+        ========
+        H = False: Returns a list with the function value F(x) and Jacobian 
+            J_F(x), as [F(x), J_F(x)];
+        H = True and len(F) = 1: Returns a list as above, in addition to the 
+            Hessian matrix H_F(x), as [F(x), J_F(x), H_F(x)].
+        sparse = True: J_F(x), and H_F(x) with H = True, are returned as
+            Sparsity.CSRMatrix.
+        
+        NOTES
+        =====
+        PRE:
+             - F: A user defined function that returns a length n list
+             - x: A length m list of numeric types
+             - H: when True: F needs to be a one-vector function, and the 
+                 Hessian matrix of F will be calculated as well; 
+                 When False: No restriction on F, no second derivative information
+                 will be outputted
+             - chunk: number of input directions per forward pass when F is an
+                 n-vector function (n > 1); by default tuned from the L2 cache size
+                 and m, so that derivative vectors stay cache-resident
+             - sparse: when True, the sparsity pattern of the Jacobian is detected
+                 and its columns colored, so that it is computed in one forward
+                 pass per color (see TracedFunction.sparse_jacobian). With H = True
+                 the gradient takes one backward sweep, and the Hessian pattern is
+                 star colored so that the Hessian takes one Hessian-vector product
+                 per color. With cache = True the patterns and colorings are
+                 computed once per F and reused by later calls
+             - cache = False: when True, results are kept per function object F
+                 (see Memo.memo), so that a later call with the same x, H and
+                 sparse is served without evaluating F, and the length of F(x) is
+                 only computed once per length of x. Only for an F whose parameters
+                 (the closure and global values it reads) do not change between
+                 calls: cached results are keyed on x alone, and are returned
+                 unchanged after such a change. memo(F).hits and memo(F).misses
+                 count the lookups
+        
+        POST:
+             - Return [F(x), J_F(x)] or [F(x), J_F(x), H_F(x)] as described above
+        EXAMPLES
+        =========
+        >>> F = lambda x: [x[0] * 3 + x[1] * x[2], x[2] - x[0] * x[1] + x[0]]
+        >>> print(J_F(F, [2, 3, 4])[0])
+        [18.  0.]
+        >>> print(J_F(F, [2, 3, 4])[1][0])
+        [3. 4. 3.]
+        >>> print(J_F(F, [2, 3, 4])[1][1])
+        [-2. -2.  1.]
+                        
+        >>> F2 = lambda x: [x[0] * 3 + x[1] * x[2] + x[3]*x[3]]
+        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[0][0])
+        82.0
+        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[1][0])
+        [ 3.  4.  3. 16.]
+        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[2][0])
+        [0. 0. 0. 0.]
+        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[2][1])
+        [0. 0. 1. 0.]
+        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[2][2])
+        [0. 1. 0. 0.]
+        >>> print(J_F(F2, [2, 3, 4, 8], H = True)[2][3])
+        [0. 0. 0. 2.]
+
+        >>> F3 = lambda x: [x[0] * x[1], x[1] - x[2], ef.sin(x[2])]
+        >>> J_F(F3, [1, 2, 0], sparse = True)[1].toarray()
+        array([[ 2.,  1.,  0.],
+               [ 0.,  1., -1.],
+               [ 0.,  0.,  1.]])
+        >>> print(J_F(F2, [2, 3, 4, 8], H = True, sparse = True)[2].toarray()[1])
+        [0. 0. 1. 0.]
+        
+        '''
+    
+    if H != True and H != False:
+        raise ValueError ("H needs to be either True or False!")
+
+    if chunk is not None and (not isinstance(chunk, numbers.Integral) or chunk < 1):
+        raise ValueError ("chunk needs to be a positive integer!")
+
+    #Results are memoized per F on the exact x and derivative order, and the
+    #number of outputs of F is only learned once per length of x (see Memo.memo)
+    results = memo(F) if cache == True else EvaluationCache(maxsize = 0)
+    key = results.key(x, 2 if H == True else 1, sparse == True)
+    result = results.get(key)
+    if result is not None:
+        return result
+
+    n = results.length(F, x)
+
+    #If H = True: Require len(F) = 1, to output the Hessian matrix
+    if H == True and n != 1:
+        raise ValueError ("F needs to be a function from R^n to R!")
+
+    result = _derivatives(F, x, n, H, chunk, sparse, cache)
+    results.put(key, result)
+    return result
+
+def _derivatives(F, x, n, H, chunk, sparse, cache = False):
+    ''' Returns the result of J_F for an n-vector function F, without memoization '''
+    m = len(x)
+
+    #Sparse derivatives: patterns and colorings are kept with the trace of F,
+    #which with cache = True is kept per F (see CodeGen.compiled)
+    if sparse == True:
+        traced = compiled(F) if cache == True else TracedFunction(F)
+        return traced.sparse_jacobian(x, H = H)
+    
+    #Scalar F without Hessian: record F once on a tape and get the whole gradient
+    #from a single backward sweep (reverse mode) instead of m forward tangents
+    if H == False and n == 1:
+        tape = Tape()
+        Fcal = F(tape.variables(x))[0]
+        return [np.array([float(tape.value(Fcal))]), tape.gradient(Fcal).reshape(1, m)]
+
+    J_F = np.zeros((n, m))                     #to store Jacobian matrix information later
+    F1 = np.array([0.0]*n)                      #to store function value later
+
+    #Vector F: each forward pass seeds the unit directions of the inputs
+    #start, ..., start+width-1 only, and fills those columns of the Jacobian
+    if H == False:
+        k = _chunk_size(m) if chunk is None else chunk
+        for start in range(0, m, k):
+            width = min(k, m - start)
+            xCal = [AutoDiff(x[i], "dummy", _seed(i - start, width)) for i in range(0, m)]
+            Fcal = F(xCal)
+            for i in range(0, n):
+                F1[i] = Fcal[i].val
+                J_F[i, start:start + width] = _pad(Fcal[i]._grad, width)
+
+        #This returns a list with the function value F(x) and Jacobian J_F(x)
+        return [F1, J_F]
+
+    #Convert x to AutoDiffObject: input i is seeded at index i of tangents of width m,
+    #local to this call, so that J_F leaves the shared registry (and the width of
+    #the tangents of later, unrelated AutoDiff objects) as it was
+    cols = np.arange(m)
+    xCal = [0.0] * m
+    for i in range(0, m):
+        xCal[i] = AutoDiff(x[i], "dummy", _seed(i, m), {}, H = True)
+
+    Fcal = F(xCal)    #This is a list of AutoDiffObjects, [F0(xCal), F1[xCal], ... F(n-1)[xCal]]
+
+    #Fcal[i].val has information of function value of Fi evaluated at input x; it is of a numeric type
+    #Fcal[i]._grad has information of partial derivatives of Fi as a tangent vector, indexed by
+    #the positions 0, ..., m-1 of the inputs
+
+    for i in range(0, n):
+        F1[i] = Fcal[i].val        
+        J_F[i, :] = Fcal[i]._gradient(cols)
+        H_F = Fcal[i]._hessian(cols)
+
+    #This returns a list with the function value F(x) and Jacobian J_F(x) and Hessian matrix H_F
+    return [F1, J_F, H_F]
+
+
+
+#Jacobians of F at N points at once, with batched AutoDiff objects
+def J_F_batch(F, X):
+    ''' Takes in user defined n-vector function F and an N x m array X of N
+        points, and calculates the function values and the Jacobian matrices of
+        F at every point in a single vectorized evaluation of F.
+
+        RETURNS
+        ========
+        A list [F(X), J_F(X)]: an N x n array of function values and an
+        N x n x m array stacking the Jacobian at each point
+
+        NOTES
+        =====
+        PRE:
+             - F: A user defined function that returns a length n list; it is
+                 called once with m batched AutoDiff objects
+             - X: An N x m array (or nested list) of numeric types
+        POST:
+             - Return [F(X), J_F(X)] as described above
+        EXAMPLES
+        =========
+        >>> F = lambda x: [x[0] * x[1], ef.sin(x[0])]
+        >>> val, Jac = J_F_batch(F, [[1, 2], [0, 3]])
+        >>> val
+        array([[2.        , 0.84147098],
+               [0.        , 0.        ]])
+        >>> Jac[1]
+        array([[3., 0.],
+               [1., 0.]])
+        '''
+
+    X = np.asarray(X, dtype = float)
+    if X.ndim != 2:
+        raise ValueError ("X needs to be an N x m array of points!")
+    N, m = X.shape
+
+    #Every input carries its unit direction, shared by the N points
+    xCal = [AutoDiff(np.ascontiguousarray(X[:, j]), "dummy", _seed(j, m)[:, None]) for j in range(0, m)]
+    Fcal = F(xCal)
+
+    n = len(Fcal)
+    F1 = np.zeros((N, n))
+    J_F = np.zeros((N, n, m))
+    for i in range(0, n):
+        if isinstance(Fcal[i], AutoDiff):
+            F1[:, i] = Fcal[i].val
+            J_F[:, i, :] = _pad(Fcal[i]._grad, m).T
+        else:
+            F1[:, i] = Fcal[i]
+
+    return [F1, J_F]
+
+
+
+#Hessian-vector product of a scalar F, without forming the Hessian
+def hvp(F, x, v):
+    ''' Takes in user defined one-vector function F, m-vector list x and
+        m-vector list v, and calculates the product of the Hessian matrix of F
+        evaluated at x with v.
+
+        RETURNS
+        ========
+        The m-vector H_F(x) v as a numpy array
+
+        NOTES
+        =====
+        PRE:
+             - F: A user defined function that returns a length 1 list
+             - x, v: length m lists of numeric types
+        POST:
+             - Return H_F(x) v. F is recorded once on a tape; a forward sweep along
+               v and one backward sweep give the product at a small multiple of
+               the cost of the gradient, with O(m) memory
+        EXAMPLES
+        =========
+        >>> F = lambda x: [x[0] * x[0] * x[1] + ef.sin(x[1])]
+        >>> hvp(F, [2, 0], [1, 0])
+        array([0., 4.])
+        >>> hvp(F, [2, 0], [0, 1])
+        array([4., 0.])
+        '''
+
+    if len(v) != len(x):
+        raise ValueError ("x and v need to have the same length!")
+
+    tape = Tape()
+    Fcal = F(tape.variables(x))
+    if len(Fcal) != 1:
+        raise ValueError ("F needs to be a function from R^n to R!")
+
+    return tape.hvp(Fcal[0], v)
+
+
+
+#Jacobian-vector product: one forward pass with a single seeded direction
+def jvp(F, x, v):
+    ''' Takes in user defined n-vector function F, m-vector list x and
+        m-vector list v, and calculates the function value at x and the
+        product of the Jacobian matrix of F evaluated at x with v.
+
+        RETURNS
+        ========
+        A list [F(x), J_F(x) v] of two length n numpy arrays
+
+        NOTES
+        =====
+        PRE:
+             - F: A user defined function that returns a length n list
+             - x, v: length m lists of numeric types
+        POST:
+             - Return [F(x), J_F(x) v]. Every input carries the single direction
+               v, so the cost is that of one forward pass and the Jacobian is
+               never formed
+        EXAMPLES
+        =========
+        >>> F = lambda x: [x[0] * x[1], x[0] + ef.exp(x[1])]
+        >>> val, Jv = jvp(F, [2, 0], [1, 1])
+        >>> print(val)
+        [0. 3.]
+        >>> print(Jv)
+        [2. 2.]
+        '''
+
+    m = len(x)
+    if len(v) != m:
+        raise ValueError ("x and v need to have the same length!")
+
+    #Seed the direction v as a tangent vector of width 1
+    xCal = [AutoDiff(x[i], "dummy", np.array([float(v[i])])) for i in range(0, m)]
+    Fcal = F(xCal)
+
+    n = len(Fcal)
+    F1 = np.zeros(n)
+    Jv = np.zeros(n)
+    for i in range(0, n):
+        if isinstance(Fcal[i], AutoDiff):
+            F1[i] = Fcal[i].val
+            Jv[i] = Fcal[i]._grad[0]
+        else:
+            F1[i] = Fcal[i]
+
+    return [F1, Jv]
+
+
+
+#Vector-Jacobian product: one backward sweep with the adjoints seeded by u
+def vjp(F, x, u):
+    ''' Takes in user defined n-vector function F, m-vector list x and
+        n-vector list u, and calculates the function value at x and the
+        product of u with the Jacobian matrix of F evaluated at x.
+
+        RETURNS
+        ========
+        A list [F(x), u^T J_F(x)] of a length n and a length m numpy array
+
+        NOTES
+        =====
+        PRE:
+             - F: A user defined function that returns a length n list
+             - x: length m list of numeric types
+             - u: length n list of numeric types
+        POST:
+             - Return [F(x), u^T J_F(x)]. F is recorded once on a tape and one
+               backward sweep seeded with u gives the product, so the cost is a
+               small multiple of one evaluation of F
+        EXAMPLES
+        =========
+        >>> F = lambda x: [x[0] * x[1], x[0] + ef.exp(x[1])]
+        >>> val, uJ = vjp(F, [2, 0], [1, 1])
+        >>> print(val)
+        [0. 3.]
+        >>> print(uJ)
+        [1. 3.]
+        '''
+
+    tape = Tape()
+    Fcal = F(tape.variables(x))
+    if len(u) != len(Fcal):
+        raise ValueError ("u needs to have the same length as F(x)!")
+
+    F1 = np.array([float(tape.value(f)) for f in Fcal])
+    return [F1, tape.vjp(Fcal, u)]
+
+
+
+#Taylor mode: derivatives of any order along a line
+def taylor(F, x, v, K):
+    ''' Takes in user defined n-vector function F, m-vector lists x and v
+        and an order K, and calculates the derivatives of order 0 to K of
+        t -> F(x + t v) at t = 0.
+
+        RETURNS
+        ========
+        An n x (K+1) numpy array whose column k is d^k/dt^k F(x + t v) at t = 0
+
+        NOTES
+        =====
+        PRE:
+             - F: A user defined function that returns a length n list
+             - x, v: length m lists of numeric types
+             - K: non-negative integer
+        POST:
+             - Every input carries the truncated Taylor expansion x[i] + v[i] t
+               (see TaylorAD), so the cost is that of one pass through F with
+               O(K^2) work per operation. For m = 1 and v = [1] these are the
+               derivatives of F itself
+        EXAMPLES
+        =========
+        >>> F = lambda x: [ef.exp(x[0]) * x[1]]
+        >>> print(taylor(F, [0, 2], [1, 1], 3))
+        [[2. 3. 4. 5.]]
+        '''
+
+    m = len(x)
+    if len(v) != m:
+        raise ValueError ("x and v need to have the same length!")
+
+    xCal = [TaylorAD.variable(x[i], K, v[i]) for i in range(0, m)]
+    Fcal = F(xCal)
+
+    D = np.zeros((len(Fcal), K + 1))
+    for i in range(0, len(Fcal)):
+        if isinstance(Fcal[i], TaylorAD):
+            D[i, :] = Fcal[i].derivatives()
+        else:
+            D[i, 0] = Fcal[i]
+
+    return D
+
+
+
+#Optimization & Root Finding
+#full Newton: root-finding
+#Require len(F) = len(x)
+#Newton and Mini take the derivatives of F without generated code at their first
+#_COMPILE_AFTER iterates. They then run code generated from the trace of F (see
+#CodeGen) at the later iterates, unless its tape has more than _COMPILE_NODES
+#nodes: generating the code costs about as much as a few dozen evaluations, and
+#grows with the tape
+_COMPILE_AFTER = 10
+_COMPILE_NODES = 20000
+
+class _Iterates():
+
+    ''' The derivatives of F at the iterates of Newton and Mini, in the format of
+    J_F, for an F with n outputs. Until _COMPILE_AFTER iterates have been
+    derived, the gradient of an one-vector F is replayed on the tape of traced
+    (one backward sweep), and the Jacobian of a vector F and the Hessian come
+    from the forward passes of J_F, rather than from a backward sweep per output
+    or a Hessian-vector product per input on the tape. After that they come from
+    the code generated by traced, a CompiledFunction (CodeGen.compiled(F) with
+    cache = True), if its tape has at most _COMPILE_NODES nodes and none of its
+    values were read while tracing. Generated code kept from an earlier call with
+    cache = True is used from the first iterate.
+    '''
+
+    def __init__(self, F, n, traced):
+        self.F = F
+        self.n = n
+        self.traced = traced
+        self.count = 0
+        self.compiled = None
+
+    def jacobian(self, x, H = False):
+        if self.compiled is None and (self.count >= _COMPILE_AFTER or self.traced.compiles > 0):
+            tape = self.traced.at(list(x))
+            self.compiled = len(tape.op) <= _COMPILE_NODES and not tape.values_read
+        self.count += 1
+        if self.compiled == True:
+            return self.traced.jacobian(list(x), H)
+        if self.n == 1 and H != True:
+            self.traced.at(list(x))
+            return self.traced._derivatives()
+        return _derivatives(self.F, list(x), self.n, H, None, False)
+
+def Newton(F, x, criteria = 10**(-8), max_iter = 5000, sparse = False, cache = False):
+    ''' Takes in user defined n-vector function F and m-vector list x, and 
+        returns the root closest to the initial guess (x).
+        
+        RETURNS
+        ========
+        A dictionary with:
+            - x_min: the root found
+            - F(x_min): the value of the function at the found root
+            - number of iter(ations) it took to iteratively find the root
+              
+        NOTES
+        =====
+        PRE:
+             - F: A user defined function that returns a length n list
+             - x: A length m list of numeric types with an initial guess for the root
+             - criteria: the minimum stopping criterion for step size in Newton's method.
+                         Default value is set to 10^(-8)
+             - max_iter = 5000: maximum iterations for the newton's method to stop, default set to 5000
+             - sparse = False: when True, the Jacobian at each iterate is computed in
+                         one forward pass per color of its columns (see J_F), with the
+                         sparsity pattern detected at the first iterate
+             - cache = False: when True, the trace and generated code of F (see
+                         CodeGen.compiled) and the length of F(x) (see Memo.memo) are
+                         kept per function object F and reused by later calls. Only
+                         for an F whose parameters (the closure and global values it
+                         reads) do not change between calls: the generated code holds
+                         their values at the first call
+
+        
+        POST:
+             - Returns a dictionary with the root found (x_min), the value of the function at the root (F(x_min))
+               and the number of iterations taken to find the root (number of iter)
+               
+        EXAMPLES
+        =========
+        >>> import numpy as np
+        >>> x = [0.2,0.1]
+        >>> F = lambda x: [x[0] * x[0], x[1] + x[0]]
+        >>> np.isclose(Newton(F,x)['x_min: '][0], 0)
+        True
+        >>> np.isclose(Newton(F,x)['F(x_min): '][0], 0)
+        True
+        >>> Newton(F,x)['number of iter: ']
+        25
+        
+        '''    
+    x_k = np.array(x)
+    rel_step = 1
+    i = 0
+    
+    results = memo(F) if cache == True else EvaluationCache(maxsize = 0)
+    if results.length(F, x) != len(x):
+        raise ValueError ("Need to be a system of n functions with n unknowns!")
+        
+    else: 
+        #F is derived with J_F at the first iterates, and with code generated from
+        #its trace after that (see _Iterates). Unless cache = True the code is built
+        #anew at every call, as it holds the constants F read (see CodeGen.compiled)
+        F_traced = compiled(F) if cache == True else CompiledFunction(F)
+        iterates = _Iterates(F, len(x), F_traced)
+        xk_1 = 100*x_k  
+        while i < max_iter and np.linalg.norm(x_k-xk_1)>criteria:
+            if sparse == True:
+                F_k, J_k = F_traced.sparse_jacobian(list(x_k))
+                J_k = J_k.toarray()
+            else:
+                JF_k = iterates.jacobian(x_k)
+                F_k = JF_k[0]
+                J_k = JF_k[1]
+            deltaX = np.linalg.solve(J_k, -F_k)
+            
+            
+            xk_1 = x_k
+            x_k = x_k + deltaX
+            i += 1
+        
+        return {"x_min: ": x_k, "F(x_min): ": iterates.jacobian(x_k)[0], "number of iter: ": i}
+
+
+
+
+#Rows of the trace allocated at first by Mini, doubled whenever they are used up
+_TRACE_ROWS = 16
+
+class _Trace():
+
+    ''' The iterates of Mini, one per row of a preallocated buffer. With size None
+    every iterate is kept and the buffer doubles when full; with a positive size
+    only the last size iterates are kept, the buffer being reused as a ring; with
+    size 0 nothing is kept.
+
+    EXAMPLES
+    =========
+    >>> t = _Trace([0.0, 0.0], size = 2)
+    >>> for i in range(1, 4):
+    ...     t.append([i, -i])
+    >>> t.array()
+    array([[ 2., -2.],
+           [ 3., -3.]])
+    '''
+
+    def __init__(self, x, size = None):
+        self.size = size
+        self.count = 0
+        self.rows = np.empty((_TRACE_ROWS if size is None else size, len(x)))
+        self.append(x)
+
+    def append(self, x):
+        if self.size == 0:
+            return
+        if self.count == len(self.rows) and self.size is None:
+            rows = np.empty((2 * len(self.rows), self.rows.shape[1]))
+            rows[:self.count] = self.rows
+            self.rows = rows
+        self.rows[self.count % len(self.rows)] = x
+        self.count += 1
+
+    def array(self):
+        ''' Returns a copy of the iterates kept, oldest first, or None with size 0 '''
+        if self.size == 0:
+            return None
+        if self.count <= len(self.rows):
+            return self.rows[:self.count].copy()
+        start = self.count % len(self.rows)
+        return np.concatenate((self.rows[start:], self.rows[:start]))
+
+
+#Optimization: Minimization for F from R^n to R
+def Mini(F, x, method = "quasi-newton-BFGS", criteria = 10**(-8), max_iter_GD = 5000, rate = 0.0001, plot = False, sparse = False, trace = True, cache = False):
+
+    '''
+    For optimization problems. Minimize an one-vector function F that takes in 
+    n variables, F: R^n -> R. Optimization methods provided are: newton, quasi-newton-BFGS,
+    and gradient-descent. 
+    
+        
+    RETURNS
+    ========
+    All methods returns as a dictionary:
+        "x_min": the minimization point x calculated
+        "min F(x)": the function value evaluated at minimization point x_min
+        "number of iter": number of iterations
+        "trace": a history of the x_k calculated in the iterations, one per row (all
+                of them, the last ones or None, see trace below)
+        "Jacobian F(x_min)": First derivative information evaluated at minimization point x_min,
+                    calculated with our Automatic Differentiation library
+        
+    In addtion:
+        
+    "newton" method also output in the dictionary:
+        "Hessian F(x_min)": Hessian matrix evaluated at minimization point x_min, calculated
+                    with our Automatic Differentiation library (a Sparsity.CSRMatrix
+                    with sparse = True)
+                    
+    "quasi-newton-BFGS" method also output in the dictionary:
+        "Hessian approximate": The approximated Hessian matrix in the last iteration, calculated 
+                    in the BFGS algorithm
+    
+    NOTES
+    =====
+    PRE:
+        - F: A user defined function that returns a length 1 list
+        - x: A length n list of numeric types
+        - method = "quasi-newton-BFGS": Optimization method choice, default
+                to "quasi-newton-BFGS". Other options are "newton" and "gradient-descent"
+        - criteria = 10**(-8): Criteria to stop iterations for the optimization 
+                methods, |x_k-xk_1| < criteria;
+                Note: For "gradient-descent" method, since the method can converge very slowly,
+                the stopping criteria is to stop once reaching maximum iteration steps that can 
+                be defined by the user or when |x_k-xk_1| < criteria
+        - max_iter_GD = 5000: maximum iterations for the chosen method to stop, default set to 5000
+        - rate = 0.0001: learning rate of the gradient-descent method, default to 0.0001
+        - plot = False (or 0): if plot = True (or 1), require len(x) = 1 or len(x) = 2;
+                If plot = True, a plot of the iteration trace will show up (matplotlib is
+                only imported then, see Plot.plot_trace)
+        - sparse = False: for the "newton" method, when True the Hessian at each iterate is
+                recovered from one Hessian-vector product per color of a star coloring of
+                its sparsity pattern (see TracedFunction.sparse_jacobian), rather than one
+                per variable. Suited to partially separable F with many variables; the
+                Newton step is still solved densely
+        - trace = True: True keeps every iterate in "trace"; a positive integer k
+                keeps only the last k iterates (in a buffer of k rows); False keeps
+                none ("trace" is None). Either way memory and time are linear in the
+                number of iterations
+        - cache = False: when True, the trace and generated code of F (see
+                CodeGen.compiled) and the length of F(x) (see Memo.memo) are kept per
+                function object F and reused by later calls. Only for an F whose
+                parameters (the closure and global values it reads) do not change
+                between calls: the generated code holds their values at the first call
+        
+        
+    POST: 
+        - return a dictionary of minimization information as described above
+        
+    EXAMPLES
+    =========
+    >>> F3 = lambda x:[100*(x[1]-x[0]*x[0])*(x[1]-x[0]*x[0]) + (1-x[0])*(1-x[0])]
+    >>> Mini(F3, [1, 0.5])['x_min']
+    array([1., 1.])
+    >>> Mini(F3, [1, 0.5])['min F(x)']
+    array([1.93577378e-21])
+    >>> Mini(F3, [1, 0.5])['Jacobian F(x_min)']
+    array([-1.04250164e-09,  5.55377966e-10])
+    >>> Mini(F3, [1, 0.5])['Hessian approximate']
+    array([[0.49616688, 0.99235036],
+           [0.99235036, 1.98973386]])
+    >>> Mini(F3, [1, 0.5])['number of iter']
+    31
+    
+    >>> Mini(F3, [1, 0.5], method = "newton")['x_min']
+    array([1., 1.])
+    >>> Mini(F3, [1, 0.5], method = "newton")['min F(x)']
+    array([0.])
+    >>> Mini(F3, [1, 0.5], method = "newton")['Jacobian F(x_min)']
+    array([-0.,  0.])
+    >>> Mini(F3, [1, 0.5], method = "newton")['Hessian F(x_min)']
+    array([[ 802., -400.],
+           [-400.,  200.]])
+    >>> Mini(F3, [1, 0.5], method = "newton")['number of iter']
+    2
+    
+    >>> Mini(F3, [1, 0.9],method = "gradient-descent")['x_min']
+    array([0.96727347, 0.9354844 ])
+    >>> Mini(F3, [1, 0.9], method = "gradient-descent")['min F(x)']
+    array([0.00107281])
+    >>> Mini(F3, [1, 0.9], method = "gradient-descent")['number of iter']
+    5000
+    
+    '''
+    
+    #Catch errors:
+    results = memo(F) if cache == True else EvaluationCache(maxsize = 0)
+    if results.length(F, x) != 1:
+        raise ValueError ("F needs to be a function from R^n to R!")
+    
+    if plot not in [True, False]:
+        raise ValueError ("Enter True or False for whether a plot should be output.")
+    
+    if plot == True:
+        if len(x) != 1 and len(x) != 2:
+            raise ValueError ("Cannot make plots of the iteration steps, since x is of more than 2 dimensions!")
+
+    if isinstance(trace, bool):
+        size = None if trace else 0
+    elif isinstance(trace, numbers.Integral) and trace > 0:
+        size = int(trace)
+    else:
+        raise ValueError ("Enter True, False or a positive integer for the iterates kept in the trace.")
+
+    if plot == True and size == 0:
+        raise ValueError ("Cannot make plots of the iteration steps, since trace = False keeps none!")
+    
+    if method != "newton" and method != "quasi-newton-BFGS" and method != "gradient-descent":
+        raise ValueError ("Optimization methods provided are newton, quasi-newton-BFGS and gradient-descent. Please choose one from them.")
+        
+    if isinstance(rate, numbers.Real) == False:
+        raise TypeError ("Rate must be a numeric value.")
+
+    #F is derived with J_F at the first iterates, and with code generated from its
+    #trace after that (see _Iterates). Unless cache = True the code is built anew
+    #at every call, as it holds the constants F read (see CodeGen.compiled)
+    F_traced = compiled(F) if cache == True else CompiledFunction(F)
+    iterates = _Iterates(F, 1, F_traced)
+        
+    
+    if method == "newton":
+        derivatives = F_traced.sparse_jacobian if sparse == True else iterates.jacobian
+        x_k = np.array(x)
+        x_trace = _Trace(x_k, size)
+        i = 0
+        
+        xk_1 = 100*x_k
+    
+        while i < max_iter_GD and np.linalg.norm(x_k-xk_1)>criteria:
+            
+            JH_k = derivatives(list(x_k), H = True) 
+        
+            J_k = JH_k[1].toarray()[0] if sparse == True else JH_k[1][0]
+            H_k = JH_k[2].toarray() if sparse == True else JH_k[2]
+        
+            deltaX = np.linalg.solve(H_k, -J_k)
+            xk_1 = x_k
+            x_k = x_k + deltaX
+            
+            x_trace.append(x_k)
+            i += 1
+        
+        JH_k = derivatives(list(x_k), H = True) 
+        J_k = JH_k[1].toarray()[0] if sparse == True else JH_k[1][0]
+            
+        result = {"x_min": x_k, "min F(x)": JH_k[0], "Jacobian F(x_min)": J_k, "Hessian F(x_min)": JH_k[2], "number of iter": i,  "trace":x_trace.array()}
+   
+        
+    if method == "quasi-newton-BFGS":  #H_k is Inverse Hessian approximation
+        x_k = np.array(x)
+
+        x_trace = _Trace(x_k, size)
+        i = 0
+        I = np.eye(len(x),len(x))
+        
+        H_k = I
+        
+        JF_k = iterates.jacobian(x_k)
+        J_k = JF_k[1][0]
+        
+        xk_1 = 100*x_k
+        
+            
+        while i < max_iter_GD and np.linalg.norm(x_k-xk_1)>criteria:
+            deltaX = - np.matmul(H_k, J_k)
+            
+            xk_1 = x_k
+            x_k = x_k + deltaX
+            
+            if np.linalg.norm(x_k-xk_1) != 0: 
+                x_trace.append(x_k)
+            
+                JF_k2 = iterates.jacobian(x_k)
+                J_k2 = JF_k2[1][0]
+            
+                yk = J_k2 - J_k    #vector
+            
+            
+                rouk = 1/(yk.T @ deltaX)    #number
+                H_k = np.matmul(np.matmul((I - np.outer((deltaX * rouk), yk.T)), H_k), (I - np.outer((rouk * yk), deltaX.T))) + np.outer((rouk * deltaX), deltaX.T) 
+        
+                J_k = J_k2
+                i += 1
+        
+        result = {"x_min": x_k, "min F(x)": JF_k2[0], "Jacobian F(x_min)": JF_k2[1][0], "Hessian approximate": H_k,  "number of iter": i,  "trace":x_trace.array()}
+        
+        
+    if method == "gradient-descent":
+        x_k = np.array(x)
+        x_trace = _Trace(x_k, size)
+        i=0
+        xk_1 = 100*x_k
+        while i < max_iter_GD and np.linalg.norm(x_k-xk_1)>criteria:
+            JF_k = iterates.jacobian(x_k)
+            J_k = JF_k[1][0]
+            
+            sk = -J_k
+            xk_1 = x_k
+            x_k = x_k + rate * sk
+            
+            x_trace.append(x_k)
+            i += 1
+            
+        JF_k = iterates.jacobian(x_k)
+            
+        result = {"x_min": x_k, "min F(x)": JF_k[0], "Jacobian F(x_min)": JF_k[1][0], "number of iter": i,  "trace":x_trace.array()}
+        
+    if plot == True:
+        #matplotlib is only imported when a plot is made (see Plot)
+        from hotAD.Plot import plot_trace
+        plot_trace(F, result["trace"])
+
+    return result
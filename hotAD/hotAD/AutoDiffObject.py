@@ -1,880 +1,1133 @@
-import numbers
-
-class AutoDiff():
-
-    ''' Create objects that return the value and partial derivatives of desired functions. Additionally,
-    the second partial derivatives can also be returned.
-
-    INSTANCE VARIABLES
-    =======
-    - val: numeric type, value of the variable to be evaluated a
-
-    - varName: string,
-             either created when the user is creating the AutoDiff
-             object at the beginning, eg, x = AutoDiff(3, "x");
-             or as "dummy" in function operations
-
-    - *args: read in args[0], which is a dictionary of derivative(s);
-            eg. {"x":1, "y":2} means partial derivative with respect to x is 1 and
-            partial derivative with respect to y is 2;
-            Only situation that *args present is in the output of methods'
-            implementation return.
-
-            If Hessian switch is on (H=True specified when instantiating the AD object),
-            then read in args[1], which is a dictionary of second partial derivatives;
-            e.g. {"x": 1, "y": 2, "xy":3} means the second partial derivative of the
-            function with respect to x is 1, with respect to y is 2, and with respect
-            to x and y is 3.
-
-    EXAMPLE:
-        EITHER: (created at the beginning by user)
-            To calculate first partial derivatives:
-            x = AutoDiff(3, "x")
-            To also calculate second partial derivatives:
-            x = AutoDiff(3, "x", H = True)
-
-        OR: (in method implementation)
-            def...:
-                .....
-                return AutoDiff(x0*y0, "dummy", {"x":aa, "y":bb})
-    '''
-
-    def __init__(self, val, varName, *args, H = False):
-
-        if isinstance(val, numbers.Real):
-            self.val = val
-        else:
-            raise TypeError ("Please enter an integer or a float for the value of the AutoDiff object.")
-
-        if isinstance(varName,str):
-            if varName.isalnum():
-                self.varName = varName
-            else:
-                raise TypeError("Please enter a alphanumeric char for the name of the AutoDiff object.")
-
-        else:
-            raise TypeError("Please enter a character for the name of the AutoDiff object.")
-
-        if H in [True, False]:
-            self.H = H
-        else:
-            raise TypeError ("Please enter a truth value for including the Hessian.")
-
-        if varName != "dummy":
-            if len(varName) == 1:
-                self.der = {varName:1}
-                if H == True:
-                    self.der2 = {varName:0}
-            else:
-                raise TypeError("Please enter a single character as the variable name.")
-
-        else:
-            self.der = args[0]
-            if H == True:
-                self.der2 = args[1]
-
-    def __eq__(self, other):
-
-        '''Returns the truth value of two objects being equal
-        RETURNS
-        ========
-        Truth value of two AD objects being equal in value and derivatives.
-
-        PRE:
-             - Current instance of AutoDiff class
-             - EITHER: another instance of AutoDiff class
-                 OR: float
-
-        POST:
-             - Truth value of equal value and derivative
-
-        EXAMPLES
-        =========
-        >>> z = AutoDiff(1,'x')
-        >>> a = AutoDiff(1,'x')
-        >>> z == a
-        True
-
-        >>> l = AutoDiff(2,'z')
-        >>> m = AutoDiff(2,'x')
-        >>> l == m
-        False
-
-        '''
-        if self.H == True:
-            if isinstance(other, AutoDiff):
-                return self.val == other.val and self.der == other.der and self.der2 == other.der2
-        else:
-            if isinstance(other,AutoDiff):
-                return self.val == other.val and self.der == other.der
-        return False
-
-    def __neq__(self, other):
-        return not self.__eq__(other)
-
-
-    def __neg__(self):
-
-        ''' Returns another AutoDiff object which is the negative of the instance of the complex class.
-            This is a special method.
-
-        RETURNS
-        ========
-        AutoDiff object with negative value and negative derivative of the current instance.
-        If Hessian of the current instance has been specified, then the negative second derivatives are also returned.
-
-        NOTES
-        =====
-        PRE:
-             - Current instance of AutoDiff class
-        POST:
-             - Returns a new Autodiff class instance
-        EXAMPLES
-        =========
-        >>> x = AutoDiff(1,'x')
-        >>> t = -x
-        >>> print(t.val, t.der)
-        -1 {'x': -1}
-
-        >>> y = AutoDiff(2, 'y', H = True)
-        >>> r = -y
-        >>> print(r.val, r.der, r.der2)
-        -2 {'y': -1} {'y': 0}
-        '''
-
-        derDict = {}      #Create a new dictionary to store updated derivative(s) information
-        der2Dict = {}
-        setSelfDer = set(self.der)      #give a set of keys, eg. set({x:1, y:2}) = set('x', 'y')
-        # Store negatives of each partial derivative
-        for key in setSelfDer:
-            derDict[key] = -self.der[key]
-            if self.H == True:
-                der2Dict[key] = -self.der2[key]
-
-        if self.H == True:
-            return AutoDiff(-1* self.val, "dummy", derDict, der2Dict, H = True)
-        else:
-            return AutoDiff(-1* self.val, "dummy", derDict, der2Dict, H = False)
-
-    def __mul__(self, other):
-
-        ''' Returns the another AutoDiff object which is the product of current AutoDiff object
-            and another object (either AutoDiff object or float) separated by '*'.
-            This is a special method.
-
-        RETURNS
-        ========
-        A new instance of AutoDiff object
-        NOTES
-        =====
-        PRE:
-             - Current instance of AutoDiff class
-             - EITHER: another instance of AutoDiff class
-               OR: float
-
-        POST:
-             - Return a new Autodiff class instance
-        EXAMPLES
-        =========
-        >>> a = AutoDiff(1, 'a')
-        >>> b = AutoDiff(2, 'b')
-        >>> t = a * b
-        >>> print(t.val)
-        2
-        >>> print(t.der['a'])
-        2
-        >>> print(t.der['b'])
-        1
-
-        >>> a = AutoDiff(1, 'a')
-        >>> b = 33
-        >>> t = a * b
-        >>> print(t.val, t.der)
-        33 {'a': 33}
-
-
-        >>> a = AutoDiff(3, 'a', H=True)
-        >>> b = AutoDiff(2, 'b',H=True)
-        >>> t = a * a * b * b
-        >>> print(t.val)
-        36
-        >>> print(t.der['a'])
-        24
-        >>> print(t.der2['a'])
-        8
-        '''
-
-        if isinstance(other, AutoDiff):
-            derDict = {}      #Create a new dictionary to store updated derivative(s) information
-            der2Dict = {}
-
-            setSelfDer = set(self.der)      #give a set of keys, eg. set({x:1, y:2}) = set('x', 'y')
-            setOtherDer = set(other.der)     #give a set of keys, eg. set({y:1, z:2}) = set('y', 'z')
-
-            #look through element in the Union set:eg from above would be {'x', 'y', 'z'}
-            for key in setSelfDer.union(setOtherDer):
-                for key2 in setSelfDer.union(setOtherDer):
-
-                    # Both derivative dicts have partial derivative info for this variable
-                    if key in setSelfDer and key in setOtherDer:
-                        derDict[key] = self.der[key] * other.val + self.val * other.der[key]
-
-                        if self.H == True:
-                            if key2+key in der2Dict:
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = self.der2[key] *other.val + \
-                                                    2*other.der[key]*self.der[key] +\
-                                                    self.val*other.der2[key]
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]*other.val + \
-                                                             self.der[key]*other.der[key2]+ \
-                                                             self.der[key2]*other.der[key]+ \
-                                                             self.val*other.der2[key+key2]
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]*other.val + \
-                                                             self.der[key2]*other.der[key]
-                                    else:
-                                        der2Dict[key+key2] = self.der[key]*other.der[key2]+ \
-                                                             self.val*other.der2[key +key2]
-
-                    #if only one of them have the partial derivative info for the variable
-                    elif key in setSelfDer:
-                        derDict[key] = self.der[key]*other.val
-
-                        if self.H == True:
-
-                            if key2+key in der2Dict:
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = self.der2[key]*other.val
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]*other.val + \
-                                                             self.der[key]*other.der[key2]
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]*other.val
-                                    else:
-                                        der2Dict[key+key2] = self.der[key]*other.der[key2]
-
-                    else: #key in other
-                        derDict[key] = other.der[key]*self.val
-
-                        if self.H == True:
-                            if key2+key in der2Dict:
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = other.der2[key]*self.val
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = other.der2[key+key2]*self.val + \
-                                                             other.der[key]*self.der[key2]
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = other.der[key]*self.der[key2]
-                                    else:
-                                        der2Dict[key+key2] = other.der2[key + key2]*self.val
-
-            if self.H == True:
-                return AutoDiff(self.val * other.val, "dummy", derDict, der2Dict, H = True)
-            else:
-                return AutoDiff(self.val * other.val, "dummy", derDict, der2Dict, H = False)
-
-        else:
-            try:
-                derDict = {}
-                der2Dict = {}
-                for key in self.der:
-                    derDict[key] = other.real * self.der[key]
-                if self.H == True:
-                    for key in self.der2:
-                        der2Dict[key] = other.real * self.der2[key]
-                    return AutoDiff(self.val * other.real, "dummy", derDict, der2Dict, H = True)
-                else:
-                    return AutoDiff(self.val * other.real, "dummy", derDict, der2Dict, H = False)
-
-            except:
-                raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
-
-
-    __rmul__ = __mul__
-
-
-    def __truediv__(self,other):
-
-        ''' Returns the another AutoDiff object which is the current AutoDiff object
-            divided by another object (either AutoDiff object or float) separated by '/'.
-            This is a special method.
-
-        RETURNS
-        ========
-        A new instance of AutoDiff object
-
-        NOTES
-        =====
-        PRE:
-             - Current instance of AutoDiff class
-             - EITHER: another instance of AutoDiff class
-                 OR: float
-
-        POST:
-             - Return a new Autodiff class instance
-
-        EXAMPLES
-        =========
-        >>> a = AutoDiff(1, 'a')
-        >>> b = AutoDiff(2, 'b')
-        >>> t = a / b
-        >>> print(t.val)
-        0.5
-        >>> print(t.der['a'])
-        0.5
-        >>> print(t.der['b'])
-        -0.25
-
-        >>> a = AutoDiff(1, 'a')
-        >>> b = 5
-        >>> t = a / b
-        >>> print(t.val, t.der)
-        0.2 {'a': 0.2}
-
-        >>> a = AutoDiff(1, 'a', H=True)
-        >>> b = AutoDiff(2, 'b', H=True)
-        >>> t = a / (b)
-        >>> print(t.val)
-        0.5
-        >>> print(t.der['a'])
-        0.5
-        >>> print(t.der['b'])
-        -0.25
-        >>> print(t.der2['b'])
-        0.25
-
-        >>> a = AutoDiff(1, 'a', H=True)
-        >>> b = 5
-        >>> t = a / b
-        >>> print(t.val, t.der, t.der2)
-        0.2 {'a': 0.2} {'a': 0.0}
-
-        '''
-
-        try:
-
-            derDict = {}
-            der2Dict = {}
-
-            setSelfDer = set(self.der)      #give a set of keys, eg. set({x:1, y:2}) = set('x', 'y')
-            setOtherDer = set(other.der)     #give a set of keys, eg. set({y:1, z:2}) = set('y', 'z')
-
-            #look through element in the Union set:eg from above would be {'x', 'y', 'z'}
-            for key in setSelfDer.union(setOtherDer):
-                for key2 in setSelfDer.union(setOtherDer):
-
-                    if key in setSelfDer and key in setOtherDer:
-                        derDict[key] = (self.der[key] * other.val - self.val * other.der[key])/(other.val * other.val)
-
-                        if self.H == True:
-                            if key2+key in der2Dict:
-                                der2Dict[key+key2] = der2Dict[key2+key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = self.der2[key]/other.val - \
-                                            (self.val * other.der2[key]/other.val**2) - \
-                                            (2 * self.der[key] * other.der[key]/other.val**2) + \
-                                            (2 * (other.der[key]**2) * self.val/other.val**3)
-
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]/other.val - \
-                                                (self.der[key] * other.der[key2])/(other.val**2) - \
-                                                (other.der2[key+key2] * self.val)/(other.val**2) - \
-                                                (other.der[key] * self.der[key2]/(other.val **2)) + \
-                                                (2 * other.der[key] * other.der[key2] * self.val)/(other.val**3)
-
-
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]/other.val - \
-                                                (other.der[key] * self.der[key2]/(other.val **2))
-
-                                    elif key2 in setOtherDer:
-                                        der2Dict[key+key2] = 2*other.der[key]*other.der[key2] * self.val / other.val ** 3 -\
-                                                self.der[key] * other.der[key2]/other.val**2 -\
-                                                self.val * other.der2[key+key2]/other.val**2
-
-
-                    elif key in setSelfDer:
-                        derDict[key] = (self.der[key] )/(other.val)
-
-                        if self.H == True:
-                            if key2+key in der2Dict:
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key :
-                                    der2Dict[key] = self.der2[key]/other.val
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = (self.der2[key+key2]/other.val) - \
-                                                (other.der[key2]*self.der[key])/(other.val**2)
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]/(other.val)
-                                    else:
-                                        der2Dict[key+key2] = -other.der[key2] * self.der[key] / (other.val**2)
-
-                    elif key in setOtherDer:
-                        derDict[key] = (-1*self.val * other.der[key])/(other.val*other.val)
-
-                        if self.H == True:
-                            if key2+key in der2Dict:
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = -self.val*other.der2[key]/other.val**2 + \
-                                            2*self.val*(other.der[key]**2)/other.val**3
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = - self.der[key2] * other.der[key] / other.val**2 - \
-                                                other.der2[key+key2] * self.val / other.val**2 + \
-                                                2 * other.der[key] * other.der[key2] * self.val/other.val**3
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = (-other.der[key] * self.der[key2]) / (other.val**2)
-                                    else:
-                                        der2Dict[key+key2] = (-self.val*other.der2[key+key2]) / (other.val**2) + \
-                                                2*other.der[key]*other.der[key2]*self.val/(other.val**3)
-            if self.H == True:
-                return AutoDiff(self.val/other.val, "dummy", derDict, der2Dict, H = True)
-            else:
-                return AutoDiff(self.val/other.val, "dummy", derDict, der2Dict, H = False)
-
-        except ZeroDivisionError as err:
-            raise ZeroDivisionError("Denominator cannot have value 0.")
-
-        except:
-            try:
-                derDict = {}
-                der2Dict = {}
-                for key in self.der:
-                    derDict[key] = (1/other.real) * self.der[key]
-
-                if self.H == True:
-                    for key in self.der2:
-                        der2Dict[key] = (1/other.real) * self.der2[key]
-                    return AutoDiff(self.val/other.real, "dummy", derDict, der2Dict, H = True)
-                else:
-                    return AutoDiff(self.val/other.real, "dummy", derDict, der2Dict, H = False)
-
-            except ZeroDivisionError as err:
-                raise ZeroDivisionError("Denominator cann ot have value 0.")
-
-            except:
-                raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
-
-    def __rtruediv__(self,other):
-
-        ''' Returns the another AutoDiff object which is the current AutoDiff object
-            divided by another object (either AutoDiff object or float) separated by '/'.
-            This is a special method.
-
-        RETURNS
-        ========
-        A new instance of AutoDiff object
-
-        NOTES
-        =====
-        PRE:
-             - Current instance of AutoDiff class
-             - EITHER: another instance of AutoDiff class
-                 OR: float
-
-        POST:
-             - Return a new Autodiff class instance
-        EXAMPLES
-        =========
-
-        >>> a = AutoDiff(1, 'a', H=True)
-        >>> b = 5
-        >>> t = b / a
-        >>> print(t.val, t.der,t.der2)
-        5.0 {'a': -5.0} {'a': 10.0}
-
-        '''
-
-        try:
-
-            derDict = {}
-            der2Dict = {}
-
-            setSelfDer = set(self.der)           #give a set of keys, eg. set({x:1, y:2}) = set('x', 'y')
-            setOtherDer = set(other.der)         #give a set of keys, eg. set({y:1, z:2}) = set('y', 'z')
-
-            for key in setSelfDer.union(setOtherDer):
-                for key2 in setSelfDer.union(setOtherDer):
-
-                    if key in setSelfDer and key in setOtherDer:
-                        derDict[key] = (self.val * other.der[key] - self.der[key] * other.val)/(self.val * self.val)
-
-                        if self.H == True:
-                            if key2+key in der2Dict:
-                                der2Dict[key+key2] = der2Dict[key2+key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = other.der2[key]/self.val - \
-                                                    (self.der2[key]*other.val/self.val**2) - \
-                                                    (2*other.der[key] * self.der[key]/self.val**2) + \
-                                                    (2 * other.val * self.der[key] * self.der[key] / self.val ** 3)
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = other.der2[key+key2] / self.val - \
-                                                             (other.val * self.der2[key+key2]) / self.val**2 - \
-                                                             (self.der[key] * other.der[key2] / self.val**2) - \
-                                                             (other.der[key] * self.der[key2] / self.val**2) + \
-                                                             (2*other.val *self.der[key] * self.der[key2]/self.val**3)
-
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = (- other.val * self.der2[key+key2]) / self.val ** 2 - \
-                                                             (other.der[key] * self.der[key2] / self.val ** 2) + \
-                                                             (2*self.der[key] * self.der[key2] * other.val / self.val ** 3)
-                                    else:
-                                        der2Dict[key+key2] = other.der2[key+key2]/self.val - \
-                                                             (self.der[key] * other.der[key2] / self.val ** 2)
-
-
-                    elif key in setSelfDer:
-                        derDict[key] = (- self.der[key] * other.val) / self.val**2
-
-                        if self.H == True:
-                            if key2+key in list(der2Dict.keys()):
-                                der2Dict[key+key2] = der2Dict[key2+key]
-
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = - other.val * self.der2[key] / self.val ** 2 + \
-                                                    2 * other.val * (self.der[key] ** 2)/self.val ** 3
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = 2 * other.val * self.der[key] * self.der[key2]/self.val ** 3 -\
-                                                            other.der[key2] * self.der[key]/self.val**2 - \
-                                                            other.val * self.der2[key+key2]/self.val**2
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = 2 * other.val * self.der[key] * self.der[key2]/self.val ** 3 -\
-                                                            other.val * self.der2[key+key2]/self.val**2
-                                    else:
-                                        der2Dict[key+key2] = -other.der[key2] * self.der[key]/self.val**2
-
-
-                    elif key in setOtherDer:
-                        derDict[key] = other.der[key]/self.val
-
-                        if self.H == True:
-                            if key2+key in list(der2Dict.keys()):
-                                der2Dict[key+key2] = der2Dict[key2+key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = other.der2[key]/self.val
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = other.der2[key+key2]/self.val -\
-                                                             other.der[key]*self.der[key2]/self.val**2
-
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] =  - other.der[key]*self.der[key2]/self.val**2
-
-                                    elif key2 in setOtherDer:
-                                        der2Dict[key+key2] = other.der2[key+key2]/self.val
-
-            if self.H == True:
-                return AutoDiff(other.val/self.val, "dummy", derDict, der2Dict, H = True)
-            else:
-                return AutoDiff(other.val/self.val, "dummy", derDict, der2Dict, H = False)
-
-        except ZeroDivisionError as err:
-            raise ZeroDivisionError("Denominator cann ot have value 0.")
-
-        except:
-            try:
-                derDict = {}
-                der2Dict = {}
-                for key in self.der:
-                    for key2 in self.der:
-
-                        derDict[key] = (1/(self.val * self.val)) * (-1 * other.real * self.der[key])
-
-                        if self.H == True:
-                            if key == key2:
-                                der2Dict[key] = -other.real*((self.der2[key]*self.val - 2*self.der[key]**2)/self.val**3)
-                            else:
-                                der2Dict[key+key2] = - other.real * self.der2[key+key2] / self.val**2 + \
-                                                2* other.real * self.der[key] * self.der[key2]/self.val**3
-                if self.H == True:
-                    return AutoDiff(other.real/self.val, "dummy", derDict, der2Dict, H = True)
-                else:
-                    return AutoDiff(other.real/self.val, "dummy", derDict, der2Dict, H = False)
-
-            except ZeroDivisionError as err:
-                raise ZeroDivisionError("Denominator cann ot have value 0.")
-
-            except:
-                raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
-
-
-    def __add__(self, other):
-
-        ''' Returns the another AutoDiff object which is the sum of current AutoDiff object
-            and another object (either AutoDiff object or float) separated by '+'.
-            This is a special method.
-        RETURNS
-        ========
-        A new instance of AutoDiff object
-        NOTES
-        =====
-        PRE:
-             - Current instance of AutoDiff class
-             - EITHER: another instance of AutoDiff class
-                 OR: float
-        POST:
-             - Return a new Autodiff class instance
-        EXAMPLES
-        =========
-        >>> a = AutoDiff(1, 'a')
-        >>> b = AutoDiff(2, 'b')
-        >>> t = a + b
-        >>> print(t.val)
-        3
-        >>> print(t.der['a'])
-        1
-        >>> print(t.der['b'])
-        1
-        >>> a = AutoDiff(1, 'a')
-        >>> b = 33
-        >>> t = a + b
-        >>> print(t.val, t.der)
-        34 {'a': 1}
-        '''
-
-        try:
-        #if isinstance(other, AutoDiff):
-            derDict = {}
-            der2Dict = {}
-            setSelfDer = set(self.der)
-            setOtherDer = set(other.der)
-
-            for key in setSelfDer.union(setOtherDer):
-                for key2 in setSelfDer.union(setOtherDer):
-
-                    if key in setSelfDer and key in setOtherDer:
-                        derDict[key] = self.der[key] + other.der[key]
-
-                        if self.H == True:
-                            if key2+key in list(der2Dict.keys()):
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key:
-
-                                    der2Dict[key] = self.der2[key] + other.der2[key]
-                                else:
-
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = self.der2[key+key2] + other.der2[key+key2]
-
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]
-
-                                    else:
-                                        der2Dict[key+key2] = other.der2[key+key2]
-
-                    elif key in setSelfDer:
-                        derDict[key] = self.der[key]
-
-                        if self.H == True:
-                            if key2+key in list(der2Dict.keys()):
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = self.der2[key]
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]
-
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]
-
-                                    else:
-                                        der2Dict[key+key2] = 0
-
-
-                    else:
-                        derDict[key] = other.der[key]
-
-                        if self.H == True:
-                            if key2+key in list(der2Dict.keys()):
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = other.der2[key]
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = other.der2[key+key2]
-
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = 0
-
-                                    else:
-                                        der2Dict[key+key2] = other.der2[key+key2]
-            if self.H == True:
-                return AutoDiff(self.val + other.val, "dummy", derDict, der2Dict, H = True)
-            else:
-                return AutoDiff(self.val + other.val, "dummy", derDict, der2Dict, H = False)
-        except:
-            try:
-                if self.H == True:
-                    return AutoDiff(self.val + other.real, "dummy", self.der, self.der2, H = True)
-                else:
-                    return AutoDiff(self.val + other.real, "dummy", self.der, H = False)
-            except:
-                raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
-
-
-    __radd__ = __add__
-
-    def __sub__(self,other):
-
-        ''' Returns the another AutoDiff object which is the difference of current AutoDiff object
-            and another object (either AutoDiff object or float) separated by '-'.
-            This is a special method.
-        RETURNS
-        ========
-        A new instance of AutoDiff object
-        NOTES
-        =====
-        PRE:
-             - Current instance of AutoDiff class
-             - EITHER: another instance of AutoDiff class
-                 OR: float
-        POST:
-             - Return a new Autodiff class instance
-        EXAMPLES
-        =========
-        >>> x = AutoDiff(1, 'x')
-        >>> y = AutoDiff(2, 'y')
-        >>> t = x - y
-        >>> print(t.val)
-        -1
-        >>> print(t.der['x'])
-        1
-        >>> print(t.der['y'])
-        -1
-        >>> a = AutoDiff(1, 'a')
-        >>> b = 33
-        >>> t = a - b
-        >>> print(t.val, t.der)
-        -32 {'a': 1}
-
-        >>> a = AutoDiff(4, 'a', H=True)
-        >>> b = AutoDiff(2, 'b', H = True)
-        >>> t = a - b
-        >>> print(t.val)
-        2
-        >>> print(t.der['a'])
-        1
-        >>> print(t.der['b'])
-        -1
-        >>> print(t.der2['a'])
-        0
-        >>> print(t.der2['b'])
-        0
-        >>> print(t.der2['b'])
-        0
-
-        >>> a = AutoDiff(1, 'a', H=True)
-        >>> b = 33
-        >>> t = a - b
-        >>> print(t.val, t.der, t.der2)
-        -32 {'a': 1} {'a': 0}
-        '''
-
-        try:
-        #if isinstance(other, AutoDiff):
-            derDict = {}
-            der2Dict = {}
-            setSelfDer = set(self.der)
-            setOtherDer = set(other.der)
-
-            for key in setSelfDer.union(setOtherDer):
-                for key2 in setSelfDer.union(setOtherDer):
-
-                    if key in setSelfDer and key in setOtherDer:
-                        derDict[key] = self.der[key] - other.der[key]
-
-                        if self.H == True:
-                            if key2+key in list(der2Dict.keys()):
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = self.der2[key] - other.der2[key]
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = self.der2[key+key2] - other.der2[key+key2]
-
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]
-
-                                    else:
-                                        der2Dict[key+key2] = -other.der2[key+key2]
-
-
-                    elif key in setSelfDer:
-                        derDict[key] = self.der[key]
-
-                        if self.H == True:
-                            if key2+key in list(der2Dict.keys()):
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = self.der2[key]
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]
-
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = self.der2[key+key2]
-
-                                    else:
-                                        der2Dict[key+key2] = 0
-
-                    else:
-                        derDict[key] = -1 * other.der[key]
-
-                        if self.H == True:
-                            if key2+key in list(der2Dict.keys()):
-                                der2Dict[key + key2] = der2Dict[key2 + key]
-                            else:
-                                if key2 == key:
-                                    der2Dict[key] = -1 * other.der2[key]
-                                else:
-                                    if key2 in setSelfDer and key2 in setOtherDer:
-                                        der2Dict[key+key2] = -other.der2[key+key2]
-
-                                    elif key2 in setSelfDer:
-                                        der2Dict[key+key2] = 0
-
-                                    else:
-                                        der2Dict[key+key2] = -other.der2[key+key2]
-
-            if self.H == True:
-                return AutoDiff(self.val - other.val, "dummy", derDict, der2Dict, H = True)
-            else:
-                return AutoDiff(self.val - other.val, "dummy", derDict, der2Dict, H = False)
-
-        except:
-            try:
-                if self.H == True:
-                    return AutoDiff(self.val - other.real, "dummy", self.der, self.der2, H = True)
-                else:
-                    return AutoDiff(self.val - other.real, "dummy", self.der, H = False)
-            except:
-                raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
-
-
-    __rsub__ = __sub__
\ No newline at end of file
+import numbers
+import functools
+import numpy as np
+
+class VariableRegistry():
+
+    ''' Maps variable names to integer indices. The index attached to a name is the
+    position of that variable in every tangent vector (and Hessian block), so
+    derivatives are never looked up by string once a variable has been created.
+
+    EXAMPLE:
+            reg = VariableRegistry()
+            reg.index("x")        # 0, registered on first use
+            reg.index("speed")    # 1
+            reg.name(1)           # "speed"
+    '''
+
+    def __init__(self):
+        self._index = {}
+        self._names = []
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def index(self, name):
+        ''' Returns the index of name, registering it if it is new '''
+        try:
+            return self._index[name]
+        except KeyError:
+            self._index[name] = len(self._names)
+            self._names.append(name)
+            return self._index[name]
+
+    def indices(self, names):
+        ''' Returns the indices of an iterable of names as an integer numpy array '''
+        return np.array([self.index(name) for name in names], dtype = int)
+
+    def name(self, i):
+        ''' Returns the name registered at index i '''
+        return self._names[i]
+
+
+#Registry shared by every AutoDiff object
+registry = VariableRegistry()
+
+#Tangent vectors have shape (k,) for a single point, or (k, N) for a batch of N
+#points: the batch axis comes last so that per-point coefficients of shape (N,)
+#broadcast against them in every chain rule expression.
+
+def _pad(arr, n):
+    ''' Zero-pads a tangent vector so that it covers the first n registered variables '''
+    k = arr.shape[0]
+    if k == n:
+        return arr
+    out = np.zeros((n,) + arr.shape[1:])
+    out[:k] = arr
+    return out
+
+def _align(a, b):
+    ''' Returns a and b padded to a common length, with a single-point tangent
+    given a trailing axis when the other one is batched '''
+    if a.shape == b.shape:
+        return a, b
+    if a.ndim != b.ndim:
+        if a.ndim == 1:
+            a = a[:, None]
+        else:
+            b = b[:, None]
+    n = max(a.shape[0], b.shape[0])
+    return _pad(a, n), _pad(b, n)
+
+def _nonzero_rows(a):
+    ''' Indices of the nonzero entries of a tangent vector (at any point of a batch) '''
+    if a.ndim == 1:
+        return np.flatnonzero(a)
+    return np.flatnonzero(np.any(a != 0, axis = 1))
+
+#Second derivatives are stored sparsely as {(i, j): value} with i <= j, holding
+#only the structurally nonzero entries of the (symmetric) Hessian.
+
+def _hess_combine(*terms):
+    ''' Returns the sparse Hessian sum(coef * hess for coef, hess in terms) '''
+    out = {}
+    for coef, hess in terms:
+        if not out:
+            if np.ndim(coef) == 0 and coef == 1:
+                out = dict(hess)
+            else:
+                out = {key: coef * value for key, value in hess.items()}
+            continue
+        for key, value in hess.items():
+            out[key] = out.get(key, 0.0) + coef * value
+    return out
+
+@functools.lru_cache(maxsize = 64)
+def _triu(k):
+    ''' Row and column indices of the upper triangle of a k x k block '''
+    return np.triu_indices(k)
+
+def _hess_outer(a, b = None, scale = None):
+    ''' Returns the sparse Hessian a a^T, or a b^T + b a^T when b is given, for
+    tangent vectors a and b, times scale when given '''
+    if b is None:
+        support = _nonzero_rows(a)
+        a = b = a[support]
+    else:
+        a, b = _align(a, b)
+        support = _nonzero_rows((a != 0) | (b != 0))
+        a, b = a[support], b[support]
+    if a.ndim == 1:
+        block = np.outer(a, b)
+    else:
+        block = a[:, None] * b[None, :]
+    if a is not b:
+        block += np.swapaxes(block, 0, 1)
+    rows, cols = _triu(support.shape[0])
+    values = block[rows, cols]
+    if scale is not None:
+        if values.ndim == 1 and np.ndim(scale) == 1:
+            values = values[:, None]
+        values = values * scale
+    if values.ndim == 1:
+        keep = values != 0
+        keys = zip(support[rows[keep]].tolist(), support[cols[keep]].tolist())
+        return dict(zip(keys, values[keep].tolist()))
+    keep = np.any(values != 0, axis = 1)
+    keys = zip(support[rows[keep]].tolist(), support[cols[keep]].tolist())
+    return dict(zip(keys, values[keep]))
+
+
+#Single-point tangent vectors of at most this length are expanded by _hess_chain
+#with Python floats, as NumPy's overhead per call dominates for so few entries
+_SHORT = 16
+
+def _hess_chain(hess, a, d1, d2):
+    ''' Returns the sparse Hessian d1 * hess + d2 * a a^T of f(u), for u with tangent
+    vector a and sparse Hessian hess and a unary function f with first and second
+    derivatives d1 and d2 at u, in one pass over the entries of hess '''
+    if a.ndim == 1 and a.shape[0] <= _SHORT and not isinstance(d2, np.ndarray):
+        out = {}
+        if d2 != 0:
+            support = [(i, v) for i, v in enumerate(a.tolist()) if v != 0]
+            for p, (i, vi) in enumerate(support):
+                scaled = d2 * vi
+                for j, vj in support[p:]:
+                    out[(i, j)] = scaled * vj
+    else:
+        out = _hess_outer(a, scale = d2)
+    for key, value in hess.items():
+        out[key] = out.get(key, 0.0) + d1 * value
+    return out
+
+
+class _DerivativeDict(dict):
+    ''' Dictionary view of a derivative vector, keyed by variable name.
+    Only nonzero entries are listed; any other registered variable (or pair of
+    registered variables) reads as 0.
+    '''
+
+    def __missing__(self, key):
+        if isinstance(key, tuple):
+            if len(key) == 2 and key[0] in registry and key[1] in registry:
+                return 0.0
+        elif key in registry:
+            return 0.0
+        raise KeyError(key)
+
+
+class AutoDiff():
+
+    ''' Create objects that return the value and partial derivatives of desired functions. Additionally,
+    the second partial derivatives can also be returned.
+
+    INSTANCE VARIABLES
+    =======
+    - val: numeric type, value of the variable to be evaluated a; or a 1-d numpy
+           array of N values, to evaluate at N points at once (batched). The
+           derivatives in der and der2 are then arrays of N values as well
+
+    - varName: string,
+             either created when the user is creating the AutoDiff
+             object at the beginning, eg, x = AutoDiff(3, "x");
+             or as "dummy" in function operations
+
+    - *args: read in args[0], which is the tangent vector (a float64 numpy array
+            whose i-th entry is the partial derivative with respect to the i-th
+            registered variable; for a batch, the i-th row holds it at each of
+            the N points), or a dictionary of derivative(s);
+            eg. {"x":1, "y":2} means partial derivative with respect to x is 1 and
+            partial derivative with respect to y is 2;
+            Only situation that *args present is in the output of methods'
+            implementation return.
+
+            If Hessian switch is on (H=True specified when instantiating the AD object),
+            then read in args[1], the second partial derivatives stored once per
+            unordered pair of variable indices, {(i, j): value} with i <= j; pairs
+            that are structurally zero are left out.
+
+    - der: dictionary view of the partial derivatives, eg. {"x": 1.0, "y": 2.0}
+
+    - der2: dictionary view of the second partial derivatives (only with H=True);
+            e.g. {"x": 1.0, "y": 2.0, ("x", "y"): 3.0} means the second partial derivative of the
+            function with respect to x is 1, with respect to y is 2, and with respect
+            to x and y is 3.
+
+    Variable names can be any alphanumeric string (except "dummy"); each name is
+    given an integer index in the shared VariableRegistry, `registry`.
+
+    EXAMPLE:
+        EITHER: (created at the beginning by user)
+            To calculate first partial derivatives:
+            x = AutoDiff(3, "x")
+            To also calculate second partial derivatives:
+            x = AutoDiff(3, "x", H = True)
+            To evaluate at several points at once:
+            x = AutoDiff(np.array([1.0, 2.0, 3.0]), "x")
+
+        OR: (in method implementation)
+            def...:
+                .....
+                return AutoDiff._new(x0*y0, grad, hess)
+    '''
+
+    __slots__ = ("val", "varName", "H", "_grad", "_hess", "_owns")
+
+    def __init__(self, val, varName, *args, H = False):
+
+        if isinstance(val, numbers.Real):
+            self.val = val
+        elif isinstance(val, np.ndarray) and val.ndim == 1 and np.isrealobj(val):
+            self.val = val.astype(float, copy = False)
+        else:
+            raise TypeError ("Please enter an integer or a float (or a 1-d array of them) for the value of the AutoDiff object.")
+
+        if isinstance(varName,str):
+            if varName.isalnum():
+                self.varName = varName
+            else:
+                raise TypeError("Please enter a alphanumeric char for the name of the AutoDiff object.")
+
+        else:
+            raise TypeError("Please enter a character for the name of the AutoDiff object.")
+
+        if H in [True, False]:
+            self.H = H
+        else:
+            raise TypeError ("Please enter a truth value for including the Hessian.")
+
+        if varName != "dummy":
+            #seeds span the variables up to this one only, so that their width
+            #does not grow with every name ever registered; shorter tangents are
+            #zero-padded when combined (see _align)
+            index = registry.index(varName)
+            self._grad = np.zeros((index + 1,) + np.shape(self.val))
+            self._grad[index] = 1.0
+            if H == True:
+                self._hess = {}
+
+        else:
+            if isinstance(args[0], dict):
+                self._grad, self._hess = self._from_dicts(*args)
+            else:
+                self._grad = args[0]
+                if H == True:
+                    self._hess = args[1]
+
+        #whether _grad and _hess belong to this object alone; they may be shared
+        #with other objects until an in-place method copies them (copy on write)
+        self._owns = False
+
+    @classmethod
+    def _new(cls, val, grad, hess = None):
+        ''' Returns the intermediate result with value val, tangent vector grad and,
+        when given, sparse Hessian hess, without the checks made on user input '''
+        obj = object.__new__(cls)
+        obj.val = val
+        obj.varName = "dummy"
+        obj._grad = grad
+        obj._owns = False
+        if hess is None:
+            obj.H = False
+        else:
+            obj.H = True
+            obj._hess = hess
+        return obj
+
+    def _chain(self, value, d1, d2):
+        ''' Returns f(self) for a unary function f with value value and first and
+        second derivatives d1 and d2 at self.val, by the chain rule (see _hess_chain) '''
+        if self.H:
+            return AutoDiff._new(value, d1 * self._grad, _hess_chain(self._hess, self._grad, d1, d2))
+        return AutoDiff._new(value, d1 * self._grad)
+
+    @staticmethod
+    def _from_dicts(derDict, der2Dict = None):
+        ''' Converts name-keyed derivative dictionaries into a tangent vector and sparse Hessian.
+        Mixed second derivatives are keyed by a (name, name) tuple. '''
+        indices = [registry.index(key) for key in derDict]
+        grad = np.zeros(max(indices, default = -1) + 1)
+        for i, value in zip(indices, derDict.values()):
+            grad[i] = value
+        hess = {}
+        for key, value in (der2Dict or {}).items():
+            if isinstance(key, tuple):
+                i, j = sorted((registry.index(key[0]), registry.index(key[1])))
+            else:
+                i = j = registry.index(key)
+            hess[(i, j)] = value
+        return grad, hess
+
+    @property
+    def der(self):
+        ''' Dictionary view of the first partial derivatives, keyed by variable name '''
+        grad = self._grad
+        if grad.ndim == 1:
+            return _DerivativeDict((registry.name(i), grad[i].item()) for i in np.flatnonzero(grad))
+        return _DerivativeDict((registry.name(i), grad[i] + np.zeros_like(self.val)) for i in _nonzero_rows(grad))
+
+    @property
+    def der2(self):
+        ''' Dictionary view of the second partial derivatives, keyed by variable name
+        for pure partials and by a (name, name) tuple for mixed partials '''
+        if not self.H:
+            raise AttributeError("Second derivatives are only available with H=True.")
+        view = _DerivativeDict()
+        for (i, j), value in self._hess.items():
+            if not np.any(value):
+                continue
+            if np.ndim(value) == 0:
+                value = float(value)
+            if i == j:
+                view[registry.name(i)] = value
+            else:
+                view[(registry.name(i), registry.name(j))] = value
+                view[(registry.name(j), registry.name(i))] = value
+        return view
+
+    def _gradient(self, indices):
+        ''' Returns the partial derivatives with respect to the variables at the given
+        registry indices, as a dense float64 array '''
+        return _pad(self._grad, max(int(np.max(indices)) + 1, self._grad.shape[0]))[indices]
+
+    def _hessian(self, indices):
+        ''' Returns the second partial derivatives with respect to the variables at the
+        given registry indices, as a dense float64 matrix assembled from the sparse storage '''
+        m = len(indices)
+        out = np.zeros((m, m))
+        if not self._hess:
+            return out
+        position = np.full(max(int(np.max(indices)), max(map(max, self._hess))) + 1, -1)
+        position[indices] = np.arange(m)
+        keys = np.array(list(self._hess.keys()), dtype = int)
+        values = np.array(list(self._hess.values()), dtype = float)
+        rows, cols = position[keys[:, 0]], position[keys[:, 1]]
+        keep = (rows >= 0) & (cols >= 0)
+        out[rows[keep], cols[keep]] = values[keep]
+        out[cols[keep], rows[keep]] = values[keep]
+        return out
+
+    def __eq__(self, other):
+
+        '''Returns the truth value of two objects being equal
+        RETURNS
+        ========
+        Truth value of two AD objects being equal in value and derivatives.
+
+        PRE:
+             - Current instance of AutoDiff class
+             - EITHER: another instance of AutoDiff class
+                 OR: float
+
+        POST:
+             - Truth value of equal value and derivative
+
+        EXAMPLES
+        =========
+        >>> z = AutoDiff(1,'x')
+        >>> a = AutoDiff(1,'x')
+        >>> z == a
+        True
+
+        >>> l = AutoDiff(2,'z')
+        >>> m = AutoDiff(2,'x')
+        >>> l == m
+        False
+
+        '''
+        if isinstance(other, AutoDiff):
+            if not np.array_equal(self.val, other.val):
+                return False
+            if not np.array_equal(*_align(self._grad, other._grad)):
+                return False
+            if self.H == True:
+                if other.H != True:
+                    return False
+                keys = set(self._hess).union(other._hess)
+                return all(np.array_equal(self._hess.get(key, 0), other._hess.get(key, 0)) for key in keys)
+            return True
+        return False
+
+    def __neq__(self, other):
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+
+        '''Compares the value of the object with the value of another AutoDiff object
+        or with a number; likewise for <=, > and >=.
+        RETURNS
+        ========
+        Truth value of the comparison (an array of them for a batch)
+
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(1, 'x')
+        >>> y = AutoDiff(2, 'y')
+        >>> x < y, x >= 1, 2 > x * y
+        (True, True, False)
+        '''
+        return self.val < getattr(other, "val", other)
+
+    def __le__(self, other):
+        return self.val <= getattr(other, "val", other)
+
+    def __gt__(self, other):
+        return self.val > getattr(other, "val", other)
+
+    def __ge__(self, other):
+        return self.val >= getattr(other, "val", other)
+
+
+    def __neg__(self):
+
+        ''' Returns another AutoDiff object which is the negative of the instance of the complex class.
+            This is a special method.
+
+        RETURNS
+        ========
+        AutoDiff object with negative value and negative derivative of the current instance.
+        If Hessian of the current instance has been specified, then the negative second derivatives are also returned.
+
+        NOTES
+        =====
+        PRE:
+             - Current instance of AutoDiff class
+        POST:
+             - Returns a new Autodiff class instance
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(1,'x')
+        >>> t = -x
+        >>> print(t.val, t.der)
+        -1 {'x': -1.0}
+
+        >>> y = AutoDiff(2, 'y', H = True)
+        >>> r = -y
+        >>> print(r.val, r.der, r.der2)
+        -2 {'y': -1.0} {}
+        '''
+
+        if self.H == True:
+            return AutoDiff._new(-1* self.val, -self._grad, _hess_combine((-1, self._hess)))
+        else:
+            return AutoDiff._new(-1* self.val, -self._grad)
+
+    def __mul__(self, other):
+
+        ''' Returns the another AutoDiff object which is the product of current AutoDiff object
+            and another object (either AutoDiff object or float) separated by '*'.
+            This is a special method.
+
+        RETURNS
+        ========
+        A new instance of AutoDiff object
+        NOTES
+        =====
+        PRE:
+             - Current instance of AutoDiff class
+             - EITHER: another instance of AutoDiff class
+               OR: float
+
+        POST:
+             - Return a new Autodiff class instance
+        EXAMPLES
+        =========
+        >>> a = AutoDiff(1, 'a')
+        >>> b = AutoDiff(2, 'b')
+        >>> t = a * b
+        >>> print(t.val)
+        2
+        >>> print(t.der['a'])
+        2.0
+        >>> print(t.der['b'])
+        1.0
+
+        >>> a = AutoDiff(1, 'a')
+        >>> b = 33
+        >>> t = a * b
+        >>> print(t.val, t.der)
+        33 {'a': 33.0}
+
+
+        >>> a = AutoDiff(3, 'a', H=True)
+        >>> b = AutoDiff(2, 'b',H=True)
+        >>> t = a * a * b * b
+        >>> print(t.val)
+        36
+        >>> print(t.der['a'])
+        24.0
+        >>> print(t.der2['a'])
+        8.0
+        '''
+
+        if isinstance(other, AutoDiff):
+            selfGrad, otherGrad = _align(self._grad, other._grad)
+
+            #product rule, applied to every partial derivative at once
+            grad = selfGrad * other.val + self.val * otherGrad
+
+            if self.H == True:
+                hess = _hess_combine((other.val, self._hess), (self.val, other._hess),
+                                     (1, _hess_outer(selfGrad, otherGrad)))
+                return AutoDiff._new(self.val * other.val, grad, hess)
+            else:
+                return AutoDiff._new(self.val * other.val, grad)
+
+        else:
+            try:
+                if self.H == True:
+                    return AutoDiff._new(self.val * other.real, other.real * self._grad, _hess_combine((other.real, self._hess)))
+                else:
+                    return AutoDiff._new(self.val * other.real, other.real * self._grad)
+
+            except:
+                raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
+
+
+    __rmul__ = __mul__
+
+
+    def __truediv__(self,other):
+
+        ''' Returns the another AutoDiff object which is the current AutoDiff object
+            divided by another object (either AutoDiff object or float) separated by '/'.
+            This is a special method.
+
+        RETURNS
+        ========
+        A new instance of AutoDiff object
+
+        NOTES
+        =====
+        PRE:
+             - Current instance of AutoDiff class
+             - EITHER: another instance of AutoDiff class
+                 OR: float
+
+        POST:
+             - Return a new Autodiff class instance
+
+        EXAMPLES
+        =========
+        >>> a = AutoDiff(1, 'a')
+        >>> b = AutoDiff(2, 'b')
+        >>> t = a / b
+        >>> print(t.val)
+        0.5
+        >>> print(t.der['a'])
+        0.5
+        >>> print(t.der['b'])
+        -0.25
+
+        >>> a = AutoDiff(1, 'a')
+        >>> b = 5
+        >>> t = a / b
+        >>> print(t.val, t.der)
+        0.2 {'a': 0.2}
+
+        >>> a = AutoDiff(1, 'a', H=True)
+        >>> b = AutoDiff(2, 'b', H=True)
+        >>> t = a / (b)
+        >>> print(t.val)
+        0.5
+        >>> print(t.der['a'])
+        0.5
+        >>> print(t.der['b'])
+        -0.25
+        >>> print(t.der2['b'])
+        0.25
+
+        >>> a = AutoDiff(1, 'a', H=True)
+        >>> b = 5
+        >>> t = a / b
+        >>> print(t.val, t.der, t.der2)
+        0.2 {'a': 0.2} {}
+
+        '''
+
+        if isinstance(other, AutoDiff):
+            if np.any(other.val == 0):
+                raise ZeroDivisionError("Denominator cannot have value 0.")
+
+            quotient = self.val/other.val
+            selfGrad, otherGrad = _align(self._grad, other._grad)
+
+            #quotient rule: d(u/v) = (du - (u/v) dv) / v
+            grad = (selfGrad - quotient * otherGrad)/other.val
+
+            if self.H == True:
+                hess = _hess_combine((1/other.val, self._hess), (-quotient/other.val, other._hess),
+                                     (-1/other.val, _hess_outer(grad, otherGrad)))
+                return AutoDiff._new(quotient, grad, hess)
+            else:
+                return AutoDiff._new(quotient, grad)
+
+        try:
+            if other.real == 0:
+                raise ZeroDivisionError
+
+            if self.H == True:
+                return AutoDiff._new(self.val/other.real, self._grad/other.real, _hess_combine((1/other.real, self._hess)))
+            else:
+                return AutoDiff._new(self.val/other.real, self._grad/other.real)
+
+        except ZeroDivisionError as err:
+            raise ZeroDivisionError("Denominator cannot have value 0.")
+
+        except:
+            raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
+
+    def __rtruediv__(self,other):
+
+        ''' Returns the another AutoDiff object which is the current AutoDiff object
+            divided by another object (either AutoDiff object or float) separated by '/'.
+            This is a special method.
+
+        RETURNS
+        ========
+        A new instance of AutoDiff object
+
+        NOTES
+        =====
+        PRE:
+             - Current instance of AutoDiff class
+             - EITHER: another instance of AutoDiff class
+                 OR: float
+
+        POST:
+             - Return a new Autodiff class instance
+        EXAMPLES
+        =========
+
+        >>> a = AutoDiff(1, 'a', H=True)
+        >>> b = 5
+        >>> t = b / a
+        >>> print(t.val, t.der,t.der2)
+        5.0 {'a': -5.0} {'a': 10.0}
+
+        '''
+
+        if isinstance(other, AutoDiff):
+            return other.__truediv__(self)
+
+        try:
+            if np.any(self.val == 0):
+                raise ZeroDivisionError
+
+            quotient = other.real/self.val
+
+            #d(c/v) = -(c/v) dv / v
+            grad = -quotient * self._grad/self.val
+
+            if self.H == True:
+                hess = _hess_combine((2 * quotient/self.val**2, _hess_outer(self._grad)),
+                                     (-quotient/self.val, self._hess))
+                return AutoDiff._new(quotient, grad, hess)
+            else:
+                return AutoDiff._new(quotient, grad)
+
+        except ZeroDivisionError as err:
+            raise ZeroDivisionError("Denominator cannot have value 0.")
+
+        except:
+            raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
+
+    def __pow__(self, other):
+
+        ''' Returns the another AutoDiff object which is the current AutoDiff object
+            raised to the power of another object (either AutoDiff object or float)
+            separated by '**'. This is a special method.
+
+        RETURNS
+        ========
+        A new instance of AutoDiff object
+
+        NOTES
+        =====
+        PRE:
+             - Current instance of AutoDiff class
+             - EITHER: another instance of AutoDiff class
+                 OR: float
+        POST:
+             - Return a new Autodiff class instance
+
+        For a constant exponent r, the value, first and second derivative
+        coefficients x^r, r x^(r-1) and r (r-1) x^(r-2) are formed from a single
+        power (exactly, at x = 0, for an integer r >= 2). For an AutoDiff exponent,
+        x^y = exp(y log(x)) with x^y computed once; the base must then be positive.
+
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(2, 'x', H=True)
+        >>> t = x ** 3
+        >>> print(t.val, t.der, t.der2)
+        8 {'x': 12.0} {'x': 12.0}
+
+        >>> y = AutoDiff(3, 'y', H=True)
+        >>> t = x ** y
+        >>> print(t.val, t.der['x'], round(t.der['y'], 6))
+        8 12.0 5.545177
+        '''
+
+        if isinstance(other, AutoDiff):
+            if np.any(self.val <= 0):
+                raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
+
+            value = self.val ** other.val
+            log_base = np.log(self.val)
+            selfGrad, otherGrad = _align(self._grad, other._grad)
+
+            #x^y = exp(phi), phi = y log(x)
+            phi_der = other.val/self.val * selfGrad + log_base * otherGrad
+            grad = value * phi_der
+
+            if self.H == True:
+                hess = _hess_combine((1, _hess_outer(phi_der, scale = value)),
+                                     (1, _hess_outer(otherGrad, selfGrad, scale = value/self.val)),
+                                     (1, _hess_outer(selfGrad, scale = -value * other.val/self.val**2)),
+                                     (value * other.val/self.val, self._hess),
+                                     (value * log_base, other._hess))
+                return AutoDiff._new(value, grad, hess)
+            else:
+                return AutoDiff._new(value, grad)
+
+        if not isinstance(other, numbers.Real):
+            raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
+
+        if other == 0:
+            value = self.val ** 0
+            if self.H == True:
+                return AutoDiff._new(value, np.zeros_like(self._grad), {})
+            return AutoDiff._new(value, np.zeros_like(self._grad))
+        if other == 1:
+            self._owns = False
+            if self.H == True:
+                return AutoDiff._new(self.val, self._grad, self._hess)
+            return AutoDiff._new(self.val, self._grad)
+
+        integer = float(other).is_integer()
+        if integer and other >= 2:
+            #x^(r-2), times x twice, so that x = 0 needs no division
+            other = int(other)
+            power2 = self.val ** (other - 2)
+            power1 = power2 * self.val
+            value = power1 * self.val
+        else:
+            if isinstance(self.val, np.ndarray):
+                zero, negative = (self.val == 0).any(), (self.val < 0).any()
+            else:
+                zero, negative = self.val == 0, self.val < 0
+            if zero:
+                raise ZeroDivisionError("Denominator cannot have value 0.")
+            if not integer and negative:
+                raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
+            value = self.val ** float(other)
+            power1 = value/self.val
+            power2 = power1/self.val
+
+        return self._chain(value, other * power1, other * (other - 1) * power2)
+
+    def __rpow__(self, other):
+
+        ''' Returns the another AutoDiff object which is a positive float raised to
+            the power of the current AutoDiff object, e.g. 2 ** x. This is a special method.
+
+        RETURNS
+        ========
+        A new instance of AutoDiff object
+
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(3, 'x', H=True)
+        >>> t = 2 ** x
+        >>> print(t.val, round(t.der['x'], 6), round(t.der2['x'], 6))
+        8.0 5.545177 3.843624
+        '''
+
+        if not isinstance(other, numbers.Real):
+            raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
+        if other <= 0:
+            raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
+
+        value = float(other) ** self.val
+        log_base = np.log(other)
+        return self._chain(value, log_base * value, log_base**2 * value)
+
+
+    def __add__(self, other):
+
+        ''' Returns the another AutoDiff object which is the sum of current AutoDiff object
+            and another object (either AutoDiff object or float) separated by '+'.
+            This is a special method.
+        RETURNS
+        ========
+        A new instance of AutoDiff object
+        NOTES
+        =====
+        PRE:
+             - Current instance of AutoDiff class
+             - EITHER: another instance of AutoDiff class
+                 OR: float
+        POST:
+             - Return a new Autodiff class instance
+        EXAMPLES
+        =========
+        >>> a = AutoDiff(1, 'a')
+        >>> b = AutoDiff(2, 'b')
+        >>> t = a + b
+        >>> print(t.val)
+        3
+        >>> print(t.der['a'])
+        1.0
+        >>> print(t.der['b'])
+        1.0
+        >>> a = AutoDiff(1, 'a')
+        >>> b = 33
+        >>> t = a + b
+        >>> print(t.val, t.der)
+        34 {'a': 1.0}
+        '''
+
+        if isinstance(other, AutoDiff):
+            selfGrad, otherGrad = _align(self._grad, other._grad)
+
+            if self.H == True:
+                hess = _hess_combine((1, self._hess), (1, other._hess))
+                return AutoDiff._new(self.val + other.val, selfGrad + otherGrad, hess)
+            else:
+                return AutoDiff._new(self.val + other.val, selfGrad + otherGrad)
+
+        try:
+            #the result shares the derivative storage of self
+            value = self.val + other.real
+            self._owns = False
+            if self.H == True:
+                return AutoDiff._new(value, self._grad, self._hess)
+            else:
+                return AutoDiff._new(value, self._grad)
+        except:
+            raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
+
+
+    __radd__ = __add__
+
+    def __sub__(self,other):
+
+        ''' Returns the another AutoDiff object which is the difference of current AutoDiff object
+            and another object (either AutoDiff object or float) separated by '-'.
+            This is a special method.
+        RETURNS
+        ========
+        A new instance of AutoDiff object
+        NOTES
+        =====
+        PRE:
+             - Current instance of AutoDiff class
+             - EITHER: another instance of AutoDiff class
+                 OR: float
+        POST:
+             - Return a new Autodiff class instance
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(1, 'x')
+        >>> y = AutoDiff(2, 'y')
+        >>> t = x - y
+        >>> print(t.val)
+        -1
+        >>> print(t.der['x'])
+        1.0
+        >>> print(t.der['y'])
+        -1.0
+        >>> a = AutoDiff(1, 'a')
+        >>> b = 33
+        >>> t = a - b
+        >>> print(t.val, t.der)
+        -32 {'a': 1.0}
+
+        >>> a = AutoDiff(4, 'a', H=True)
+        >>> b = AutoDiff(2, 'b', H = True)
+        >>> t = a - b
+        >>> print(t.val)
+        2
+        >>> print(t.der['a'])
+        1.0
+        >>> print(t.der['b'])
+        -1.0
+        >>> print(t.der2['a'])
+        0.0
+        >>> print(t.der2['b'])
+        0.0
+
+        >>> a = AutoDiff(1, 'a', H=True)
+        >>> b = 33
+        >>> t = a - b
+        >>> print(t.val, t.der, t.der2)
+        -32 {'a': 1.0} {}
+        '''
+
+        if isinstance(other, AutoDiff):
+            selfGrad, otherGrad = _align(self._grad, other._grad)
+
+            if self.H == True:
+                hess = _hess_combine((1, self._hess), (-1, other._hess))
+                return AutoDiff._new(self.val - other.val, selfGrad - otherGrad, hess)
+            else:
+                return AutoDiff._new(self.val - other.val, selfGrad - otherGrad)
+
+        try:
+            #the result shares the derivative storage of self
+            value = self.val - other.real
+            self._owns = False
+            if self.H == True:
+                return AutoDiff._new(value, self._grad, self._hess)
+            else:
+                return AutoDiff._new(value, self._grad)
+        except:
+            raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
+
+
+    def __rsub__(self, other):
+
+        ''' Returns the another AutoDiff object which is a float minus the current
+            AutoDiff object, e.g. 1 - x. This is a special method.
+        RETURNS
+        ========
+        A new instance of AutoDiff object
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(1, 'x')
+        >>> t = 3 - x
+        >>> print(t.val, t.der)
+        2 {'x': -1.0}
+        '''
+
+        try:
+            return (-self).__add__(other)
+        except:
+            raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
+
+    def _own(self):
+        ''' Gives self its own copy of its derivative storage, unless it already has one '''
+        if not self._owns:
+            self._grad = self._grad.copy()
+            if self.H == True:
+                self._hess = dict(self._hess)
+            self._owns = True
+
+    def _check_inplace(self, other):
+        ''' Raises AttributeError, before anything is updated, when other cannot be
+        combined with self in place '''
+        if isinstance(other, AutoDiff):
+            if other.H != self.H:
+                raise AttributeError("Every AutoDiff term should have Hessian set to True, or none, to carry out the operation.")
+            return
+        try:
+            other.real
+        except:
+            raise AttributeError("Illegal argument. Needs to be either autodiff object or numeric value.")
+
+    def _adopt(self, result):
+        ''' Makes self hold the value and derivatives of result, and returns self '''
+        self.val = result.val
+        self._grad = result._grad
+        if self.H == True:
+            self._hess = result._hess
+        self._owns = False
+        return self
+
+    def _add_inplace(self, other, sign):
+        ''' Adds sign * other (sign = 1 or -1) to self in place and returns self '''
+        self._check_inplace(other)
+        if not isinstance(other, AutoDiff):
+            self.val = self.val + sign * other.real
+            return self
+        if other is self:
+            return self._adopt(self * (1 + sign))
+
+        grad = other._grad
+        k = grad.shape[0]
+        if k > self._grad.shape[0] or grad.ndim > self._grad.ndim:
+            #new variables or a batch: grow the storage once
+            selfGrad, grad = _align(self._grad, grad)
+            self._grad = selfGrad + sign * grad
+            if self.H == True and not self._owns:
+                self._hess = dict(self._hess)
+            self._owns = True
+        else:
+            self._own()
+            if grad.ndim < self._grad.ndim:
+                grad = grad[:, None]
+            if sign > 0:
+                self._grad[:k] += grad
+            else:
+                self._grad[:k] -= grad
+
+        if self.H == True:
+            hess = self._hess
+            for key, value in other._hess.items():
+                hess[key] = hess.get(key, 0.0) + sign * value
+        self.val = self.val + sign * other.val
+        return self
+
+    def add_inplace(self, other):
+
+        ''' Adds another object (either AutoDiff object or float) to the current AutoDiff
+            object in place, for accumulating a sum term by term.
+
+        RETURNS
+        ========
+        The current instance, updated
+
+        NOTES
+        =====
+        PRE:
+             - Current instance of AutoDiff class
+             - EITHER: another instance of AutoDiff class with the same H
+                 OR: float
+        POST:
+             - The value and derivatives are updated without allocating new
+               storage, and the work is proportional to the derivatives of other.
+               Every name for the current instance sees the update; objects that
+               only share its derivative storage do not (copy on write). An
+               illegal other raises AttributeError and leaves the instance as it was.
+             - s += term does not call this method: it is s = s + term, and leaves
+               other names for s unchanged. ElementaryFunctions.sum adds a whole
+               list of terms in one pass.
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(1, 'x')
+        >>> y = AutoDiff(2, 'y')
+        >>> s = x * y
+        >>> t = s + 0
+        >>> s = s.add_inplace(x)
+        >>> print(s.val, s.der['x'], t.val, t.der['x'])
+        3 3.0 2 2.0
+        '''
+
+        return self._add_inplace(other, 1)
+
+    def sub_inplace(self, other):
+
+        ''' Subtracts another object (either AutoDiff object or float) from the current
+            AutoDiff object in place (see add_inplace).
+
+        RETURNS
+        ========
+        The current instance, updated
+
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(1, 'x', H = True)
+        >>> s = x * x
+        >>> s = s.sub_inplace(x)
+        >>> print(s.val, s.der['x'], s.der2['x'])
+        0 1.0 2.0
+        '''
+
+        return self._add_inplace(other, -1)
+
+    def mul_inplace(self, other):
+
+        ''' Multiplies the current AutoDiff object by another object (either AutoDiff
+            object or float) in place, for accumulating a product factor by factor
+            (see add_inplace).
+
+        RETURNS
+        ========
+        The current instance, updated
+
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(2, 'x', H = True)
+        >>> y = AutoDiff(3, 'y', H = True)
+        >>> p = x + y
+        >>> p = p.mul_inplace(x)
+        >>> print(p.val, p.der['x'], p.der['y'], p.der2['x'], p.der2[('x', 'y')])
+        10 7.0 2.0 2.0 1.0
+        '''
+
+        self._check_inplace(other)
+        if not isinstance(other, AutoDiff):
+            factor = other.real
+            self._own()
+            self._grad *= factor
+            if self.H == True:
+                hess = self._hess
+                for key, value in hess.items():
+                    hess[key] = factor * value
+            self.val = self.val * factor
+            return self
+
+        if other is self or other._grad.shape[0] > self._grad.shape[0] or other._grad.ndim != self._grad.ndim:
+            return self._adopt(self * other)
+
+        self._own()
+        if self.H == True:
+            #product rule: other.val * H_self + self.val * H_other + (g_self g_other^T + g_other g_self^T)
+            outer = _hess_outer(self._grad, other._grad)
+            hess = self._hess
+            for key, value in hess.items():
+                hess[key] = other.val * value
+            for key, value in other._hess.items():
+                hess[key] = hess.get(key, 0.0) + self.val * value
+            for key, value in outer.items():
+                hess[key] = hess.get(key, 0.0) + value
+
+        k = other._grad.shape[0]
+        self._grad *= other.val
+        self._grad[:k] += self.val * other._grad
+        self.val = self.val * other.val
+        return self
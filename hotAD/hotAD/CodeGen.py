@@ -0,0 +1,447 @@
+##This module generates straight-line Python source for a traced function and its derivatives
+import heapq
+import math
+import re
+import weakref
+import numpy as np
+from hotAD.ReverseAD import OP, OPCODES, TracedFunction
+
+#Names available to the generated source
+_NAMESPACE = {"sin": math.sin, "cos": math.cos, "tan": math.tan, "log": math.log, "exp": math.exp,
+              "sqrt": math.sqrt, "asin": math.asin, "acos": math.acos, "atan": math.atan,
+              "mpow": math.pow}
+
+#Source templates of the local rules in ReverseAD: the value of a node v at
+#operands a and b, a condition under which the rule raises (the generated code
+#returns None instead), an auxiliary expression w shared by the partials, and the
+#partial derivatives (d0, d1, d00, d01, d11). Operations that raise by themselves
+#at the same points (e.g. log, sqrt, division) need no condition. pow_const and
+#const_pow are generated by _rule_source from the value of their constant operand.
+_TEMPLATES = {
+    "add": ("{a} + {b}", None, None, ("1.0", "1.0", "0.0", "0.0", "0.0")),
+    "sub": ("{a} - {b}", None, None, ("1.0", "-1.0", "0.0", "0.0", "0.0")),
+    "mul": ("{a} * {b}", None, None, ("{b}", "{a}", "0.0", "1.0", "0.0")),
+    "div": ("{a} / {b}", None, None, ("1.0 / {b}", "-{v} / {b}", "0.0", "-1.0 / {b}**2", "2.0 * {v} / {b}**2")),
+    "neg": ("-{a}", None, None, ("-1.0", "0.0", "0.0", "0.0", "0.0")),
+    "pow": ("{a} ** {b}", "{a} <= 0", "log({a})",
+            ("{b} * {v} / {a}", "{v} * {w}", "{b} * ({b} - 1.0) * {v} / {a}**2",
+             "{v} / {a} * (1.0 + {b} * {w})", "{v} * {w}**2")),
+    "sin": ("sin({a})", None, None, ("cos({a})", "0.0", "-{v}", "0.0", "0.0")),
+    "cos": ("cos({a})", None, None, ("-sin({a})", "0.0", "-{v}", "0.0", "0.0")),
+    "tan": ("tan({a})", "abs({v}) > 10**16", "1.0 / cos({a})**2", ("{w}", "0.0", "2.0 * {w} * {v}", "0.0", "0.0")),
+    "log": ("log({a})", None, None, ("1.0 / {a}", "0.0", "-1.0 / {a}**2", "0.0", "0.0")),
+    "exp": ("exp({a})", None, None, ("{v}", "0.0", "{v}", "0.0", "0.0")),
+    "sqrt": ("sqrt({a})", None, None, ("0.5 / {v}", "0.0", "-0.25 / ({a} * {v})", "0.0", "0.0")),
+    "logit": ("1.0 / (1.0 + exp(-{a}))", "{a} < 0", "{v} * (1.0 - {v})",
+              ("{w}", "0.0", "{w} * (1.0 - 2.0 * {v})", "0.0", "0.0")),
+    "arcsin": ("asin({a})", None, "1.0 / sqrt(1.0 - {a} * {a})", ("{w}", "0.0", "{a} * {w}**3", "0.0", "0.0")),
+    "arccos": ("acos({a})", None, "1.0 / sqrt(1.0 - {a} * {a})", ("-{w}", "0.0", "-{a} * {w}**3", "0.0", "0.0")),
+    "arctan": ("atan({a})", None, "1.0 / (1.0 + {a} * {a})", ("{w}", "0.0", "-2.0 * {a} * {w}**2", "0.0", "0.0")),
+}
+
+#Names, literals and negated names, which are used in place without a variable
+_SIMPLE = re.compile(r"-?[A-Za-z_]\w*|-?[0-9][0-9.e+-]*|\(-[0-9][0-9.e+-]*\)|float\('-?\w+'\)")
+_NAME = re.compile(r"[A-Za-z_]\w*")
+
+
+def _literal(value):
+    ''' Returns Python source for the float value '''
+    value = float(value)
+    if not math.isfinite(value):
+        return "float('{}')".format(value)
+    if math.copysign(1.0, value) < 0:
+        return "({!r})".format(value)
+    return repr(value)
+
+def _rule_source(op, a, b, v, w, c = None):
+    ''' Returns source for the operation op (see OPCODES) at the operands a and b,
+    given as names or literals, as (value, check, aux, partials) in the format of
+    _TEMPLATES. v and w name the node and its auxiliary expression, and c is the
+    value of the constant operand of pow_const and const_pow. '''
+    if op == "pow_const":
+        d0 = "0.0" if c == 0 else "{} * mpow({{a}}, {})".format(_literal(c), _literal(c - 1))
+        d00 = "0.0" if c * (c - 1) == 0 else "{} * mpow({{a}}, {})".format(_literal(c * (c - 1)), _literal(c - 2))
+        template = ("mpow({a}, {b})", None, None, (d0, "0.0", d00, "0.0", "0.0"))
+    elif op == "const_pow":
+        log_c = math.log(c)
+        template = ("mpow({a}, {b})", None, None,
+                    ("0.0", "{{v}} * {}".format(_literal(log_c)), "0.0", "0.0", "{{v}} * {}".format(_literal(log_c**2))))
+    else:
+        template = _TEMPLATES[op]
+    value, check, aux, partials = template
+    fill = lambda s: None if s is None else s.format(a = a, b = b, v = v, w = w)
+    return fill(value), fill(check), fill(aux), [fill(d) for d in partials]
+
+def _product(*factors):
+    ''' Returns source for the product of factors, dropping unit factors; "0.0"
+    stands for a structural zero '''
+    if "0.0" in factors:
+        return "0.0"
+    sign = factors.count("-1.0") % 2
+    factors = [f for f in factors if f not in ("1.0", "-1.0")]
+    product = " * ".join(factors) if factors else "1.0"
+    return "-" + product if sign else product
+
+def generate_source(tape, outputs, H = False, name = "traced"):
+    ''' Returns the source of a Python function name(x) which evaluates the
+    operations recorded on tape at the inputs x (a list of floats, one per input
+    node) with plain floats, as straight-line code without per-operation dispatch.
+    It returns [F, J], or [F, J, H] with H = True for one output, as lists: the
+    values of the output nodes, and the structurally nonzero entries of their
+    Jacobian w.r.t. the inputs and of the (unsymmetrized) Hessian, row by row.
+    The rows and columns of those entries are the attributes jacobian_index and
+    hessian_index of the function, as two lists each. The function returns None
+    where the tape does not describe F at x, i.e. where a guard of the tape
+    changes outcome or a rule of the tape would raise.
+
+    NOTES
+    =====
+    The Jacobian is generated with one backward sweep per output when there are
+    at most as many outputs as inputs, and with one forward tangent sweep per
+    input otherwise; each Hessian row is one forward-over-reverse sweep (see
+    Tape.hvp). Only nodes the outputs depend on are differentiated, and each
+    sweep only visits the nodes reachable from where it starts, so that the
+    work is proportional to the generated code rather than to the tape times the
+    number of sweeps.
+
+    EXAMPLES
+    =========
+    >>> from hotAD.ReverseAD import Tape
+    >>> tape = Tape()
+    >>> x, y = tape.variables([2, 3])
+    >>> print(generate_source(tape, [x * y + 1]))
+    def traced(x):
+        v0 = x[0]
+        v1 = x[1]
+        v2 = v0 * v1
+        v4 = v2 + 1.0
+        return [v4], [v1, v0]
+    traced.jacobian_index = ([0, 0], [0, 1])
+    '''
+    ops, arg0, arg1 = tape.op.tolist(), tape.arg0.tolist(), tape.arg1.tolist()
+    val = tape.val.tolist()
+    const, inp = OP["const"], OP["input"]
+    nodes = [f.index for f in outputs]
+    n, m = len(nodes), len(tape.inputs)
+    if H == True and n != 1:
+        raise ValueError ("F needs to be a function from R^n to R!")
+
+    #nodes the outputs depend on
+    live = [False] * len(ops)
+    for o in nodes:
+        live[o] = True
+    for i in range(len(ops) - 1, -1, -1):
+        if live[i]:
+            for j in (arg0[i], arg1[i]):
+                if j >= 0:
+                    live[j] = True
+
+    lines = ["def {}(x):".format(name)]
+    emit = lambda line: lines.append("    " + line)
+
+    def bind(expr, var):
+        if _SIMPLE.fullmatch(expr):
+            return expr
+        emit("{} = {}".format(var, expr))
+        return var
+
+    #values and partial derivatives
+    order = 5 if H == True else 2
+    names, partials = {}, {}
+    for k, i in enumerate(tape.inputs):
+        names[i] = "v{}".format(i)
+        emit("v{} = x[{}]".format(i, k))
+    for i, code in enumerate(ops):
+        if code == const:
+            names[i] = _literal(val[i])
+            continue
+        if code == inp:
+            continue
+        j, k = arg0[i], arg1[i]
+        c = val[k] if code == OP["pow_const"] else val[j] if code == OP["const_pow"] else None
+        v, w = "v{}".format(i), "w{}".format(i)
+        value, check, aux, d = _rule_source(OPCODES[code], names[j], names[k] if k >= 0 else None, v, w, c)
+        names[i] = v
+        emit("{} = {}".format(v, value))
+        if check is not None:
+            emit("if {}: return None".format(check))
+        if not live[i]:
+            continue
+        if aux is not None:
+            emit("{} = {}".format(w, aux))
+        partials[i] = [bind(d[s], "d{}_{}".format(s, i)) for s in range(order)]
+    for op, j, k, outcome in tape.guards:
+        emit("if ({} {} {}) != {}: return None".format(names[j], op, names[k], outcome))
+
+    def operands(i):
+        ''' (slot, operand) pairs of the non-constant operands of node i '''
+        if ops[i] in (const, inp):
+            return []
+        return [(s, j) for s, j in enumerate((arg0[i], arg1[i])) if j >= 0 and ops[j] != const]
+
+    def accumulate(acc, j, terms, var):
+        ''' Adds terms to the accumulator acc[j], named var once assigned; a single
+        simple term is used in place until another term is added '''
+        terms = [t for t in terms if t != "0.0"]
+        if not terms:
+            return
+        if acc.get(j) == var:
+            emit("{} += {}".format(var, " + ".join(terms)))
+        elif j in acc:
+            emit("{} = {}".format(var, " + ".join([acc[j]] + terms)))
+            acc[j] = var
+        elif len(terms) == 1 and _SIMPLE.fullmatch(terms[0]):
+            acc[j] = terms[0]
+        else:
+            emit("{} = {}".format(var, " + ".join(terms)))
+            acc[j] = var
+
+    #live nodes using each node, so that a forward sweep only visits the nodes
+    #reachable from its input
+    consumers = [[] for _ in ops]
+    for i in range(len(ops)):
+        if live[i]:
+            for s, j in operands(i):
+                if not consumers[j] or consumers[j][-1] != i:
+                    consumers[j].append(i)
+
+    def backward(o, tag):
+        ''' Emits the adjoints of every node w.r.t. node o, and returns them. Nodes are
+        visited from the last, as popped from a heap of those with an adjoint '''
+        adj = {o: "1.0"}
+        heap = [-o]
+        while heap:
+            i = -heapq.heappop(heap)
+            for s, j in operands(i):
+                new = j not in adj
+                accumulate(adj, j, [_product(adj[i], partials[i][s])], "{}_{}".format(tag, j))
+                if new and j in adj:
+                    heapq.heappush(heap, -j)
+        return adj
+
+    def forward(x, tag, needed = None):
+        ''' Emits the tangents of every live node in the direction of input node x,
+        or only of the nodes i with needed[i]. Nodes are visited from the first, as
+        popped from a heap of the consumers of those with a tangent '''
+        tan = {x: "1.0"}
+        heap = [c for c in consumers[x] if needed is None or needed[c]]
+        queued = set(heap)
+        while heap:
+            i = heapq.heappop(heap)
+            terms = [_product(tan[j], partials[i][s]) for s, j in operands(i) if j in tan]
+            accumulate(tan, i, terms, "{}_{}".format(tag, i))
+            if i in tan:
+                for c in consumers[i]:
+                    if c not in queued and (needed is None or needed[c]):
+                        queued.add(c)
+                        heapq.heappush(heap, c)
+        return tan
+
+    #position of each input node among the inputs
+    position = {i: k for k, i in enumerate(tape.inputs)}
+
+    def nonzeros(rows):
+        ''' Returns the entries other than "0.0" of rows, given as {column: entry},
+        and their positions '''
+        entries, index = [], ([], [])
+        for r, row in enumerate(rows):
+            for c in sorted(row):
+                if row[c] != "0.0":
+                    entries.append(row[c])
+                    index[0].append(r)
+                    index[1].append(c)
+        return "[{}]".format(", ".join(entries)), index
+
+    values = [names[o] for o in nodes]
+    if n <= m:
+        adjoints = [backward(o, "g{}".format(r)) for r, o in enumerate(nodes)]
+        J = [{position[i]: entry for i, entry in adj.items() if i in position} for adj in adjoints]
+    else:
+        J = [{} for o in nodes]
+        for k, i in enumerate(tape.inputs):
+            tan = forward(i, "t{}".format(k))
+            for r, o in enumerate(nodes):
+                if o in tan:
+                    J[r][k] = tan[o]
+    entries, jacobian_index = nonzeros(J)
+    result = "[{}], {}".format(", ".join(values), entries)
+    index_lines = ["{}.jacobian_index = {!r}".format(name, jacobian_index)]
+
+    if H == True:
+        #forward over reverse: the tangents of the adjoints along each input. The
+        #tangents needed are those of the operands of nodes with nonzero second
+        #partials, and of the nodes these depend on
+        o = nodes[0]
+        adj = adjoints[0] if n <= m else backward(o, "g0")
+        nonlinear = [live[i] and i in partials and any(d != "0.0" for d in partials[i][2:]) for i in range(len(ops))]
+        needed = [False] * len(ops)
+        for i in range(len(ops) - 1, -1, -1):
+            if nonlinear[i] or needed[i]:
+                for s, j in operands(i):
+                    needed[j] = True
+        rows = []
+        for k, x in enumerate(tape.inputs):
+            tan = forward(x, "t{}".format(k), needed)
+            adj_tan = {}
+            #only nodes with an operand with a tangent, or with a tangent adjoint,
+            #contribute, from the last
+            queued = {c for j in tan for c in consumers[j] if nonlinear[c] and c in adj}
+            heap = [-c for c in queued]
+            heapq.heapify(heap)
+            while heap:
+                i = -heapq.heappop(heap)
+                if i not in adj or not operands(i):
+                    continue
+                d = partials[i]
+                t = [tan.get(j, "0.0") if j >= 0 else "0.0" for j in (arg0[i], arg1[i])]
+                for s, j in operands(i):
+                    second = (d[2], d[3]) if s == 0 else (d[3], d[4])
+                    terms = [_product(adj[i], second[0], t[0]), _product(adj[i], second[1], t[1])]
+                    if i in adj_tan:
+                        terms.insert(0, _product(adj_tan[i], d[s]))
+                    accumulate(adj_tan, j, terms, "h{}_{}".format(k, j))
+                    if j in adj_tan and j not in queued:
+                        queued.add(j)
+                        heapq.heappush(heap, -j)
+            rows.append({position[i]: entry for i, entry in adj_tan.items() if i in position})
+        entries, hessian_index = nonzeros(rows)
+        result += ", " + entries
+        index_lines.append("{}.hessian_index = {!r}".format(name, hessian_index))
+
+    emit("return " + result)
+
+    #drop derivative temporaries that are never read; node values are kept, as
+    #computing them is what makes the function fail where F fails
+    used = set(_NAME.findall(lines[-1]))
+    body = []
+    for line in reversed(lines[1:-1]):
+        target = line.split()[0]
+        if target[0] in "dwgth" and target not in used:
+            continue
+        used.update(_NAME.findall(line))
+        body.append(line)
+    return "\n".join(lines[:1] + body[::-1] + lines[-1:] + index_lines)
+
+
+class CompiledFunction(TracedFunction):
+
+    ''' A TracedFunction whose tape is turned into plain Python source by
+    generate_source and compiled with compile(). Its first evaluation at a point
+    traces F; later evaluations run the generated function, which involves no
+    AutoDiff or ReverseAD objects. F is traced again, and the source regenerated,
+    when the generated function reports that the trace does not hold at x (see
+    generate_source). A tape whose node values were read while tracing (see
+    Tape.replay) is never compiled.
+
+    INSTANCE VARIABLES
+    =======
+    - F, tape, traces: as for TracedFunction
+    - sources: the generated source for the current tape, by value of H
+    - compiles, runs: number of compilations and of runs of generated code
+
+    EXAMPLE:
+            G = CompiledFunction(lambda x: [x[0] * x[1]])
+            G.jacobian([1, 2])     # traces F
+            G.jacobian([3, 4])     # generates and compiles the code, and runs it
+            print(G.sources[False])
+    '''
+
+    def __init__(self, F):
+        super().__init__(F)
+        self.sources = {}
+        self._functions = {}
+        self.compiles = 0
+        self.runs = 0
+
+    def _trace(self, x):
+        super()._trace(x)
+        self.sources = {}
+        self._functions = {}
+
+    def function(self, H = False):
+        ''' Returns the generated function of the current tape (see generate_source),
+        generating and compiling it on first use '''
+        H = H == True
+        if H not in self._functions:
+            source = generate_source(self.tape, self.outputs, H)
+            namespace = dict(_NAMESPACE)
+            exec(compile(source, "<hotAD generated>", "exec"), namespace)
+            function = namespace["traced"]
+            #positions of the entries returned, as index arrays
+            function.jacobian_index = tuple(np.array(a, dtype = int) for a in function.jacobian_index)
+            if H:
+                function.hessian_index = tuple(np.array(a, dtype = int) for a in function.hessian_index)
+            self.sources[H] = source
+            self._functions[H] = function
+            self.compiles += 1
+        return self._functions[H]
+
+    def jacobian(self, x, H = False):
+        ''' Returns [F(x), J_F(x)], or [F(x), J_F(x), H_F(x)] with H = True for an
+        one-vector function F, in the format of ADfun.J_F
+
+        EXAMPLES
+        =========
+        >>> G = CompiledFunction(lambda x: [x[0] * x[1] - x[0] if x[0] > 1 else x[1]])
+        >>> G.jacobian([2, 3])
+        [array([4.]), array([[2., 2.]])]
+        >>> G.jacobian([3, 1])
+        [array([0.]), array([[0., 3.]])]
+        >>> G.jacobian([0, 1])
+        [array([1.]), array([[0., 1.]])]
+        >>> G.traces, G.compiles, G.runs
+        (2, 1, 1)
+        '''
+        tape = self.tape
+        if tape is not None and not tape.values_read and len(x) == len(tape.inputs):
+            n, m = len(self.outputs), len(tape.inputs)
+            if H == True and n != 1:
+                raise ValueError ("F needs to be a function from R^n to R!")
+            function = self.function(H)
+            try:
+                result = function([float(xi) for xi in x])
+            except (ArithmeticError, ValueError):
+                result = None
+            if result is not None:
+                self.runs += 1
+                #adding 0.0 turns the -0.0 of sums taken in another order into 0.0
+                F1 = np.array(result[0], dtype = float)
+                J_F = np.zeros((n, m))
+                J_F[function.jacobian_index] = result[1]
+                J_F += 0.0
+                if H != True:
+                    return [F1, J_F]
+                H_F = np.zeros((m, m))
+                H_F[function.hessian_index] = result[2]
+                return [F1, J_F, (H_F + H_F.T) / 2 + 0.0]
+        self._trace(x)
+        return self._derivatives(H)
+
+
+_compiled = weakref.WeakKeyDictionary()
+
+def compiled(F):
+    ''' Returns the CompiledFunction of F, shared by every call with the same
+    function object F for as long as F exists
+
+    NOTES
+    =====
+    Constants read by F are part of the generated code: a function whose
+    parameters change between calls should be passed as a new function object.
+
+    EXAMPLES
+    =========
+    >>> F = lambda x: [x[0] ** 2]
+    >>> compiled(F) is compiled(F)
+    True
+    '''
+    try:
+        return _compiled[F]
+    except KeyError:
+        pass
+    except TypeError:
+        #F cannot be referenced weakly, so it is not cached
+        return CompiledFunction(F)
+    #the cached entry refers to F weakly, so that it does not keep F alive
+    G = _compiled[F] = CompiledFunction(weakref.proxy(F))
+    return G
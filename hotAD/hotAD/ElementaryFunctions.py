@@ -1,8 +1,207 @@
 ##This class is used to define the behavior of elementary functions
+import math
+import numbers
+import operator
+import functools
 import numpy as np
-import warnings
-warnings.simplefilter("error", RuntimeWarning)
-from hotAD.AutoDiffObject import AutoDiff
+from hotAD.AutoDiffObject import AutoDiff, _hess_combine, _hess_outer
+from hotAD.ReverseAD import ReverseAD
+from hotAD.TaylorAD import TaylorAD
+
+def _linear(terms, weights = None):
+    ''' Returns the value, tangent vector and sparse Hessian (None without H) of
+    sum(w * t for w, t in zip(weights, terms)), for AutoDiff objects and numbers t
+    (all weights 1 by default), merging the derivatives of every term into one
+    array and one dict '''
+    value, ads = 0, []
+    for w, t in zip(weights or [None] * len(terms), terms):
+        if isinstance(t, AutoDiff):
+            value = value + (t.val if w is None else w * t.val)
+            ads.append((w, t))
+        elif isinstance(t, (numbers.Real, np.ndarray)):
+            value = value + (t if w is None else w * t)
+        else:
+            print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
+            raise AttributeError
+    if not ads:
+        return value, None, None
+    grad = np.zeros((max(t._grad.shape[0] for w, t in ads),) + np.shape(value))
+    with_hessian = [t.H for w, t in ads]
+    if any(with_hessian) and not all(with_hessian):
+        raise AttributeError("Every AutoDiff term should have Hessian set to True, or none, to carry out the operation.")
+    hess = {} if with_hessian[0] else None
+    for w, t in ads:
+        tangent = t._grad if t._grad.ndim == grad.ndim else t._grad[:, None]
+        if w is None:
+            grad[:tangent.shape[0]] += tangent
+        else:
+            grad[:tangent.shape[0]] += w * tangent
+        if hess is not None:
+            for key, entry in t._hess.items():
+                hess[key] = hess.get(key, 0.0) + (entry if w is None else w * entry)
+    return value, grad, hess
+
+def _result(value, grad, hess):
+    if grad is None:
+        return value
+    return AutoDiff._new(value, grad, hess)
+
+#Kinds of arguments the elementary functions dispatch on, by exact type. Other
+#types are classified on first use and added (see _kind).
+_AUTODIFF, _TRACED, _SCALAR, _OTHER = range(4)
+_KINDS = {AutoDiff: _AUTODIFF, ReverseAD: _TRACED, TaylorAD: _TRACED,
+          float: _SCALAR, int: _SCALAR, bool: _SCALAR, np.float64: _SCALAR, np.float32: _SCALAR,
+          np.int64: _SCALAR, np.int32: _SCALAR, np.ndarray: _OTHER}
+
+def _kind(other):
+    ''' Returns the kind of other: an AutoDiff object, a ReverseAD or TaylorAD object
+    (which apply the function themselves), a real scalar, or anything else (arrays,
+    complex numbers and illegal arguments) '''
+    kind = _KINDS.get(type(other))
+    if kind is None:
+        if isinstance(other, AutoDiff):
+            kind = _AUTODIFF
+        elif isinstance(other, (ReverseAD, TaylorAD)):
+            kind = _TRACED
+        elif isinstance(other, numbers.Real):
+            kind = _SCALAR
+        else:
+            kind = _OTHER
+        _KINDS[type(other)] = kind
+    return kind
+
+def _illegal():
+    ##the passed object is not numeric or autodiff
+    print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
+    raise AttributeError
+
+def _any(condition):
+    ''' np.any for a comparison of arrays, without its cost on scalars '''
+    return condition.any() if isinstance(condition, np.ndarray) else condition
+
+def _elementwise(scalar, ufunc):
+    ''' Returns the function applying scalar (from math) to numbers and ufunc (from
+    NumPy) to arrays. Numbers math rejects go through ufunc as well: an overflow
+    gives inf with a RuntimeWarning, while a number out of the domain raises
+    FloatingPointError, so that the error stays local to this call. '''
+    def apply(x):
+        if isinstance(x, np.ndarray):
+            return ufunc(x)
+        try:
+            return scalar(x)
+        except (ValueError, OverflowError):
+            with np.errstate(invalid="raise", divide="raise"):
+                return ufunc(x)
+    return apply
+
+_sin = _elementwise(math.sin, np.sin)
+_cos = _elementwise(math.cos, np.cos)
+_exp = _elementwise(math.exp, np.exp)
+_sqrt = _elementwise(math.sqrt, np.sqrt)
+_arctan = _elementwise(math.atan, np.arctan)
+_arcsin = _elementwise(math.asin, np.arcsin)
+_arccos = _elementwise(math.acos, np.arccos)
+_tangent = _elementwise(math.tan, np.tan)
+_logarithm = _elementwise(math.log, np.log)
+
+def _tan(x):
+    value = _tangent(x)
+    if _any(abs(value) > 10**16):
+        print("Input value should not be pi/2 + 2*pi*k, k integer.")
+        raise ValueError
+    return value
+
+def _log(x):
+    if _any(x <= 0):
+        print("Base value should be positive, because we don't consider imaginary number here.")
+        raise ValueError
+    return _logarithm(x)
+
+def _logit(x):
+    exp_value = _exp(x)
+    return exp_value / (1 + exp_value)
+
+#Values of the elementary functions at numbers and arrays, by method name
+_VALUES = {"sin": _sin, "cos": _cos, "tan": _tan, "log": _log, "exp": _exp, "sqrt": _sqrt,
+           "logit": _logit, "arcsin": _arcsin, "arccos": _arccos, "arctan": _arctan}
+
+#Chain rules of the elementary functions, by method name: each returns the value
+#and the first and second derivatives at a number or an array v
+def _sin_rule(v):
+    sin_value, cos_value = _sin(v), _cos(v)
+    return sin_value, cos_value, -sin_value
+
+def _cos_rule(v):
+    cos_value, sin_value = _cos(v), _sin(v)
+    return cos_value, -sin_value, -cos_value
+
+def _tan_rule(v):
+    tan_value, sec2_value = _tan(v), 1 / _cos(v)**2
+    return tan_value, sec2_value, 2 * sec2_value * tan_value
+
+def _log_rule(v):
+    log_for_der = 1.0 / v
+    return _log(v), log_for_der, -log_for_der**2
+
+def _exp_rule(v):
+    exp_value = _exp(v)
+    return exp_value, exp_value, exp_value
+
+def _non_negative(v):
+    if _any(v < 0):
+        print("Unsupported input. Obect needs to have non-negative values.")
+        raise ValueError
+
+def _sqrt_rule(v):
+    _non_negative(v)
+    sqrt_value = _sqrt(v)
+    sqrt_for_der = 1.0/2 * 1.0/sqrt_value
+    return sqrt_value, sqrt_for_der, -1.0/4 * 1.0/v**(3.0/2)
+
+def _logit_rule(v):
+    _non_negative(v)
+    exp_value = _exp(v)
+    logit_value = exp_value / (1 + exp_value)
+    logit_for_der = exp_value / (1 + exp_value)**2
+    return logit_value, logit_for_der, logit_for_der * (1 - 2 * logit_value)
+
+def _arcsin_rule(v):
+    arcsin_for_der = 1 / _sqrt(1 - v**2)
+    return _arcsin(v), arcsin_for_der, v * arcsin_for_der**3
+
+def _arccos_rule(v):
+    arccos_for_der = -1 / _sqrt(1 - v**2)
+    return _arccos(v), arccos_for_der, v * arccos_for_der**3
+
+def _arctan_rule(v):
+    arctan_for_der = 1 / (1 + v**2)
+    return _arctan(v), arctan_for_der, -2 * v * arctan_for_der**2
+
+_RULES = {"sin": _sin_rule, "cos": _cos_rule, "tan": _tan_rule, "log": _log_rule, "exp": _exp_rule,
+          "sqrt": _sqrt_rule, "logit": _logit_rule, "arcsin": _arcsin_rule, "arccos": _arccos_rule,
+          "arctan": _arctan_rule}
+
+def _unary(name, other):
+    ''' Returns the elementary function name at other. AutoDiff objects go through
+    AutoDiff._chain with the value and derivatives from _RULES, ReverseAD and
+    TaylorAD objects apply it themselves, real scalars go through the math module,
+    and arrays and other numbers through NumPy (taking their real part). Illegal
+    arguments raise AttributeError, as do numbers out of the domain (RuntimeWarning
+    for arcsin and arccos out of [-1, 1]). A new unary function only needs a rule
+    and a value function. '''
+    kind = _kind(other)
+    if kind == _TRACED:
+        return other._apply(name)
+    try:
+        if kind == _AUTODIFF:
+            return other._chain(*_RULES[name](other.val))
+        return _VALUES[name](float(other) if kind == _SCALAR else other.real)
+    except (FloatingPointError, RuntimeWarning):
+        if name in ("arcsin", "arccos"):
+            raise RuntimeWarning("Value must be in [-1, 1].")
+        _illegal()
+    except:
+        _illegal()
 
 class ElementaryFunctions():
 
@@ -11,6 +210,14 @@ class ElementaryFunctions():
     EXAMPLE:
             x = AutoDiff(3, "x")
             new_x = ElementaryFunctions.sin(x)
+
+    NOTES
+    =====
+    Numbers and AutoDiff objects with a number value out of the domain of a
+    function raise AttributeError (RuntimeWarning for arcsin and arccos out of
+    [-1, 1]); an overflow gives inf with a RuntimeWarning. Arrays follow NumPy
+    and give nan. Importing hotAD leaves the warning filters and the NumPy error
+    state of the process as they are.
     '''
 
     @staticmethod
@@ -56,49 +263,11 @@ class ElementaryFunctions():
         True
         >>> np.isclose(t.der2['y'], 4553.132)
         True
-        >>> np.isclose(t.der2['xy'], 3435.756)
+        >>> np.isclose(t.der2[('x', 'y')], 3435.756)
         True
         '''
 
-        try:
-            ##try to find if the passed in other object is autodiff object and do
-            ##proper operation to the passed in object
-            other_val = other.val
-            other_der = {}
-            other_der2 = {}
-            sin_value,cos_value = np.sin(other_val), np.cos(other_val)
-
-            # first derivative
-            for key,derivative in other.der.items():
-                other_der[key] = cos_value * derivative
-
-            # second derivative
-            # loop through all keys in second derivative dictionary
-            if other.H:
-                for key, derivative2 in other.der2.items():
-                    # check if that key is in first derivative dictionary so we are taking second derivative w.r.t. one variable
-                    # i.e., f_xx --> key == x and x in first derivative dictionary
-                    if key in other.der.keys():
-                        other_der2[key] = -1*other.der[key]*sin_value*other.der[key] + cos_value*other.der2[key]
-                    else:
-                        # split the second derivative dictionary key into the two variables
-                        first_var = key[0]
-                        second_var = key[1]
-                        other_der2[key] = -1*other.der[first_var]*other.der[second_var]*sin_value + cos_value*other.der2[key]
-
-                return AutoDiff(sin_value, "dummy", other_der, other_der2,H = True)
-            else:
-                return AutoDiff(sin_value, "dummy", other_der)
-
-        except:
-            try:
-                ##try to check if the passed in other object is numeric value
-                other_value = other.real
-                return np.sin(other_value)
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
+        return _unary("sin", other)
 
     @staticmethod
     def cos(other):
@@ -143,49 +312,11 @@ class ElementaryFunctions():
         True
         >>> np.isclose(t.der2['y'], -0.519641)
         True
-        >>> np.isclose(t.der2['xy'], -3.553718)
+        >>> np.isclose(t.der2[('x', 'y')], -3.553718)
         True
         '''
 
-        try:
-            ##try to find if the passed in other object is autodiff object and do
-            ##proper operation to the passed in object
-            other_val = other.val
-            other_der = {}
-            other_der2 = {}
-            cos_value,sin_value = np.cos(other_val), np.sin(other_val)
-            for key,derivative in other.der.items():
-                other_der[key] = -1 * sin_value * derivative
-
-            # second derivative
-            if other.H:
-
-                # loop through all keys in second derivative dictionary
-                for key, derivative2 in other.der2.items():
-                    # check if that key is in first derivative dictionary so we are taking second derivative w.r.t. one variable
-                    # i.e., f_xx --> key == x and x in first derivative dictionary
-                    if key in other.der.keys():
-                        other_der2[key] = -1*other.der[key]*cos_value*other.der[key] + -1*sin_value*other.der2[key]
-                    else:
-                        # split the second derivative dictionary key into the two variables
-                        first_var = key[0]
-                        second_var = key[1]
-                        other_der2[key] = -other.der[first_var]*other.der[second_var]*cos_value + -1*sin_value*other.der2[key]
-
-                return AutoDiff(cos_value, "dummy", other_der, other_der2, H=True)
-
-            else:
-                return AutoDiff(cos_value, "dummy", other_der)
-
-        except:
-            try:
-                ##try to check if the passed in other object is numeric value
-                other_value = other.real
-                return np.cos(other_value)
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
+        return _unary("cos", other)
 
     @staticmethod
     def tan(other):
@@ -230,61 +361,11 @@ class ElementaryFunctions():
         True
         >>> np.isclose(t.der2['y'], 2983.861)
         True
-        >>> np.isclose(t.der2['xy'], 6848.102)
+        >>> np.isclose(t.der2[('x', 'y')], 6848.102)
         True
         '''
 
-        try:
-            if abs(np.tan(other.val)) > 10**16:
-                print ("Input value should not be pi/2 + 2*pi*k, k integer.")
-                raise ValueError
-            ##try to find if the passed in other object is autodiff object and do
-            ##proper operation to the passed in object
-            other_val= other.val
-            other_der = {}
-            other_der2 = {}
-            tan_value, sec2_value = np.tan(other_val), 1/(np.cos(other_val)**2)
-            if abs(tan_value) > 10**16:
-                print("Input value should not be pi/2 + 2*pi*k, k interger.")
-                raise ValueError
-
-            # first derivative
-            for key,derivative in other.der.items():
-                other_der[key] = sec2_value * derivative
-
-            # second derivative
-            # loop through all keys in second derivative dictionary
-            if other.H:
-                for key, derivative2 in other.der2.items():
-                    # check if that key is in first derivative dictionary so we are taking second derivative w.r.t. one variable
-                    # i.e., f_xx --> key == x and x in first derivative dictionary
-                    if key in other.der.keys():
-                        other_der2[key] = 2*other.der[key]*other.der[key]*sec2_value*tan_value + sec2_value*other.der2[key]
-                    else:
-                        # split the second derivative dictionary key into the two variables
-                        first_var = key[0]
-                        second_var = key[1]
-                        other_der2[key] = 2*other.der[first_var]*other.der[second_var]*sec2_value*tan_value + sec2_value*other.der2[key]
-
-                return AutoDiff(tan_value, "dummy", other_der, other_der2,H=True)
-            else:
-                return AutoDiff(tan_value, "dummy", other_der)
-
-        except:
-            try:
-                if abs(np.tan(other.real)) > 10**16:
-                    print ("input value should not be a pi/2 + 2*pi*k, k integer.")
-                    raise ValueError
-                ##try to check if the passed in other object is numeric value
-                other_value = other.real
-                if abs(np.tan(other_value)) > 10**16:
-                    print("Input value should not be pi/2 + 2*pi*k, k interger.")
-                    raise ValueError
-                return np.tan(other_value)
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
+        return _unary("tan", other)
 
     @staticmethod
     def power(base,power):
@@ -325,166 +406,34 @@ class ElementaryFunctions():
         True
         >>> np.isclose(t.der2['b'], 3.843624111345611)
         True
-        >>> np.isclose(t.der2['ab'], 12.317766166719343)
+        >>> np.isclose(t.der2[('a', 'b')], 12.317766166719343)
         True
         '''
 
-        try:
-            ##try to find if the passed in base and power object is autodiff object and do
-            ##proper operation to the passed in object
-            base_val = base.val
-            other_der = {}
-            other_der2 = {}
-            try:
-                ##When both the base and the power are autodiff objects
-                power_val = power.val
-                if type(np.power(base.val, power.val)) == complex:
-                    raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
-
-                base_value = np.power(base.val, power.val)
-                base_der = set(base.der)
-                power_der = set(power.der)
-
-                if base.val <= 0:
-                    raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
-
-                if base.H and power.H:
-                    for key in base_der.union(power_der):
-                        for key2 in base_der.union(power_der):
-                            ## If the element exists in both base derivative and power derivatives
-                            if key in base_der and key in power_der:
-                                other_der[key] = np.power(base.val,power.val) * (power.val * 1/base.val * base.der[key] + np.log(base.val) * power.der[key])
-                                if key2+key in other_der2.keys():
-                                    other_der2[key+key2] = other_der2[key2+key]
-                                else:
-                                    if key == key2:
-                                        other_der2[key] = np.power(base.val,power.val) * (power.der[key] * np.log(base.val) + power.val/base.val * base.der[key])**2 + np.power(base.val,power.val) * (power.der2[key] * np.log(base.val) + 2 * power.der[key] * 1/base.val * base.der[key] - power.val * 1/(base.val**2) * base.der[key]**2 + power.val/base.val * base.der2[key])
-                                    else:
-                                        if key2 in base_der and key2 in power_der:
-                                            other_der2[key+key2] = np.power(base.val,power.val) * (power.der[key2]*np.log(base.val) + power.val/base.val*base.der[key2]) * (power.der[key]*np.log(base.val) + power.val/base.val * base.der[key]) + np.power(base.val,power.val) * (power.der2[key+key2]*np.log(base.val) + 1/base.val * power.der[key] * base.der[key2] + power.der[key2] * 1/base.val * base.der[key] - power.val/(base.val**2)*base.der[key2]*base.der[key] + power.val/base.val * base.der2[key+key2])
-                                        elif key2 in base_der:
-                                            other_der2[key+key2] = np.power(base.val,power.val) * power.val/base.val * base.der[key2] * (power.der[key]*np.log(base.val) + power.val/base.val * base.der[key]) + np.power(base.val,power.val) * (1/base.val * power.der[key] * base.der[key2] + power.val/(base.val**2) * base.der[key2] * base.der[key] + power.val/base.val * base.der[key+key2])
-                                        else:
-                                            other_der[key+key2] = np.power(base.val,power.val) * power.der[key2] * np.log(base.val) * (power.der[key]*np.log(base.val) + power.val/base.val * base.der[key]) + np.power(base.val,power.val) * (power.der2[key+key2]*np.log(base.val) + power.der[key2]*1/base.val*base.der[key])
-                            elif key in base_der:
-                                other_der[key] = power.val * np.power(base.val,power.val) * base.der[key] * 1/base.val
-                                if key2+key in other_der2.keys():
-                                    other_der2[key+key2] = other_der2[key2+key]
-                                else:
-                                    if key == key2:
-                                        other_der2[key] = np.power(base.val, power.val) * (power.val/base.val * base.der[key])**2 + np.power(base.val, power.val) * (-power.val * 1/(base.val**2) * base.der[key]**2 + power.val/base.val*base.der2[key])
-                                    else:
-                                        if key2 in base_der and key2 in power_der:
-                                            other_der2[key+key2] = np.power(base.val, power.val) * power.val/base.val * base.der[key] * (power.der[key2]*np.log(base.val) + power.val/base.val * base.der[key2]) + np.power(base.val, power.val) * (power.der[key2] * 1/base.val * base.der[key] + power.val/(base.val**2) * base.der[key] + power.val/base.val * base.der[key+key2])
-                                        elif key2 in base_der:
-                                            other_der2[key+key2] = np.power(base.val, power.val) * power.val**2 / base.val**2 * base.der[key] * base.der[key2] + np.power(base.val, power.val) * ((power.val/base.val**2) * base.der[key] * base.der[key2] + power.val/base.val * base.der2[key+key2])
-                                        else:
-                                            other_der2[key+key2] = np.power(base.val, power.val) * power.der[key2] * np.log(base.val) * (power.val/base.val * base.der[key]) + np.power(base.val, power.val) * power.der[key2] * 1/base.val * base.der[key]
-                            else:
-                                #other_der[key] = power.der[key] * np.log(base.val) * base_value
-                                other_der[key] = np.power(base.val,power.val) * power.der[key] * np.log(base.val)
-                                if key2+key in other_der2.keys():
-                                    other_der2[key+key2] = other_der2[key2+key]
-                                else:
-                                    if key == key2:
-                                        other_der2[key] = np.power(base.val, power.val) * (power.der[key]*np.log(base.val))**2 + np.power(base.val, power.val) * (power.der2[key]*np.log(base.val))
-                                    else:
-                                        if key2 in base_der and key2 in power_der:
-                                            other_der2[key+key2] = np.power(base.val,power.val) * (power.der[key2]*np.log(base.val) + power.val/base.val * base.der[key2]) * power.der[key] * np.log(base.val) + np.power(base.val,power.val) * (power.der2[key+key2]*np.log(base.val) + 1/base.val * power.der[key] * base.der[key2])
-                                        elif key2 in base_der:
-                                            other_der2[key+key2] = np.power(base.val,power.val) * power.val/base.val * base.der[key2] * power.der[key] * np.log(base.val) + np.power(base.val,power.val) * (1/base.val * power.der[key] * base.der[key2])
-                                        else:
-                                            other_der2[key+key2] = np.power(base.val,power.val) * (power.der[key2] * np.log(base.val) + power.val/base.val * base.der[key2])
-
-                    return AutoDiff(base_value, "dummy", other_der, other_der2, H = True)
-                elif base.H or power.H:
-                    print("Both base and power should have Hessian set to True to carry out the operation")
-                else:
-                    for key in base_der.union(power_der):
-                        for key2 in base_der.union(power_der):
-                            if key in base_der and key in power_der:
-                                other_der[key] = np.power(base.val,power.val) * (power.val * 1/base.val * base.der[key] + np.log(base.val) * power.der[key])
-                            elif key in base_der:
-                                other_der[key] = power.val * np.power(base.val,power.val) * base.der[key] * 1/base.val
-                            else:
-                                #other_der[key] = power.der[key] * np.log(base.val) * base_value
-                                other_der[key] = np.power(base.val,power.val) * power.der[key] * np.log(base.val)
-                    return AutoDiff(base_value, "dummy", other_der)
-
-            except ValueError as err:
-                print(err.args)
-            except:
-                ##when base is autodiff object and power is not
-                try:
-                    power_val = power.real
-                    if type(np.power(base.val, power.real)) == complex:
-                        raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
-
-                    base_value = np.power(base_val, power)
-                    base_der = power * np.power(base_val, power-1)
-                    for key,derivative in base.der.items():
-                        other_der[key] = base_der * derivative
-
-                    if base.H:
-                        for key,derivative2 in base.der2.items():
-                            if key in base.der.keys():
-                                other_der2[key] = power * (power-1) * np.power(base.val,power-2) * base.der[key]**2 + power * np.power(base.val,power-1) * base.der2[key]
-                            else:
-                                key1 = key[0]
-                                key2 = key[1]
-                                other_der2[key] = power * (power-1) * np.power(base.val,power-2) * base.der[key1] * base.der[key2] + power * np.power(base.val,power-1) * base.der2[key]
-
-                        return AutoDiff(base_value, "dummy", other_der, other_der2, H = True)
-                    else:
-                        return AutoDiff(base_value, "dummy", other_der)
-                except ValueError as err:
-                    print(err.args)
-                except:
-                    print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                    raise AttributeError
+        if isinstance(base, (ReverseAD, TaylorAD)) or isinstance(power, (ReverseAD, TaylorAD)):
+            return base ** power
 
+        if isinstance(base, AutoDiff) and (isinstance(power, AutoDiff) or isinstance(power, numbers.Real)):
+            if isinstance(power, AutoDiff) and base.H != power.H:
+                print("Both base and power should have Hessian set to True to carry out the operation")
+                return None
+            return base ** power
+        if isinstance(power, AutoDiff) and isinstance(base, numbers.Real):
+            return base ** power
+
+        try:
+            ##both numeric
+            base.real, power.real
         except:
-            try:
-                base_value = base.real
-                try:
-                    #base numeric, power autodiff
-                    power_val = power.val
-                    if type(np.power(base.real, power.val)) == complex:
-                        print ("Base value should be positive, because we don't consider imaginary number here.")
-                        raise ValueError
-
-                    other_der = {}
-                    other_der2 = {}
-                    ##try to check if the passed in other object is numeric value
-                    for key,derivative in power.der.items():
-                        other_der[key] = power.der[key] * np.log(base) * np.power(base,power.val)
-                    if power.H:
-                        for key, derivative2 in power.der2.items():
-                            if key in power.der.keys():
-                                other_der2[key] = (power.der[key] * np.log(base))**2 * np.power(base,power.val)
-                            else:
-                                key1 = key[0]
-                                key2 = key[1]
-                                other_der2[key] = power.der2[key] * np.log(base) * np.power(base,power.val) + power.der[key1] * power.der[key2] * np.log(base)**2 * np.power(base,power.val)
-                        return AutoDiff(np.power(base,power.val), "dummy", other_der, other_der2, H = True)
-                    else:
-                        return AutoDiff(np.power(base,power.val), "dummy", other_der)
-                except:
-                    try:
-                        power_val = power.real
-                        if type(np.power(base, power)) == complex:
-                            raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
-                        return np.power(base,power)
-                    except ValueError as err:
-                        print(err.args)
-                    except:
-                        print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                        raise AttributeError
-
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
+            ##catch error if passed object is not numeric or autodiff
+            print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
+            raise AttributeError
+        try:
+            if type(np.power(base, power)) == complex:
+                raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
+            return np.power(base,power)
+        except ValueError as err:
+            print(err.args)
 
     @staticmethod
     def log(other):
@@ -520,58 +469,11 @@ class ElementaryFunctions():
         True
         >>> np.isclose(t.der2['b'], -0.1111111111111111)
         True
-        >>> np.isclose(t.der2['ab'], 0)
+        >>> np.isclose(t.der2[('a', 'b')], 0)
         True
         '''
 
-        try:
-            ##try to find if the passed in other object is autodiff object and do
-            ##proper operation to the passed in object
-            other_val = other.val
-
-            if other_val <= 0:
-                    print ("Base value should be positive, because we don't consider imaginary number here.")
-                    raise ValueError
-
-            other_der = {}
-            other_der2 = {}
-            log_value, log_for_der = np.log(other_val), 1/float(other_val)
-
-            ##First derivatives for log function
-            for key,derivative in other.der.items():
-                other_der[key] = log_for_der * derivative
-
-            ##Second Derivatives for log functions
-            if other.H:
-                for key, derivative2 in other.der2.items():
-                    # check if that key is in first derivative dictionary so we are taking second derivative w.r.t. one variable
-                    # i.e., f_xx --> key == x and x in first derivative dictionary
-                    if key in other.der.keys():
-                        other_der2[key] = -1.0/other.val**2 * other.der[key] * other.der[key] + 1.0/other_val * other.der2[key]
-                    else:
-                        # split the second derivative dictionary key into the two variables
-                        first_var = key[0]
-                        second_var = key[1]
-                        other_der2[key] = -1.0/other.val**2 * other.der[first_var] * other.der[second_var] + 1.0/other_val * other.der2[key]
-
-                return AutoDiff(log_value, "dummy", other_der,other_der2,H=True)
-            else:
-                return AutoDiff(log_value, "dummy", other_der)
-
-        except:
-            try:
-                ##try to check if the passed in other object is numeric value
-                other_value = other.real
-
-                if other_value <= 0:
-                    print ("Base value should be positive, because we don't consider imaginary number here.")
-                    raise ValueError
-
-                return np.log(other_value)
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
+        return _unary("log", other)
 
     @staticmethod
     def exp(other):
@@ -607,42 +509,11 @@ class ElementaryFunctions():
         True
         >>> np.isclose(t.der2['y'], 1613.71517397)
         True
-        >>> np.isclose(t.der2['xy'], 2824.00155445)
+        >>> np.isclose(t.der2[('x', 'y')], 2824.00155445)
         True
         '''
 
-        try:
-            other_val = other.val
-            other_der = {}
-            other_der2 = {}
-            exp_value, exp_for_der = np.exp(other_val), np.exp(other_val)
-            ##First derivatives for log function
-            for key,derivative in other.der.items():
-                other_der[key] = exp_for_der * derivative
-
-            ##Second Derivatives for log functions
-            if other.H:
-                for key,derivative2 in other.der2.items():
-                    if key in other.der.keys():
-                        other_der2[key] = exp_for_der * other.der[key] * other.der[key] + exp_for_der * other.der2[key]
-                    else:
-                        # split the second derivative dictionary key into the two variables
-                        first_var = key[0]
-                        second_var = key[1]
-                        other_der2[key] = exp_for_der * other.der[first_var] * other.der[second_var] + exp_for_der * other.der2[key]
-
-                return AutoDiff(exp_value, "dummy", other_der, other_der2,H=True)
-            else:
-                return AutoDiff(exp_value, "dummy", other_der)
-        except:
-            try:
-                ##try to check if the passed in other object is numeric value
-                other_value = other.real
-                return np.exp(other_value)
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
+        return _unary("exp", other)
 
     @staticmethod
     def sqrt(other):
@@ -677,52 +548,11 @@ class ElementaryFunctions():
         True
         >>> np.isclose(t.der2['y'], -0.06804138174397717)
         True
-        >>> np.isclose(t.der2['xy'], 0.10206207261596578)
+        >>> np.isclose(t.der2[('x', 'y')], 0.10206207261596578)
         True
         '''
-        try:
-            ##try to find if the passed in other object is autodiff object and do
-            ##proper operation to the passed in object
-            other_val = other.val
-            other_der = {}
-            other_der2 = {}
-            sqrt_value = np.sqrt(other.val)
-
-            if other_val < 0 :
-                print("Unsupported input. Obect needs to have non-negative values.")
-                raise ValueError
-
-            # first derivative
-            for key,derivative in other.der.items():
-                other_der[key] = 1.0/2 * 1.0/np.sqrt(other.val) * other.der[key]
-
-            # second derivative
-            # loop through all keys in second derivative dictionary
-            if other.H:
-                for key, derivative2 in other.der2.items():
-                    # check if that key is in first derivative dictionary so we are taking second derivative w.r.t. one variable
-                    # i.e., f_xx --> key == x and x in first derivative dictionary
-                    if key in other.der.keys():
-                        other_der2[key] = -1.0/4 * 1.0/other.val**(3.0/2) * other.der[key]**2 + 1.0/2 * 1.0/np.sqrt(other.val) * other.der2[key]
-                    else:
-                        # split the second derivative dictionary key into the two variables
-                        key1 = key[0]
-                        key2 = key[1]
-                        other_der2[key] = -1.0/4 * 1.0/other.val**(3.0/2) * other.der[key1] * other.der[key2] + 1.0/2 * 1.0/np.sqrt(other.val) * other.der2[key]
-
-                return AutoDiff(sqrt_value, "dummy", other_der, other_der2, H=True)
-            else:
-                return AutoDiff(sqrt_value, "dummy", other_der)
 
-        except:
-            try:
-                ##try to check if the passed in other object is numeric value
-                other_value = other.real
-                return np.sqrt(other_value)
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
+        return _unary("sqrt", other)
 
     @staticmethod
     def logit(other):
@@ -754,51 +584,8 @@ class ElementaryFunctions():
         >>> np.isclose(t.der2['x'], -0.022088806158422743)
         True
         '''
-        try:
-            ##try to find if the passed in other object is autodiff object and do
-            ##proper operation to the passed in object
-            other_val = other.val
-            other_der = {}
-            other_der2 = {}
-            logit_value = np.exp(other_val) / (1 + np.exp(other_val))
-
-            if other_val < 0 :
-                print("Unsupported input. Obect needs to have non-negative values.")
-                raise ValueError
-
-            # first derivative
-            for key,derivative in other.der.items():
-                other_der[key] = np.exp(other.val) * other.der[key] / (1 + np.exp(other.val))**2
-
-            # second derivative
-            # loop through all keys in second derivative dictionary
-            if other.H:
-                for key, derivative2 in other.der2.items():
-                    # check if that key is in first derivative dictionary so we are taking second derivative w.r.t. one variable
-                    # i.e., f_xx --> key == x and x in first derivative dictionary
-                    if key in other.der.keys():
-                        other_der2[key] = (np.exp(other.val)*other.der[key]**2 + np.exp(other.val)*other.der2[key])/(1+np.exp(other.val))**2 - 2 * np.exp(other.val)**2 * other.der[key]**2 / (1 + np.exp(other.val))**3
-                        # other_der2[key] = (np.exp(other.val) * other.der[key] + np.exp(other.val)*other.der2[key] + np.exp(other.val)**2 * other.der[key] + np.exp(other.val)**2 *other.der2[key] - np.exp(other.val)**2 * other.der[key]**2) / (1 + np.exp(other.val))**3
-                    else:
-                        # split the second derivative dictionary key into the two variables
-                        key1 = key[0]
-                        key2 = key[1]
-                        other_der2[key] = (np.exp(other.val)*other.der[key1]*other.der[key2] + np.exp(other.val)*other.der2[key1+key2])/(1+np.exp(other.val))**2 - 2 * np.exp(other.val)**2 * other.der[key1]* other.der[key2] / (1 + np.exp(other.val))**3
-
-                return AutoDiff(logit_value, "dummy", other_der, other_der2, H=True)
-            else:
-                return AutoDiff(logit_value, "dummy", other_der)
-
-        except:
-            try:
-                ##try to check if the passed in other object is numeric value
-                other_value = other.real
-                return np.exp(other_value) / (1 + np.exp(other_value))
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
 
+        return _unary("logit", other)
 
     @staticmethod
     def arcsin(other):
@@ -835,57 +622,11 @@ class ElementaryFunctions():
         True
         >>> np.isclose(f.der2['b'], 0.3212803)
         True
-        >>> np.isclose(f.der2['ab'], 0.8019208)
+        >>> np.isclose(f.der2[('a', 'b')], 0.8019208)
         True
         '''
 
-        try:
-
-            ##try to find if the passed in other object is autodiff object and do
-            ##proper operation to the passed in object
-            other_val = other.val
-            other_der = {}
-            other_der2 = {}
-            arcsin_value = np.arcsin(other_val)
-
-            # first derivative
-            for key,derivative in other.der.items():
-                other_der[key] = derivative / np.sqrt(1 - other_val**2)
-
-            # second derivative
-            # loop through all keys in second derivative dictionary
-            if other.H:
-                for key, derivative2 in other.der2.items():
-                    # check if that key is in first derivative dictionary so we are taking second derivative w.r.t. one variable
-                    # i.e., f_xx --> key == x and x in first derivative dictionary
-                    if key in other.der.keys():
-                        other_der2[key] = (other.der2[key]/np.sqrt(1-other_val**2)) + (other.der[key]*other.der[key]*other_val/((1-other_val**2)**(3/2)))
-                    else:
-                        # split the second derivative dictionary key into the two variables
-                        first_var = key[0]
-                        second_var = key[1]
-                        other_der2[key] = (other.der2[key]*np.sqrt(1-other_val**2) + (other.der[first_var]*other.der[second_var]*other_val/np.sqrt(1-other_val**2)))/(1-other_val**2)
-
-                return AutoDiff(arcsin_value, "dummy", other_der, other_der2, H=True)
-            else:
-                return AutoDiff(arcsin_value, "dummy", other_der)
-
-        except RuntimeWarning:
-            raise RuntimeWarning("Value must be in [-1, 1].")
-
-        except:
-            try:
-                ##try to check if the passed in other object is numeric value
-                other_value = other.real
-                return np.arcsin(other_value)
-
-            except RuntimeWarning:
-                raise RuntimeWarning("Value must be in [-1, 1].")
-
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
+        return _unary("arcsin", other)
 
     @staticmethod
     def arccos(other):
@@ -922,55 +663,11 @@ class ElementaryFunctions():
         True
         >>> np.isclose(f.der2['b'], -0.02000205)
         True
-        >>> np.isclose(f.der2['ab'], -0.3200197)
+        >>> np.isclose(f.der2[('a', 'b')], -0.3200197)
         True
         '''
 
-        try:
-
-            ##try to find if the passed in other object is autodiff object and do
-            ##proper operation to the passed in object
-            other_val = other.val
-            other_der = {}
-            other_der2 = {}
-            arccos_value = np.arccos(other_val)
-
-            # first derivative
-            for key,derivative in other.der.items():
-                other_der[key] = (-1*derivative) / np.sqrt(1 - other_val**2)
-
-            # second derivative
-            # loop through all keys in second derivative dictionary
-            if other.H:
-                for key, derivative2 in other.der2.items():
-                    # check if that key is in first derivative dictionary so we are taking second derivative w.r.t. one variable
-                    # i.e., f_xx --> key == x and x in first derivative dictionary
-                    if key in other.der.keys():
-                        other_der2[key] = (-1*other.der2[key]/np.sqrt(1-other_val**2)) - (other.der[key]*other.der[key]*other_val/((1-other_val**2)**(3/2)))
-                    else:
-                        # split the second derivative dictionary key into the two variables
-                        first_var = key[0]
-                        second_var = key[1]
-                        other_der2[key] = (-1*other.der2[key]*np.sqrt(1-other_val**2) - (other.der[first_var]*other.der[second_var]*other_val/np.sqrt(1-other_val**2)))/(1-other_val**2)
-
-                return AutoDiff(arccos_value, "dummy", other_der, other_der2, H=True)
-            else:
-                return AutoDiff(arccos_value, "dummy", other_der)
-
-        except RuntimeWarning:
-            raise RuntimeWarning("Value must be in [-1, 1].")
-
-        except:
-            try:
-                ##try to check if the passed in other object is numeric value
-                other_value = other.real
-                return np.arccos(other_value)
-            except RuntimeWarning:
-                raise RuntimeWarning("Value must be in [-1, 1].")
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
+        return _unary("arccos", other)
 
     @staticmethod
     def arctan(other):
@@ -1006,46 +703,123 @@ class ElementaryFunctions():
         True
         >>> np.isclose(f.der2['b'], 0.1790562)
         True
-        >>> np.isclose(f.der2['ab'], 0.7177349)
+        >>> np.isclose(f.der2[('a', 'b')], 0.7177349)
         True
         '''
 
-        try:
-            ##try to find if the passed in other object is autodiff object and do
-            ##proper operation to the passed in object
-            other_val = other.val
-            other_der = {}
-            other_der2 = {}
-            arctan_value = np.arctan(other_val)
-
-            # first derivative
-            for key,derivative in other.der.items():
-                other_der[key] = other.der[key] / (1 + other_val**2)
-
-            # second derivative
-            # loop through all keys in second derivative dictionary
-            if other.H:
-                for key, derivative2 in other.der2.items():
-                    # check if that key is in first derivative dictionary so we are taking second derivative w.r.t. one variable
-                    # i.e., f_xx --> key == x and x in first derivative dictionary
-                    if key in other.der.keys():
-                        other_der2[key] = (other.der2[key]/(1+other_val**2)) - (2*other.der[key]*other.der[key]*other_val)/((1+other_val**2)**2)
-                    else:
-                        # split the second derivative dictionary key into the two variables
-                        first_var = key[0]
-                        second_var = key[1]
-                        other_der2[key] = (other.der2[key]/(1+other_val**2)) - (2*other.der[first_var]*other.der[second_var]*other_val)/((1+other_val**2)**2)
-
-                return AutoDiff(arctan_value, "dummy", other_der, other_der2, H=True)
-            else:
-                return AutoDiff(arctan_value, "dummy", other_der)
+        return _unary("arctan", other)
 
-        except:
-            try:
-                ##try to check if the passed in other object is numeric value
-                other_value = other.real
-                return np.arctan(other_value)
-            except:
-                ##catch error if passed object is not numeric or autodiff
-                print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
-                raise AttributeError
+    @staticmethod
+    def sum(terms):
+
+        ''' Returns the sum of a list of AutoDiff objects and numbers, with the
+        derivatives of all the terms merged in a single pass (rather than
+        pairwise, as with +)
+
+        RETURNS
+        ========
+        A new instance of AutoDiff object, or a numeric value when no term is one
+
+        NOTES
+        =====
+        PRE:
+             - a list whose items are AutoDiff objects or floats
+        POST:
+             - Return a new Autodiff class instance or a numeric value
+
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(2, 'x', H=True)
+        >>> y = AutoDiff(3, 'y', H=True)
+        >>> t = ElementaryFunctions.sum([x*y, x*x, 1])
+        >>> print(t.val, t.der['x'], t.der['y'], t.der2['x'], t.der2[('x', 'y')])
+        11 7.0 2.0 2.0 1.0
+        '''
+
+        terms = list(terms)
+        if any(isinstance(t, (ReverseAD, TaylorAD)) for t in terms):
+            return sum(terms)
+        return _result(*_linear(terms))
+
+    @staticmethod
+    def dot(terms, weights):
+
+        ''' Returns the weighted sum of a list of AutoDiff objects and numbers,
+        sum(w * t for w, t in zip(weights, terms)), in a single pass (see sum)
+
+        RETURNS
+        ========
+        A new instance of AutoDiff object, or a numeric value when no term is one
+
+        NOTES
+        =====
+        PRE:
+             - a list whose items are AutoDiff objects or floats
+             - a list of as many numeric weights
+        POST:
+             - Return a new Autodiff class instance or a numeric value
+
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(2, 'x', H=True)
+        >>> y = AutoDiff(3, 'y', H=True)
+        >>> t = ElementaryFunctions.dot([x*y, x*x], [0.5, -1])
+        >>> print(t.val, t.der['x'], t.der['y'], t.der2['x'], t.der2[('x', 'y')])
+        -1.0 -2.5 1.0 -2.0 0.5
+        '''
+
+        terms, weights = list(terms), list(weights)
+        if len(terms) != len(weights):
+            raise ValueError("Please enter as many weights as terms.")
+        if any(isinstance(t, (ReverseAD, TaylorAD)) for t in terms):
+            return sum(w * t for w, t in zip(weights, terms))
+        return _result(*_linear(terms, weights))
+
+    @staticmethod
+    def prod(terms):
+
+        ''' Returns the product of a list of AutoDiff objects and numbers. With
+        P the product and v_i, g_i, H_i the value, gradient and Hessian of the
+        i-th factor, the derivatives are formed in a single pass as
+        P u and P (u u^T + sum_i H_i / v_i - sum_i g_i g_i^T / v_i^2), u = sum_i g_i / v_i
+        (pairwise products are used instead when a factor is 0)
+
+        RETURNS
+        ========
+        A new instance of AutoDiff object, or a numeric value when no term is one
+
+        NOTES
+        =====
+        PRE:
+             - a list whose items are AutoDiff objects or floats
+        POST:
+             - Return a new Autodiff class instance or a numeric value
+
+        EXAMPLES
+        =========
+        >>> x = AutoDiff(2, 'x', H=True)
+        >>> y = AutoDiff(3, 'y', H=True)
+        >>> t = ElementaryFunctions.prod([x, y, x, 2])
+        >>> print(t.val, t.der['x'], t.der['y'], t.der2['x'], t.der2[('x', 'y')])
+        24 24.0 8.0 12.0 8.0
+        '''
+
+        terms = list(terms)
+        if not all(isinstance(t, (AutoDiff, ReverseAD, TaylorAD, numbers.Real, np.ndarray)) for t in terms):
+            print("Illegal argument. Needs to be either AutoDiff object or numeric value.")
+            raise AttributeError
+        factors = [t for t in terms if isinstance(t, AutoDiff)]
+        if len(factors) < 2 or any(isinstance(t, (ReverseAD, TaylorAD)) for t in terms):
+            return functools.reduce(operator.mul, terms, 1)
+
+        value = functools.reduce(operator.mul, [getattr(t, "val", t) for t in terms], 1)
+        if np.any(value == 0):
+            return functools.reduce(operator.mul, terms, 1)
+        #P u = sum_i (P / v_i) g_i, and sum_i (P / v_i) H_i with it
+        others = [value / t.val for t in factors]
+        _, grad, hess = _linear(factors, others)
+        if hess is None:
+            return AutoDiff._new(value, grad)
+        hess = _hess_combine((1, _hess_outer(grad, scale = 1 / value)), (1, hess),
+                             *((1, _hess_outer(t._grad, scale = -w / t.val)) for w, t in zip(others, factors)))
+        return AutoDiff._new(value, grad, hess)
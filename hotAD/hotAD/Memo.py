@@ -0,0 +1,145 @@
+##This module memoizes evaluations of user defined functions and their derivatives
+import weakref
+from collections import OrderedDict
+import numpy as np
+from hotAD.Sparsity import CSRMatrix
+
+#Default number of results kept per function
+MAXSIZE = 128
+
+def _copy(value):
+    ''' Returns a copy of a result (a list of arrays and CSRMatrix), so that the
+    caller and the cache never share mutable arrays '''
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, CSRMatrix):
+        return CSRMatrix(value.data.copy(), value.indices, value.indptr, value.shape)
+    return value
+
+
+class EvaluationCache():
+
+    ''' Results of one function F at points x, keyed on the exact bytes of x (as
+    float64) and on the derivative order, with least recently used eviction once
+    more than maxsize results are kept. The length of F(x) is remembered per
+    length of x, so that it is known without evaluating F again.
+
+    INSTANCE VARIABLES
+    =======
+    - maxsize: the largest number of results kept (0 keeps none), see resize
+    - hits, misses: number of lookups served from the cache and not
+    - outputs: the length of F(x) by length of x
+
+    EXAMPLES
+    =========
+    >>> cache = EvaluationCache(maxsize = 2)
+    >>> key = cache.key([1, 2], 1)
+    >>> cache.get(key) is None
+    True
+    >>> cache.put(key, [np.array([3.0])])
+    >>> cache.get(key)
+    [array([3.])]
+    >>> cache.hits, cache.misses, len(cache)
+    (1, 1, 1)
+    '''
+
+    def __init__(self, maxsize = MAXSIZE):
+        if maxsize < 0:
+            raise ValueError("maxsize needs to be a non-negative integer!")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.outputs = {}
+        self._results = OrderedDict()
+
+    def __len__(self):
+        return len(self._results)
+
+    def key(self, x, order, *options):
+        ''' Returns the key of x at the given derivative order and options, or None
+        when x is not a list of real numbers (such points are not cached) '''
+        try:
+            point = np.asarray(x, dtype = float)
+        except (TypeError, ValueError):
+            return None
+        if point.ndim != 1:
+            return None
+        return (point.tobytes(), order) + options
+
+    def get(self, key):
+        ''' Returns a copy of the result stored under key and marks it as most
+        recently used, or None '''
+        if key is None:
+            return None
+        try:
+            value = self._results[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._results.move_to_end(key)
+        self.hits += 1
+        return _copy(value)
+
+    def put(self, key, value):
+        ''' Stores a copy of value under key, evicting the least recently used
+        results beyond maxsize '''
+        if key is None or self.maxsize == 0:
+            return
+        self._results[key] = _copy(value)
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last = False)
+
+    def resize(self, maxsize):
+        ''' Sets maxsize, evicting the least recently used results beyond it '''
+        if maxsize < 0:
+            raise ValueError("maxsize needs to be a non-negative integer!")
+        self.maxsize = maxsize
+        while len(self._results) > maxsize:
+            self._results.popitem(last = False)
+
+    def clear(self):
+        ''' Removes every result and resets the counters '''
+        self._results.clear()
+        self.outputs.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def length(self, F, x):
+        ''' Returns len(F(x)), evaluating F at x only the first time a point of this
+        length is seen '''
+        m = len(x)
+        if m not in self.outputs:
+            self.outputs[m] = len(F(x))
+        return self.outputs[m]
+
+
+_memos = weakref.WeakKeyDictionary()
+
+def memo(F):
+    ''' Returns the EvaluationCache of F, shared by every call with the same
+    function object F for as long as F exists (see CodeGen.compiled)
+
+    NOTES
+    =====
+    ADfun.J_F, Newton and Mini only use this cache with cache = True. Results are
+    reused as long as x is the same: a function whose parameters change between
+    calls should be passed as a new function object, or its cache cleared.
+
+    EXAMPLES
+    =========
+    >>> F = lambda x: [x[0] ** 2]
+    >>> memo(F) is memo(F)
+    True
+    '''
+    try:
+        return _memos[F]
+    except KeyError:
+        pass
+    except TypeError:
+        #F cannot be referenced weakly, so it is not cached
+        return EvaluationCache()
+    cache = _memos[F] = EvaluationCache()
+    return cache
@@ -0,0 +1,65 @@
+##This module plots the iterates of the optimization routines in ADfun. Importing
+##matplotlib takes most of the time of importing hotAD, so ADfun only imports this
+##module when a plot is asked for (see Mini).
+import numpy as np
+import matplotlib.pyplot as plt
+
+def plot_trace(F, trace):
+    ''' Plots the iterates of a minimization of F, from R or R^2 to R, over the
+    graph of F (in 1-d) or its contour lines (in 2-d)
+
+    RETURNS
+    ========
+    None; the figure is left open (see plt.show)
+
+    NOTES
+    =====
+    PRE:
+         - F: a function returning a list of length 1, which accepts arrays of
+           points (in 2-d) for the contour lines
+         - trace: an array with one iterate per row, of 1 or 2 columns
+    POST:
+         - a new matplotlib figure with the start and end points marked
+    '''
+    #a single iterate (no iteration was made) comes as a 1-d array
+    trace = np.atleast_2d(trace)
+    if trace.shape[1] == 2:
+        lx = trace[:, 0]
+        ly = trace[:, 1]
+        xmin = np.amin(lx)
+        xmax = np.amax(lx)
+        deltx = xmax - xmin
+        ymin = np.amin(ly)
+        ymax = np.amax(ly)
+        delty = ymax - ymin
+
+        x = np.linspace(xmin-deltx*0.2, xmax+deltx*0.2, 100)
+        y = np.linspace(ymin-delty*0.2, ymax+delty*0.2, 100)
+
+        plt.figure(figsize = (12, 8))
+        X, Y = np.meshgrid(x, y)
+        Z = F([X, Y])[0]
+        plt.contour(X, Y, Z, 100, cmap='RdGy');
+
+    else:
+        lx = trace.T[0]
+        ly = []
+        for i in range(0, len(lx)):
+            ly.append(F([lx[i]]))
+
+        xmin = np.amin(lx)
+        xmax = np.amax(lx)
+        deltx = xmax - xmin
+
+        x = np.linspace(xmin-deltx*0.2, xmax+deltx*0.2, int(30*1.4*deltx))
+        y = []
+        for i in range(0, len(x)):
+            y.append(F([x[i]]))
+
+        plt.figure(figsize = (12, 8))
+        plt.plot(x, y, 'k--', label = "F(x)")
+
+    plt.plot(lx, ly, 'go-')
+    plt.plot(lx[0], ly[0], marker='*', markersize=15, color="blue", label = "start point")
+    plt.plot(lx[-1], ly[-1], marker='*', markersize=15, color="purple", label = "end point")
+    plt.legend()
@@ -0,0 +1,780 @@
+##This module implements reverse mode (adjoint) automatic differentiation
+import math
+import numbers
+import operator
+from array import array
+import numpy as np
+from hotAD.Sparsity import (CSRMatrix, jacobian_pattern, color_columns, seed_matrix, recover_jacobian,
+                            hessian_pattern, color_star, recover_hessian)
+
+#Operation codes recorded on the tape. The unary codes use the names of the
+#corresponding ElementaryFunctions methods. pow_const has a constant exponent
+#and const_pow a constant base.
+OPCODES = ["input", "const", "add", "sub", "mul", "div", "neg", "pow", "pow_const", "const_pow",
+           "sin", "cos", "tan", "log", "exp", "sqrt", "logit", "arcsin", "arccos", "arctan"]
+OP = {name: code for code, name in enumerate(OPCODES)}
+
+#Local rules: the value of each operation at operand values a (and b) with its
+#first and second partial derivatives, as (value, d0, d1, d00, d01, d11). They
+#are used both to record an operation and to replay a tape at new inputs.
+
+def _add(a, b):
+    return a + b, 1.0, 1.0, 0.0, 0.0, 0.0
+
+def _sub(a, b):
+    return a - b, 1.0, -1.0, 0.0, 0.0, 0.0
+
+def _mul(a, b):
+    return a * b, b, a, 0.0, 1.0, 0.0
+
+def _div(a, b):
+    if b == 0:
+        raise ZeroDivisionError("Denominator cannot have value 0.")
+    q = a / b
+    return q, 1.0 / b, -q / b, 0.0, -1.0 / b**2, 2 * q / b**2
+
+def _neg(a, b):
+    return -a, -1.0, 0.0, 0.0, 0.0, 0.0
+
+def _pow(a, b):
+    if a <= 0:
+        raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
+    p = math.pow(a, b)
+    log_a = math.log(a)
+    return p, b * p / a, p * log_a, b * (b - 1) * p / a**2, p / a * (1 + b * log_a), p * log_a**2
+
+def _pow_const(a, b):
+    p = math.pow(a, b)
+    d0 = 0.0 if b == 0 else b * math.pow(a, b - 1)
+    d00 = 0.0 if b * (b - 1) == 0 else b * (b - 1) * math.pow(a, b - 2)
+    return p, d0, 0.0, d00, 0.0, 0.0
+
+def _const_pow(a, b):
+    if a <= 0:
+        raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
+    p = math.pow(a, b)
+    log_a = math.log(a)
+    return p, 0.0, p * log_a, 0.0, 0.0, p * log_a**2
+
+def _sin(a, b):
+    sin_a, cos_a = math.sin(a), math.cos(a)
+    return sin_a, cos_a, 0.0, -sin_a, 0.0, 0.0
+
+def _cos(a, b):
+    cos_a, sin_a = math.cos(a), math.sin(a)
+    return cos_a, -sin_a, 0.0, -cos_a, 0.0, 0.0
+
+def _tan(a, b):
+    tan_a = math.tan(a)
+    if abs(tan_a) > 10**16:
+        raise ValueError("Input value should not be pi/2 + 2*pi*k, k integer.")
+    sec2_a = 1 / math.cos(a)**2
+    return tan_a, sec2_a, 0.0, 2 * sec2_a * tan_a, 0.0, 0.0
+
+def _log(a, b):
+    if a <= 0:
+        raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
+    return math.log(a), 1.0 / a, 0.0, -1.0 / a**2, 0.0, 0.0
+
+def _exp(a, b):
+    exp_a = math.exp(a)
+    return exp_a, exp_a, 0.0, exp_a, 0.0, 0.0
+
+def _sqrt(a, b):
+    if a < 0:
+        raise ValueError("Unsupported input. Object needs to have non-negative values.")
+    sqrt_a = math.sqrt(a)
+    return sqrt_a, 0.5 / sqrt_a, 0.0, -0.25 / (a * sqrt_a), 0.0, 0.0
+
+def _logit(a, b):
+    if a < 0:
+        raise ValueError("Unsupported input. Object needs to have non-negative values.")
+    s = 1 / (1 + math.exp(-a))
+    return s, s * (1 - s), 0.0, s * (1 - s) * (1 - 2 * s), 0.0, 0.0
+
+def _arcsin(a, b):
+    if abs(a) > 1:
+        raise ValueError("Value must be in [-1, 1].")
+    r = 1 / math.sqrt(1 - a * a)
+    return math.asin(a), r, 0.0, a * r**3, 0.0, 0.0
+
+def _arccos(a, b):
+    if abs(a) > 1:
+        raise ValueError("Value must be in [-1, 1].")
+    r = 1 / math.sqrt(1 - a * a)
+    return math.acos(a), -r, 0.0, -a * r**3, 0.0, 0.0
+
+def _arctan(a, b):
+    r = 1 / (1 + a * a)
+    return math.atan(a), r, 0.0, -2 * a * r**2, 0.0, 0.0
+
+_RULES = [None, None, _add, _sub, _mul, _div, _neg, _pow, _pow_const, _const_pow,
+          _sin, _cos, _tan, _log, _exp, _sqrt, _logit, _arcsin, _arccos, _arctan]
+
+#Operations whose operands may be swapped, for common subexpression elimination
+_COMMUTATIVE = {OP["add"], OP["mul"]}
+
+#Comparisons recorded as guards on the tape
+_COMPARE = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+class Tape():
+
+    ''' Record of the elementary operations of a function evaluation, stored as a
+    struct of arrays: for node i,
+
+        op[i]            operation code (see OPCODES)
+        arg0[i], arg1[i] indices of the operand nodes (-1 when unused)
+        val[i]           value of the node
+        d0[i], d1[i]     partial derivatives of the node w.r.t. its operands
+        d00[i], d01[i], d11[i]
+                         second partial derivatives w.r.t. its operands
+
+    One backward sweep over the tape gives the gradient of any node with respect
+    to every input. A forward tangent sweep followed by a backward sweep of the
+    adjoints and their tangents gives a Hessian-vector product (forward over
+    reverse) without forming the Hessian.
+
+    Identical operations on identical operands, and equal constants, are recorded
+    once (common subexpression elimination by hash-consing): repeating a
+    subexpression returns the existing node, so that its value and derivatives are
+    computed once per evaluation and replay. The number of operations merged this
+    way is kept in deduplicated; cse = False records every operation.
+
+    With simplify = True (the default), operations on constants are folded into
+    constants and algebraic identities (x + 0, x * 1, x * 0, ...) are not recorded
+    (see _simplify); simplified counts them. prune removes the nodes an output does
+    not depend on.
+
+    The tape can be replayed at new input values (see replay). Comparisons of
+    recorded values are kept as guards, so that a replay is refused when the
+    traced function would take another branch.
+
+    EXAMPLE:
+            tape = Tape()
+            x, y = tape.variables([2, 3])
+            f = x * y + ElementaryFunctions.sin(x)
+            tape.gradient(f)        # array([3 + cos(2), 2])
+    '''
+
+    def __init__(self, cse = True, simplify = True):
+        self.op = array('b')
+        self.arg0 = array('l')
+        self.arg1 = array('l')
+        self.val = array('d')
+        self.d0 = array('d')
+        self.d1 = array('d')
+        self.d00 = array('d')
+        self.d01 = array('d')
+        self.d11 = array('d')
+        self.inputs = []
+        self.guards = []
+        #set when the traced function reads the value of a node (ReverseAD.val),
+        #which the tape cannot guard: such a tape is never replayed
+        self.values_read = False
+        #node index by (op, operands), or by (op, value, sign) for constants
+        self.cse = cse
+        self._nodes = {}
+        self.deduplicated = 0
+        self.simplify = simplify
+        self.simplified = 0
+        self.pruned = 0
+
+    def __len__(self):
+        return len(self.op)
+
+    def _append(self, op, arg0, arg1, val, d0, d1, d00 = 0.0, d01 = 0.0, d11 = 0.0):
+        ''' Appends one node and returns its index '''
+        self.op.append(op)
+        self.arg0.append(arg0)
+        self.arg1.append(arg1)
+        self.val.append(val)
+        self.d0.append(d0)
+        self.d1.append(d1)
+        self.d00.append(d00)
+        self.d01.append(d01)
+        self.d11.append(d11)
+        return len(self.op) - 1
+
+    def _node(self, other):
+        ''' Returns the node index of other, recording numeric constants on the tape '''
+        if isinstance(other, ReverseAD):
+            if other.tape is not self:
+                raise ValueError("Cannot combine ReverseAD objects recorded on different tapes.")
+            return other.index
+        try:
+            value = float(other.real)
+        except:
+            raise AttributeError("Illegal argument. Needs to be either ReverseAD object or numeric value.")
+        key = (OP["const"], value, math.copysign(1.0, value))
+        index = self._find(key)
+        if index is None:
+            index = self._append(OP["const"], -1, -1, value, 0.0, 0.0)
+            self._keep(key, index)
+        return index
+
+    def _find(self, key):
+        ''' Returns the node recorded under key, if any, counting it as deduplicated '''
+        if not self.cse:
+            return None
+        index = self._nodes.get(key)
+        if index is not None:
+            self.deduplicated += 1
+        return index
+
+    def _keep(self, key, index):
+        if self.cse:
+            self._nodes[key] = index
+
+    def value(self, other):
+        ''' Returns the value of a node of this tape, or other itself when it is a number '''
+        if isinstance(other, ReverseAD):
+            return self.val[self._node(other)]
+        return other
+
+    def variable(self, value):
+        ''' Returns a new input node with the given value
+
+        EXAMPLES
+        =========
+        >>> tape = Tape()
+        >>> x = tape.variable(2)
+        >>> x.val
+        2.0
+        '''
+        if not isinstance(value, numbers.Real):
+            raise TypeError ("Please enter an integer or a float for the value of the ReverseAD object.")
+        index = self._append(OP["input"], -1, -1, value, 0.0, 0.0)
+        self.inputs.append(index)
+        return ReverseAD(self, index)
+
+    def variables(self, values):
+        ''' Returns a list of new input nodes, one per entry of values '''
+        return [self.variable(value) for value in values]
+
+    def record(self, op, a, b = None):
+        ''' Records the operation op (see OPCODES) applied to a, and to b for binary
+        operations, and returns the new node. a and b may be ReverseAD objects of
+        this tape or numeric constants.
+
+        EXAMPLES
+        =========
+        >>> tape = Tape()
+        >>> x = tape.variable(4)
+        >>> tape.value(tape.record("sqrt", x))
+        2.0
+        '''
+        arg0 = self._node(a)
+        arg1 = -1 if b is None else self._node(b)
+        code = OP[op]
+        if self.simplify:
+            index = self._simplify(code, arg0, arg1)
+            if index is not None:
+                self.simplified += 1
+                return ReverseAD(self, index)
+        key = (code, arg1, arg0) if code in _COMMUTATIVE and arg1 < arg0 else (code, arg0, arg1)
+        index = self._find(key)
+        if index is None:
+            results = _RULES[code](self.val[arg0], self.val[arg1] if arg1 >= 0 else 0.0)
+            index = self._append(code, arg0, arg1, *results)
+            self._keep(key, index)
+        return ReverseAD(self, index)
+
+    def _simplify(self, code, arg0, arg1):
+        ''' Returns a node equal to the operation code applied to the nodes arg0 (and
+        arg1), without recording the operation, or None. Operations on constants
+        are folded into a constant; x + 0, 0 + x, x - 0, x * 1, 1 * x, x / 1 and
+        x ** 1 are x, x * 0 and 0 * x are 0, and x ** 0 is 1. '''
+        const = OP["const"]
+        is_const0 = self.op[arg0] == const
+        is_const1 = arg1 >= 0 and self.op[arg1] == const
+        if is_const0 and (arg1 < 0 or is_const1):
+            return self._node(_RULES[code](self.val[arg0], self.val[arg1] if arg1 >= 0 else 0.0)[0])
+        c0 = self.val[arg0] if is_const0 else None
+        c1 = self.val[arg1] if is_const1 else None
+        if code == OP["add"]:
+            if c1 == 0:
+                return arg0
+            if c0 == 0:
+                return arg1
+        elif code == OP["sub"] or code == OP["div"]:
+            if c1 == (0 if code == OP["sub"] else 1):
+                return arg0
+        elif code == OP["mul"]:
+            if c0 == 0 or c1 == 0:
+                return self._node(0.0)
+            if c1 == 1:
+                return arg0
+            if c0 == 1:
+                return arg1
+        elif code == OP["pow_const"]:
+            if c1 == 1:
+                return arg0
+            if c1 == 0:
+                return self._node(1.0)
+        return None
+
+    def prune(self, outputs):
+        ''' Removes every node that neither the outputs nor the guards depend on,
+        keeping the inputs, and returns outputs as nodes of the compacted tape.
+        Other ReverseAD objects of this tape are invalid afterwards.
+
+        EXAMPLES
+        =========
+        >>> from hotAD.ElementaryFunctions import ElementaryFunctions
+        >>> tape = Tape()
+        >>> x, y = tape.variables([2, 3])
+        >>> unused = ElementaryFunctions.exp(x * y)
+        >>> f, = tape.prune([x + y])
+        >>> len(tape), tape.pruned, tape.value(f)
+        (3, 2, 5.0)
+        '''
+        nodes = [self._node(f) for f in outputs]
+        arg0, arg1 = self.arg0.tolist(), self.arg1.tolist()
+        live = [False] * len(arg0)
+        for i in nodes + self.inputs + [j for guard in self.guards for j in guard[1:3]]:
+            live[i] = True
+        for i in range(len(arg0) - 1, -1, -1):
+            if live[i]:
+                for j in (arg0[i], arg1[i]):
+                    if j >= 0:
+                        live[j] = True
+        keep = [i for i in range(len(arg0)) if live[i]]
+        new = [-1] * (len(arg0) + 1)
+        for k, i in enumerate(keep):
+            new[i] = k
+        for name in ("op", "val", "d0", "d1", "d00", "d01", "d11"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[i] for i in keep]))
+        self.arg0 = array('l', [new[arg0[i]] for i in keep])
+        self.arg1 = array('l', [new[arg1[i]] for i in keep])
+        self.inputs = [new[i] for i in self.inputs]
+        self.guards = [(op, new[j], new[k], outcome) for op, j, k, outcome in self.guards]
+        #the keys of operations refer to node indices (new[-1] is -1)
+        const = OP["const"]
+        self._nodes = {key if key[0] == const else (key[0], new[key[1]], new[key[2]]): new[i]
+                       for key, i in self._nodes.items() if live[i]}
+        self.pruned += len(arg0) - len(keep)
+        return [ReverseAD(self, new[i]) for i in nodes]
+
+    def compare(self, op, a, b):
+        ''' Returns the outcome of the comparison op ("<", "<=", ">" or ">=") of a
+        and b, and records it as a guard for later replays '''
+        arg0, arg1 = self._node(a), self._node(b)
+        outcome = _COMPARE[op](self.val[arg0], self.val[arg1])
+        self.guards.append((op, arg0, arg1, outcome))
+        return outcome
+
+    def replay(self, x):
+        ''' Recomputes the value and partial derivatives of every node at the new
+        input values x, reusing the recorded operations. Returns False, leaving
+        the tape unusable, when the trace does not describe the function at x:
+        node values were read directly while tracing, a guarded comparison has
+        another outcome, or an operation is undefined at x.
+
+        EXAMPLES
+        =========
+        >>> tape = Tape()
+        >>> x, y = tape.variables([2, 3])
+        >>> f = x * y + 1
+        >>> tape.replay([5, 7])
+        True
+        >>> tape.value(f), tape.gradient(f)
+        (36.0, array([7., 5.]))
+        '''
+        if self.values_read or len(x) != len(self.inputs):
+            return False
+        val, d0, d1 = self.val, self.d0, self.d1
+        d00, d01, d11 = self.d00, self.d01, self.d11
+        for i, xi in zip(self.inputs, x):
+            val[i] = xi
+        rules = _RULES
+        arg0, arg1 = self.arg0.tolist(), self.arg1.tolist()
+        try:
+            for i, code in enumerate(self.op.tolist()):
+                rule = rules[code]
+                if rule is None:
+                    continue
+                k = arg1[i]
+                val[i], d0[i], d1[i], d00[i], d01[i], d11[i] = rule(val[arg0[i]], val[k] if k >= 0 else 0.0)
+        except (ArithmeticError, ValueError):
+            return False
+        for op, j, k, outcome in self.guards:
+            if _COMPARE[op](val[j], val[k]) != outcome:
+                return False
+        return True
+
+    def _adjoints(self, seeds):
+        ''' Returns the adjoints of every node up to the last seeded one, computed in
+        one backward sweep from the adjoints given in seeds as {node index: value} '''
+        n = max(seeds) + 1
+        adj = [0.0] * n
+        for i, value in seeds.items():
+            adj[i] += value
+        arg0, arg1 = self.arg0.tolist(), self.arg1.tolist()
+        d0, d1 = self.d0.tolist(), self.d1.tolist()
+        for i in range(n - 1, -1, -1):
+            a = adj[i]
+            if a == 0.0:
+                continue
+            j = arg0[i]
+            if j >= 0:
+                adj[j] += a * d0[i]
+                k = arg1[i]
+                if k >= 0:
+                    adj[k] += a * d1[i]
+        return adj
+
+    def _inputs(self, inputs):
+        if inputs is None:
+            return self.inputs
+        return [self._node(x) for x in inputs]
+
+    def gradient(self, output, inputs = None):
+        ''' Returns the gradient of output with respect to inputs (default: every
+        input node of the tape, in creation order) as a float64 array
+
+        EXAMPLES
+        =========
+        >>> tape = Tape()
+        >>> x, y = tape.variables([2, 3])
+        >>> tape.gradient(x * y - x / y)
+        array([2.66666667, 2.22222222])
+        '''
+        inputs = self._inputs(inputs)
+        if not isinstance(output, ReverseAD):
+            return np.zeros(len(inputs))
+        adj = self._adjoints({output.index: 1.0})
+        return np.array([adj[i] if i < len(adj) else 0.0 for i in inputs])
+
+    def vjp(self, outputs, u, inputs = None):
+        ''' Returns the product u^T J of the vector u with the Jacobian of outputs
+        with respect to inputs (default: every input node of the tape), computed
+        in one backward sweep
+
+        EXAMPLES
+        =========
+        >>> tape = Tape()
+        >>> x, y = tape.variables([2, 3])
+        >>> tape.vjp([x * y, x + 1], [1, 10])
+        array([13.,  2.])
+        '''
+        inputs = self._inputs(inputs)
+        if len(u) != len(outputs):
+            raise ValueError("u needs to have one entry per output.")
+        seeds = {}
+        for output, weight in zip(outputs, u):
+            if isinstance(output, ReverseAD):
+                seeds[output.index] = seeds.get(output.index, 0.0) + float(weight)
+        if not seeds:
+            return np.zeros(len(inputs))
+        adj = self._adjoints(seeds)
+        return np.array([adj[i] if i < len(adj) else 0.0 for i in inputs])
+
+    def tangents(self, v, inputs = None, n = None):
+        ''' Returns the directional derivative along v (one entry per input) of the
+        first n nodes of the tape (default: all), computed in one forward sweep '''
+        return self._tangents(v, self._inputs(inputs), len(self) if n is None else n)
+
+    def _tangents(self, v, inputs, n):
+        xdot = [0.0] * n
+        for i, vi in zip(inputs, v):
+            if i < n:
+                xdot[i] = float(vi)
+        arg0, arg1 = self.arg0.tolist(), self.arg1.tolist()
+        d0, d1 = self.d0.tolist(), self.d1.tolist()
+        for i in range(n):
+            j = arg0[i]
+            if j >= 0:
+                k = arg1[i]
+                if k >= 0:
+                    xdot[i] = d0[i] * xdot[j] + d1[i] * xdot[k]
+                else:
+                    xdot[i] = d0[i] * xdot[j]
+        return xdot
+
+    def hvp(self, output, v, inputs = None):
+        ''' Returns the product of the Hessian of output with respect to inputs
+        (default: every input node of the tape) and the vector v, computed forward
+        over reverse: a tangent sweep along v, then one backward sweep of the
+        adjoints and of their derivatives along v
+
+        EXAMPLES
+        =========
+        >>> tape = Tape()
+        >>> x, y = tape.variables([2, 3])
+        >>> tape.hvp(x * x * y, [1, 0])
+        array([6., 4.])
+        '''
+        inputs = self._inputs(inputs)
+        if len(v) != len(inputs):
+            raise ValueError("v needs to have one entry per input.")
+        if not isinstance(output, ReverseAD):
+            return np.zeros(len(inputs))
+        n = output.index + 1
+        xdot = self._tangents(v, inputs, n)
+        adj = [0.0] * n
+        adot = [0.0] * n
+        adj[output.index] = 1.0
+        arg0, arg1 = self.arg0.tolist(), self.arg1.tolist()
+        d0, d1 = self.d0.tolist(), self.d1.tolist()
+        d00, d01, d11 = self.d00.tolist(), self.d01.tolist(), self.d11.tolist()
+        for i in range(n - 1, -1, -1):
+            a, ad = adj[i], adot[i]
+            if a == 0.0 and ad == 0.0:
+                continue
+            j = arg0[i]
+            if j >= 0:
+                k = arg1[i]
+                tj = xdot[j]
+                tk = xdot[k] if k >= 0 else 0.0
+                adj[j] += a * d0[i]
+                adot[j] += ad * d0[i] + a * (d00[i] * tj + d01[i] * tk)
+                if k >= 0:
+                    adj[k] += a * d1[i]
+                    adot[k] += ad * d1[i] + a * (d01[i] * tj + d11[i] * tk)
+        return np.array([adot[i] if i < n else 0.0 for i in inputs])
+
+
+class ReverseAD():
+
+    ''' Create objects that record the operations of a function on a Tape, so that the
+    gradient with respect to all inputs is obtained in one backward sweep
+    (reverse mode). Supports the same operators as AutoDiff, ** and the functions
+    in ElementaryFunctions. Comparisons (<, <=, >, >=) return the outcome for the
+    current values and are recorded on the tape as guards.
+
+    INSTANCE VARIABLES
+    =======
+    - tape: the Tape the object is recorded on
+    - index: position of the object on the tape
+    - val: numeric value of the object. Branching on val cannot be guarded, so a
+           tape whose values were read is never replayed; compare the objects
+           themselves instead (e.g. x > 0)
+
+    EXAMPLE:
+            tape = Tape()
+            x = tape.variable(3)
+            f = x * x
+            tape.gradient(f)       # array([6.])
+    '''
+
+    def __init__(self, tape, index):
+        self.tape = tape
+        self.index = index
+
+    @property
+    def val(self):
+        self.tape.values_read = True
+        return self.tape.val[self.index]
+
+    def _apply(self, op):
+        ''' Records the unary elementary function op (see OPCODES) of the object '''
+        return self.tape.record(op, self)
+
+    def __neg__(self):
+        return self.tape.record("neg", self)
+
+    def __add__(self, other):
+        return self.tape.record("add", self, other)
+
+    def __radd__(self, other):
+        return self.tape.record("add", other, self)
+
+    def __sub__(self, other):
+        return self.tape.record("sub", self, other)
+
+    def __rsub__(self, other):
+        return self.tape.record("sub", other, self)
+
+    def __mul__(self, other):
+        return self.tape.record("mul", self, other)
+
+    def __rmul__(self, other):
+        return self.tape.record("mul", other, self)
+
+    def __truediv__(self, other):
+        return self.tape.record("div", self, other)
+
+    def __rtruediv__(self, other):
+        return self.tape.record("div", other, self)
+
+    def __pow__(self, other):
+        if isinstance(other, ReverseAD):
+            return self.tape.record("pow", self, other)
+        return self.tape.record("pow_const", self, other)
+
+    def __rpow__(self, other):
+        return self.tape.record("const_pow", other, self)
+
+    def __lt__(self, other):
+        return self.tape.compare("<", self, other)
+
+    def __le__(self, other):
+        return self.tape.compare("<=", self, other)
+
+    def __gt__(self, other):
+        return self.tape.compare(">", self, other)
+
+    def __ge__(self, other):
+        return self.tape.compare(">=", self, other)
+
+
+class TracedFunction():
+
+    ''' A user defined n-vector function F traced once on a Tape and replayed at
+    later points. Each evaluation first replays the recorded operations at the new
+    x, which is much cheaper than running F again; F is traced anew only when the
+    replay is refused (see Tape.replay), e.g. because a comparison in F changes
+    outcome. Nodes none of the outputs depend on are removed after tracing (see
+    Tape.prune), so they are neither replayed nor checked for domain errors.
+
+    INSTANCE VARIABLES
+    =======
+    - F: the traced function, returning a length n list
+    - tape: the current trace
+    - traces, replays: number of times F was traced and the tape was replayed
+    - sparsity: the Jacobian sparsity pattern and column coloring of the current
+                trace (see sparse_jacobian), or None until they are needed
+    - hessian_sparsity: the same for the Hessian, with a star coloring
+
+    EXAMPLE:
+            G = TracedFunction(lambda x: [x[0] * x[1]])
+            G.jacobian([1, 2])     # traces F
+            G.jacobian([3, 4])     # replays the tape
+    '''
+
+    def __init__(self, F):
+        self.F = F
+        self.tape = None
+        self.outputs = []
+        self.traces = 0
+        self.replays = 0
+        self.sparsity = None
+        self.hessian_sparsity = None
+
+    def _trace(self, x):
+        tape = Tape()
+        Fcal = self.F(tape.variables(x))
+        self.outputs = tape.prune(Fcal)
+        self.tape = tape
+        self.traces += 1
+        self.sparsity = None
+        self.hessian_sparsity = None
+
+    def at(self, x):
+        ''' Returns the tape evaluated at x, replayed when possible and traced otherwise '''
+        if self.tape is not None and self.tape.replay(x):
+            self.replays += 1
+        else:
+            self._trace(x)
+        return self.tape
+
+    def jacobian(self, x, H = False):
+        ''' Returns [F(x), J_F(x)], or [F(x), J_F(x), H_F(x)] with H = True for an
+        one-vector function F, in the format of ADfun.J_F
+
+        EXAMPLES
+        =========
+        >>> G = TracedFunction(lambda x: [x[0] * x[1] - x[0] if x[0] > 1 else x[1]])
+        >>> G.jacobian([2, 3])
+        [array([4.]), array([[2., 2.]])]
+        >>> G.jacobian([3, 1])
+        [array([0.]), array([[0., 3.]])]
+        >>> G.jacobian([0, 1])
+        [array([1.]), array([[0., 1.]])]
+        >>> G.traces, G.replays
+        (2, 1)
+        '''
+        self.at(x)
+        return self._derivatives(H)
+
+    def _derivatives(self, H = False):
+        ''' Returns the outputs and their derivatives on the current tape, in the
+        format of jacobian '''
+        tape = self.tape
+        outputs = self.outputs
+        n, m = len(outputs), len(tape.inputs)
+        if H == True and n != 1:
+            raise ValueError ("F needs to be a function from R^n to R!")
+
+        F1 = np.array([tape.value(f) for f in outputs])
+        J_F = np.zeros((n, m))
+        if n <= m:
+            #one backward sweep per output
+            for i in range(0, n):
+                J_F[i, :] = tape.gradient(outputs[i])
+        else:
+            #one forward tangent sweep per input
+            for j in range(0, m):
+                xdot = tape.tangents(np.eye(1, m, j)[0])
+                J_F[:, j] = [xdot[f.index] for f in outputs]
+
+        if H != True:
+            return [F1, J_F]
+
+        #one Hessian-vector product per input
+        H_F = np.array([tape.hvp(outputs[0], np.eye(1, m, j)[0]) for j in range(0, m)])
+        return [F1, J_F, (H_F + H_F.T) / 2]
+
+    def sparse_jacobian(self, x, H = False):
+        ''' Returns [F(x), J_F(x)] with the Jacobian as a CSRMatrix. Its sparsity
+        pattern is detected on the trace (see Sparsity.jacobian_pattern) and its
+        columns are colored so that no two columns of one color share a row; the
+        Jacobian is then recovered from one forward tangent sweep per color rather
+        than one per input. The pattern and coloring are kept until F is traced
+        again.
+
+        With H = True, for an one-vector function F, returns [F(x), J_F(x), H_F(x)]
+        with both derivatives as CSRMatrix. The gradient takes one backward sweep.
+        The Hessian pattern comes from Sparsity.hessian_pattern and is star colored
+        (see Sparsity.color_star), so that the Hessian is recovered from one
+        Hessian-vector product per color rather than one per input.
+
+        EXAMPLES
+        =========
+        >>> G = TracedFunction(lambda x: [x[0] * x[1], x[1] + x[2], x[2] * x[2]])
+        >>> val, J = G.sparse_jacobian([1, 2, 3])
+        >>> J.toarray()
+        array([[2., 1., 0.],
+               [0., 1., 1.],
+               [0., 0., 6.]])
+        >>> G.sparsity[1].max() + 1
+        2
+        >>> G = TracedFunction(lambda x: [x[0] * x[1] + x[1] * x[2] + x[2] * x[2]])
+        >>> val, J, H = G.sparse_jacobian([1, 2, 3], H = True)
+        >>> H.toarray()
+        array([[0., 1., 0.],
+               [1., 0., 1.],
+               [0., 1., 2.]])
+        '''
+        tape = self.at(x)
+        outputs = self.outputs
+        if H == True and len(outputs) != 1:
+            raise ValueError ("F needs to be a function from R^n to R!")
+        if self.sparsity is None:
+            pattern = jacobian_pattern(tape, outputs)
+            colors = color_columns(pattern)
+            self.sparsity = (pattern, colors, seed_matrix(colors))
+        pattern, colors, S = self.sparsity
+
+        F1 = np.array([tape.value(f) for f in outputs])
+        if H == True:
+            grad = tape.gradient(outputs[0])
+            J_F = CSRMatrix(grad[pattern.indices], pattern.indices, pattern.indptr, pattern.shape)
+            if self.hessian_sparsity is None:
+                hpattern = hessian_pattern(tape, outputs[0])
+                hcolors = color_star(hpattern)
+                self.hessian_sparsity = (hpattern, hcolors, seed_matrix(hcolors))
+            hpattern, hcolors, S = self.hessian_sparsity
+            #one Hessian-vector product per color
+            B = np.zeros((len(tape.inputs), S.shape[1]))
+            for c in range(S.shape[1]):
+                B[:, c] = tape.hvp(outputs[0], S[:, c])
+            return [F1, J_F, recover_hessian(hpattern, hcolors, B)]
+
+        B = np.zeros((len(outputs), S.shape[1]))
+        for c in range(S.shape[1]):
+            xdot = tape.tangents(S[:, c])
+            B[:, c] = [xdot[f.index] for f in outputs]
+        return [F1, recover_jacobian(pattern, colors, B)]
@@ -0,0 +1,349 @@
+##This module detects the sparsity pattern of derivatives and compresses their evaluation by graph coloring
+import numpy as np
+
+
+class CSRMatrix():
+
+    ''' Sparse matrix in compressed sparse row format: the nonzero entries of row i
+    are data[indptr[i]:indptr[i+1]], in the columns indices[indptr[i]:indptr[i+1]]
+    (in increasing order).
+
+    INSTANCE VARIABLES
+    =======
+    - data: float64 array of the stored entries
+    - indices: integer array of their column indices
+    - indptr: integer array of length n + 1 of the row offsets into data
+    - shape: (n, m)
+
+    EXAMPLE:
+            J = CSRMatrix([1.0, 2.0, 3.0], [0, 2, 1], [0, 2, 3], (2, 3))
+            J.toarray()        # [[1, 0, 2], [0, 3, 0]]
+            J @ [1, 1, 1]      # [3, 3]
+    '''
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype = np.float64)
+        self.indices = np.asarray(indices, dtype = int)
+        self.indptr = np.asarray(indptr, dtype = int)
+        self.shape = tuple(shape)
+        if len(self.indptr) != self.shape[0] + 1 or len(self.indices) != len(self.data):
+            raise ValueError("Inconsistent CSR arrays.")
+
+    @classmethod
+    def from_rows(cls, rows, m, data = None):
+        ''' Returns the n x m matrix whose row i has its entries in the sorted
+        columns rows[i], with values data (ones by default) '''
+        indptr = np.zeros(len(rows) + 1, dtype = int)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+        indices = np.array([j for row in rows for j in row], dtype = int)
+        return cls(np.ones(len(indices)) if data is None else data, indices, indptr, (len(rows), m))
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def rows(self):
+        ''' Returns the row index of every stored entry '''
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def toarray(self):
+        ''' Returns the matrix as a dense float64 array
+
+        EXAMPLES
+        =========
+        >>> CSRMatrix([1.0, 2.0, 3.0], [0, 2, 1], [0, 2, 3], (2, 3)).toarray()
+        array([[1., 0., 2.],
+               [0., 3., 0.]])
+        '''
+        out = np.zeros(self.shape)
+        out[self.rows(), self.indices] = self.data
+        return out
+
+    def __matmul__(self, v):
+        ''' Returns the product of the matrix with the vector v
+
+        EXAMPLES
+        =========
+        >>> CSRMatrix([1.0, 2.0, 3.0], [0, 2, 1], [0, 2, 3], (2, 3)) @ [1, 1, 2]
+        array([5., 3.])
+        '''
+        v = np.asarray(v, dtype = np.float64)
+        if v.shape != (self.shape[1],):
+            raise ValueError("v needs to have one entry per column.")
+        return np.bincount(self.rows(), weights = self.data * v[self.indices], minlength = self.shape[0])
+
+    def __repr__(self):
+        return "CSRMatrix(shape = {}, nnz = {})".format(self.shape, self.nnz)
+
+
+def _union(a, b, free_a, free_b):
+    ''' Returns the input set (see jacobian_pattern) of a binary operation on nodes
+    with the sets a and b, where free_a and free_b tell whether the operand is not
+    read after the operation. The set of a free operand held by no other node is
+    taken over, the larger one first, and the other set added to it in place, so
+    that accumulating a sum costs time proportional to the terms added rather than
+    to the sum so far. '''
+    if a is None or a is b:
+        if b is not None:
+            b[1] += 1
+        return b
+    if b is None:
+        a[1] += 1
+        return a
+    if free_b and b[1] == 1 and (len(b[0]) > len(a[0]) or not (free_a and a[1] == 1)):
+        a, b = b, a
+    elif not (free_a and a[1] == 1):
+        return [a[0] | b[0], 1]
+    a[0] |= b[0]
+    a[1] += 1
+    return a
+
+def _drop(sets, i):
+    ''' Releases the input set of node i '''
+    if sets[i] is not None:
+        sets[i][1] -= 1
+        sets[i] = None
+
+
+def jacobian_pattern(tape, outputs):
+    ''' Returns the sparsity pattern of the Jacobian of outputs (nodes of tape) with
+    respect to the inputs of the tape, as a CSRMatrix of ones. Each node carries
+    the set of inputs it depends on, propagated in one forward pass over the tape
+    (index-set propagation) at a cost proportional to the sizes of the sets: a
+    unary operation shares the set of its operand, a binary one may extend the set
+    of an operand it reads last (see _union), and a set is dropped after the last
+    node that reads it. Sets are held as [set, number of nodes holding it].
+
+    EXAMPLES
+    =========
+    >>> from hotAD.ReverseAD import Tape
+    >>> tape = Tape()
+    >>> x = tape.variables([1, 2, 3])
+    >>> jacobian_pattern(tape, [x[0] * x[1], x[2] + 1]).toarray()
+    array([[1., 1., 0.],
+           [0., 0., 1.]])
+    '''
+    n = len(tape)
+    arg0, arg1 = tape.arg0.tolist(), tape.arg1.tolist()
+    keep = set(f.index for f in outputs)
+    last = [-1] * n
+    for i in range(n):
+        for j in (arg0[i], arg1[i]):
+            if j >= 0:
+                last[j] = i
+    sets = [None] * n
+    for p, i in enumerate(tape.inputs):
+        sets[i] = [{p}, 1]
+    for i in range(n):
+        j, k = arg0[i], arg1[i]
+        if j < 0:
+            continue
+        free_j = last[j] == i and j not in keep
+        if k < 0:
+            sets[i] = sets[j]
+            if sets[i] is not None:
+                sets[i][1] += 1
+        else:
+            free_k = last[k] == i and k not in keep
+            sets[i] = _union(sets[j], sets[k], free_j, free_k)
+            if free_k:
+                _drop(sets, k)
+        if free_j:
+            _drop(sets, j)
+    return CSRMatrix.from_rows([sorted(sets[f.index][0]) if sets[f.index] else [] for f in outputs],
+                               len(tape.inputs))
+
+def color_columns(pattern):
+    ''' Returns a coloring of the columns of a sparsity pattern (an integer array,
+    colors 0, 1, ...) such that no two columns with a nonzero in the same row share
+    a color: a distance-1 coloring of the column intersection graph, greedy in the
+    order of decreasing column count. The columns of one color can then be
+    evaluated together, by a single directional derivative along their sum.
+
+    EXAMPLES
+    =========
+    >>> tridiagonal = CSRMatrix.from_rows([[0, 1], [0, 1, 2], [1, 2, 3], [2, 3]], 4)
+    >>> color_columns(tridiagonal)
+    array([2, 0, 1, 2])
+    '''
+    n, m = pattern.shape
+    rows = pattern.rows()
+    by_column = [[] for _ in range(m)]
+    for i, j in zip(rows.tolist(), pattern.indices.tolist()):
+        by_column[j].append(i)
+    indptr, indices = pattern.indptr.tolist(), pattern.indices.tolist()
+    colors = [-1] * m
+    mark = []
+    for j in sorted(range(m), key = lambda j: -len(by_column[j])):
+        for i in by_column[j]:
+            for k in indices[indptr[i]:indptr[i+1]]:
+                if colors[k] >= 0:
+                    mark[colors[k]] = j
+        color = 0
+        while color < len(mark) and mark[color] == j:
+            color += 1
+        if color == len(mark):
+            mark.append(-1)
+        colors[j] = color
+    return np.array(colors, dtype = int)
+
+def seed_matrix(colors):
+    ''' Returns the m x p matrix whose column c is the sum of the unit vectors of
+    the columns of color c '''
+    S = np.zeros((len(colors), int(colors.max()) + 1 if len(colors) else 0))
+    S[np.arange(len(colors)), colors] = 1.0
+    return S
+
+def recover_jacobian(pattern, colors, B):
+    ''' Returns the Jacobian as a CSRMatrix with the given pattern from the
+    compressed Jacobian B = J S (see seed_matrix): each entry (i, j) is read from
+    B[i, colors[j]], where column j is the only one of its color in row i '''
+    return CSRMatrix(B[pattern.rows(), colors[pattern.indices]], pattern.indices, pattern.indptr, pattern.shape)
+
+#Operations whose second derivatives are structurally zero, and the nonlinear
+#unary functions (binary operations are handled in hessian_pattern)
+_LINEAR = {"input", "const", "add", "sub", "neg"}
+_UNARY = {"sin", "cos", "tan", "log", "exp", "sqrt", "logit", "arcsin", "arccos", "arctan"}
+
+def hessian_pattern(tape, output):
+    ''' Returns the sparsity pattern of the Hessian of output (a node of tape) with
+    respect to the inputs of the tape, as a symmetric CSRMatrix of ones. The input
+    sets of the nodes are propagated forward as in jacobian_pattern, and the
+    inputs each input interacts with are kept in a set of its own; every
+    nonlinear operation the output depends on makes the inputs of its operands
+    interact: all pairs from the operand of a nonlinear unary function, pairs
+    across the operands of a product, and so on (nonlinear interaction
+    propagation).
+
+    EXAMPLES
+    =========
+    >>> from hotAD.ReverseAD import Tape
+    >>> from hotAD.ElementaryFunctions import ElementaryFunctions
+    >>> tape = Tape()
+    >>> x = tape.variables([1, 2, 3])
+    >>> f = x[0] * x[1] + ElementaryFunctions.exp(x[2]) + x[1]
+    >>> hessian_pattern(tape, f).toarray()
+    array([[0., 1., 0.],
+           [1., 0., 0.],
+           [0., 0., 1.]])
+    '''
+    from hotAD.ReverseAD import OPCODES
+    n, m = len(tape), len(tape.inputs)
+    op, arg0, arg1 = tape.op.tolist(), tape.arg0.tolist(), tape.arg1.tolist()
+    live = [False] * n
+    live[output.index] = True
+    last = [-1] * n
+    for i in range(n - 1, -1, -1):
+        for j in (arg0[i], arg1[i]):
+            if j >= 0:
+                live[j] = live[j] or live[i]
+                if last[j] < 0:
+                    last[j] = i
+    sets = [None] * n
+    for p, i in enumerate(tape.inputs):
+        sets[i] = [{p}, 1]
+    neighbours = [set() for _ in range(m)]
+
+    def interact(S, T):
+        if S is None or T is None:
+            return
+        S, T = S[0], T[0]
+        for p in S:
+            neighbours[p] |= T
+        if T is not S:
+            for p in T:
+                neighbours[p] |= S
+
+    for i in range(n):
+        j, k = arg0[i], arg1[i]
+        if j < 0:
+            continue
+        name = OPCODES[op[i]]
+        #operands interact before _union may extend their sets in place
+        if live[i] and name not in _LINEAR:
+            if name in _UNARY:
+                interact(sets[j], sets[j])
+            elif name == "mul":
+                interact(sets[j], sets[k])
+            elif name == "div":
+                interact(sets[j], sets[k])
+                interact(sets[k], sets[k])
+            elif name == "pow_const":
+                if tape.val[k] not in (0.0, 1.0):
+                    interact(sets[j], sets[j])
+            elif name == "const_pow":
+                interact(sets[k], sets[k])
+        free_j = last[j] == i and j != output.index
+        if k < 0:
+            sets[i] = sets[j]
+            if sets[i] is not None:
+                sets[i][1] += 1
+        else:
+            free_k = last[k] == i and k != output.index
+            sets[i] = _union(sets[j], sets[k], free_j, free_k)
+            if free_k:
+                _drop(sets, k)
+        if free_j:
+            _drop(sets, j)
+        if live[i] and name == "pow":
+            interact(sets[i], sets[i])
+    return CSRMatrix.from_rows([sorted(row) for row in neighbours], m)
+
+def color_star(pattern):
+    ''' Returns a star coloring of the adjacency graph of a symmetric sparsity
+    pattern (an integer array, colors 0, 1, ...): adjacent variables have
+    different colors, and every path of four variables uses at least three
+    colors. Greedy, in the order of decreasing degree: a color is refused for v
+    when it is taken by a neighbour, or by a vertex x two steps away through a
+    neighbour w such that v - w - x would extend to a path of two colors.
+
+    With a star coloring, each off-diagonal entry H[i, j] is the only entry of
+    its color in row i or in row j of the Hessian, so that the Hessian is
+    recovered from one Hessian-vector product per color (see recover_hessian).
+
+    EXAMPLES
+    =========
+    >>> arrow = CSRMatrix.from_rows([[0, 1, 2, 3], [0, 1], [0, 2], [0, 3]], 4)
+    >>> color_star(arrow)
+    array([0, 1, 1, 1])
+    '''
+    m = pattern.shape[0]
+    indptr, indices = pattern.indptr.tolist(), pattern.indices.tolist()
+    adjacent = [[j for j in indices[indptr[i]:indptr[i+1]] if j != i] for i in range(m)]
+    colors = [-1] * m
+    for v in sorted(range(m), key = lambda v: -len(adjacent[v])):
+        around = {}
+        for w in adjacent[v]:
+            if colors[w] >= 0:
+                around[colors[w]] = around.get(colors[w], 0) + 1
+        forbidden = set(around)
+        for w in adjacent[v]:
+            cw = colors[w]
+            if cw < 0:
+                continue
+            for x in adjacent[w]:
+                cx = colors[x]
+                if x == v or cx < 0 or cx in forbidden:
+                    continue
+                #u - v - w - x with u colored as w, or v - w - x - y with y colored as w
+                if around[cw] > 1 or any(colors[y] == cw for y in adjacent[x] if y != w):
+                    forbidden.add(cx)
+        color = 0
+        while color in forbidden:
+            color += 1
+        colors[v] = color
+    return np.array(colors, dtype = int)
+
+def recover_hessian(pattern, colors, B):
+    ''' Returns the Hessian as a symmetric CSRMatrix with the given pattern from
+    the compressed Hessian B = H S (see seed_matrix) of a star coloring: H[i, j]
+    is B[i, colors[j]] when j is the only neighbour of i of its color, and
+    B[j, colors[i]] otherwise; a diagonal entry H[i, i] is B[i, colors[i]] '''
+    rows, cols = pattern.rows(), pattern.indices
+    p = B.shape[1]
+    off = rows != cols
+    keys = rows * p + colors[cols]
+    count = np.bincount(keys[off], minlength = pattern.shape[0] * p)
+    direct = ~off | (count[keys] == 1)
+    data = np.where(direct, B[rows, colors[cols]], B[cols, colors[rows]])
+    return CSRMatrix(data, cols, pattern.indptr, pattern.shape)
@@ -0,0 +1,263 @@
+##This module implements Taylor mode automatic differentiation of arbitrary order
+import math
+import numbers
+import numpy as np
+
+#Propagation of truncated Taylor coefficients. Each helper takes the coefficient
+#arrays a (and b) of x(t) = sum_k a[k] t^k up to order K and returns those of the
+#result, using the standard recurrences in O(K^2) operations.
+
+def _mul(a, b):
+    return np.convolve(a, b)[:len(a)]
+
+def _div(a, b):
+    if b[0] == 0:
+        raise ZeroDivisionError("Denominator cannot have value 0.")
+    q = np.empty(len(a))
+    for k in range(len(a)):
+        q[k] = (a[k] - np.dot(q[:k], b[k:0:-1])) / b[0]
+    return q
+
+def _integrate(a, u, y0):
+    ''' Coefficients of y with y(0) = y0 and y' = u * a', u given up to order K - 1 '''
+    y = np.empty(len(a))
+    y[0] = y0
+    ja = np.arange(len(a)) * a
+    for k in range(1, len(a)):
+        y[k] = np.dot(ja[1:k+1], u[k-1::-1]) / k
+    return y
+
+def _one(a):
+    one = np.zeros(len(a))
+    one[0] = 1.0
+    return one
+
+def _exp(a):
+    e = np.empty(len(a))
+    e[0] = math.exp(a[0])
+    ja = np.arange(len(a)) * a
+    for k in range(1, len(a)):
+        e[k] = np.dot(ja[1:k+1], e[k-1::-1]) / k
+    return e
+
+def _log(a):
+    if a[0] <= 0:
+        raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
+    return _integrate(a, _div(_one(a), a), math.log(a[0]))
+
+def _sincos(a):
+    s, c = np.empty(len(a)), np.empty(len(a))
+    s[0], c[0] = math.sin(a[0]), math.cos(a[0])
+    ja = np.arange(len(a)) * a
+    for k in range(1, len(a)):
+        s[k] = np.dot(ja[1:k+1], c[k-1::-1]) / k
+        c[k] = -np.dot(ja[1:k+1], s[k-1::-1]) / k
+    return s, c
+
+def _pow(a, r):
+    ''' Coefficients of a^r for a real constant r '''
+    if r == int(r) and r >= 0:
+        #repeated squaring, exact at a[0] = 0
+        result, square, n = _one(a), a, int(r)
+        while n:
+            if n & 1:
+                result = _mul(result, square)
+            n >>= 1
+            if n:
+                square = _mul(square, square)
+        return result
+    if a[0] == 0 and len(a) > 1:
+        raise ZeroDivisionError("Denominator cannot have value 0.")
+    if a[0] < 0 and r != int(r):
+        raise ValueError("Base value should be positive, because we don't consider imaginary number here.")
+    p = np.empty(len(a))
+    p[0] = math.pow(a[0], r)
+    for k in range(1, len(a)):
+        j = np.arange(k)
+        p[k] = np.dot((r * (k - j) - j) * a[k:0:-1], p[:k]) / (k * a[0])
+    return p
+
+def _sin(a):
+    return _sincos(a)[0]
+
+def _cos(a):
+    return _sincos(a)[1]
+
+def _tan(a):
+    if abs(math.tan(a[0])) > 10**16:
+        raise ValueError("Input value should not be pi/2 + 2*pi*k, k integer.")
+    s, c = _sincos(a)
+    return _div(s, c)
+
+def _sqrt(a):
+    if a[0] < 0:
+        raise ValueError("Unsupported input. Object needs to have non-negative values.")
+    return _pow(a, 0.5)
+
+def _logit(a):
+    if a[0] < 0:
+        raise ValueError("Unsupported input. Object needs to have non-negative values.")
+    return _div(_one(a), _one(a) + _exp(-a))
+
+def _arcsin(a):
+    if abs(a[0]) > 1:
+        raise ValueError("Value must be in [-1, 1].")
+    return _integrate(a, _pow(_one(a) - _mul(a, a), -0.5), math.asin(a[0]))
+
+def _arccos(a):
+    if abs(a[0]) > 1:
+        raise ValueError("Value must be in [-1, 1].")
+    return _integrate(a, -_pow(_one(a) - _mul(a, a), -0.5), math.acos(a[0]))
+
+def _arctan(a):
+    return _integrate(a, _div(_one(a), _one(a) + _mul(a, a)), math.atan(a[0]))
+
+#Propagation rule of each ElementaryFunctions method
+_FUNCTIONS = {"sin": _sin, "cos": _cos, "tan": _tan, "log": _log, "exp": _exp, "sqrt": _sqrt,
+              "logit": _logit, "arcsin": _arcsin, "arccos": _arccos, "arctan": _arctan}
+
+
+class TaylorAD():
+
+    ''' Create objects carrying the truncated Taylor expansion
+    x(t) = coef[0] + coef[1] t + ... + coef[K] t^K of a value along a curve t ->
+    x(t), up to an arbitrary order K. Arithmetic operators and the functions in
+    ElementaryFunctions propagate the coefficients to the same order, so that the
+    k-th derivative of f(x(t)) at t = 0 is k! times the k-th coefficient of the
+    result (see derivatives). Each operation costs O(K^2).
+
+    For a function of several variables, seeding every input x[i] with
+    coef = [x[i], v[i], 0, ...] gives the directional derivatives of any order of
+    f(x + t v) (see ADfun.taylor).
+
+    INSTANCE VARIABLES
+    =======
+    - coef: float64 array of the K + 1 Taylor coefficients
+    - val: the value coef[0]
+
+    EXAMPLE:
+            x = TaylorAD.variable(0.5, 4)       # x(t) = 0.5 + t, to order 4
+            f = ElementaryFunctions.sin(x) * x
+            f.derivatives()                     # the derivatives of order 0 to 4 at 0.5
+    '''
+
+    def __init__(self, coef):
+        try:
+            coef = np.array(coef, dtype = np.float64)
+        except (TypeError, ValueError):
+            raise TypeError ("Please enter a list of integers or floats for the Taylor coefficients.")
+        if coef.ndim != 1 or len(coef) == 0:
+            raise TypeError ("Please enter a list of integers or floats for the Taylor coefficients.")
+        self.coef = coef
+
+    @classmethod
+    def variable(cls, value, order, direction = 1.0):
+        ''' Returns the expansion value + direction * t of an independent variable,
+        truncated at the given order
+
+        EXAMPLES
+        =========
+        >>> TaylorAD.variable(2, 3).coef
+        array([2., 1., 0., 0.])
+        '''
+        if not isinstance(value, numbers.Real) or not isinstance(direction, numbers.Real):
+            raise TypeError ("Please enter an integer or a float for the value of the TaylorAD object.")
+        if not isinstance(order, numbers.Integral) or order < 0:
+            raise TypeError ("Please enter a non-negative integer for the order.")
+        coef = np.zeros(order + 1)
+        coef[0] = value
+        if order > 0:
+            coef[1] = direction
+        return cls(coef)
+
+    @property
+    def val(self):
+        return self.coef[0]
+
+    @property
+    def order(self):
+        return len(self.coef) - 1
+
+    def derivatives(self):
+        ''' Returns the derivatives d^k/dt^k x(t) at t = 0 for k = 0, ..., K
+
+        EXAMPLES
+        =========
+        >>> x = TaylorAD.variable(2, 4)
+        >>> (x * x * x).derivatives()
+        array([ 8., 12., 12.,  6.,  0.])
+        '''
+        factorials = np.cumprod(np.concatenate(([1.0], np.arange(1, len(self.coef)))))
+        return self.coef * factorials
+
+    def _lift(self, other):
+        ''' Returns the coefficients of other, a TaylorAD object of the same order or
+        a numeric constant '''
+        if isinstance(other, TaylorAD):
+            if len(other.coef) != len(self.coef):
+                raise ValueError("Cannot combine TaylorAD objects of different orders.")
+            return other.coef
+        if isinstance(other, numbers.Real):
+            coef = np.zeros(len(self.coef))
+            coef[0] = other
+            return coef
+        raise AttributeError("Illegal argument. Needs to be either TaylorAD object or numeric value.")
+
+    def _apply(self, name):
+        ''' Returns the elementary function name (see ElementaryFunctions) of self '''
+        return TaylorAD(_FUNCTIONS[name](self.coef))
+
+    def __repr__(self):
+        return "TaylorAD({})".format(list(self.coef))
+
+    def __neg__(self):
+        return TaylorAD(-self.coef)
+
+    def __add__(self, other):
+        return TaylorAD(self.coef + self._lift(other))
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        return TaylorAD(self.coef - self._lift(other))
+
+    def __rsub__(self, other):
+        return TaylorAD(self._lift(other) - self.coef)
+
+    def __mul__(self, other):
+        if isinstance(other, numbers.Real):
+            return TaylorAD(self.coef * other)
+        return TaylorAD(_mul(self.coef, self._lift(other)))
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        return TaylorAD(_div(self.coef, self._lift(other)))
+
+    def __rtruediv__(self, other):
+        return TaylorAD(_div(self._lift(other), self.coef))
+
+    def __pow__(self, other):
+        if isinstance(other, TaylorAD):
+            #base^power = exp(power * log(base))
+            return TaylorAD(_exp(_mul(self._lift(other), _log(self.coef))))
+        if isinstance(other, numbers.Real):
+            return TaylorAD(_pow(self.coef, other))
+        raise AttributeError("Illegal argument. Needs to be either TaylorAD object or numeric value.")
+
+    def __rpow__(self, other):
+        return TaylorAD(_exp(_mul(self.coef, _log(self._lift(other)))))
+
+    def __lt__(self, other):
+        return self.val < getattr(other, "val", other)
+
+    def __le__(self, other):
+        return self.val <= getattr(other, "val", other)
+
+    def __gt__(self, other):
+        return self.val > getattr(other, "val", other)
+
+    def __ge__(self, other):
+        return self.val >= getattr(other, "val", other)
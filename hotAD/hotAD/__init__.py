@@ -0,0 +1,47 @@
+##hotAD: forward and reverse mode automatic differentiation, with Jacobians,
+##Hessians, root finding and optimization routines built on them.
+''' The public API of hotAD, imported from its modules on first use, so that
+importing hotAD costs next to nothing and J_F does not import matplotlib (see
+Plot). The submodules can be imported directly as before.
+
+NOTES
+=====
+ElementaryFunctions is exported as ef, as its module is imported under the same
+name as the class (likewise ReverseAD and TaylorAD, which stay in their modules).
+
+EXAMPLES
+=========
+>>> import hotAD
+>>> x = hotAD.AutoDiff(2, 'x')
+>>> hotAD.ef.sin(x).der['x'] == hotAD.ef.cos(2)
+True
+>>> hotAD.J_F(lambda x: [x[0] * x[1]], [2, 3])[1]
+array([[3., 2.]])
+'''
+import importlib
+
+#Module of each public name
+_EXPORTS = {"AutoDiff": "AutoDiffObject", "VariableRegistry": "AutoDiffObject",
+            "registry": "AutoDiffObject", "ef": "ElementaryFunctions",
+            "J_F": "ADfun", "J_F_batch": "ADfun", "hvp": "ADfun", "jvp": "ADfun", "vjp": "ADfun",
+            "taylor": "ADfun", "Newton": "ADfun", "Mini": "ADfun",
+            "Tape": "ReverseAD", "TracedFunction": "ReverseAD",
+            "CompiledFunction": "CodeGen", "compiled": "CodeGen",
+            "EvaluationCache": "Memo", "memo": "Memo", "CSRMatrix": "Sparsity"}
+
+#Public names other than the name in their module
+_ALIASES = {"ef": "ElementaryFunctions"}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError("module 'hotAD' has no attribute '%s'" % name) from None
+    value = getattr(importlib.import_module("hotAD." + module), _ALIASES.get(name, name))
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -38,6 +38,13 @@ def test_J_F_fnval():
 	Jac = J_F(F, x)
 	assert np.isclose(Jac[0][0], 18);
 
+# Testing J_F with more than ten unknowns
+def test_J_F_many_variables():
+	F = lambda x: [sum([x[i] * x[i+1] for i in range(len(x) - 1)])]
+	x = list(range(25))
+	Jac = J_F(F, x, H = True)
+	assert np.isclose(Jac[1][0][24], 23) and np.isclose(Jac[2][23][24], 1);
+
 # Testing J_F produces the correct values in the Hessian
 def test_J_F_jacval():
 	F = lambda x: [x[0] * 3 + x[1] * x[2] + x[3]*x[3]]
@@ -45,6 +52,83 @@ def test_J_F_jacval():
 	Jac = J_F(F, x, H = True)
 	assert np.isclose(Jac[2][3][3], 2.0);
 
+# Testing that the chunked forward passes assemble the same Jacobian
+def test_J_F_chunks():
+	F = lambda x: [x[i] * x[i+1] + ef.sin(x[i]) for i in range(len(x) - 1)] + [3 * x[0]]
+	x = [0.1 * i for i in range(11)]
+	full = J_F(F, x)
+	for k in (1, 3, 4, 11, 50):
+		Jac = J_F(F, x, chunk = k)
+		assert np.allclose(Jac[0], full[0]) and np.allclose(Jac[1], full[1]);
+	assert np.isclose(full[1][2][3], 0.2) and np.isclose(full[1][10][0], 3);
+
+def test_J_F_chunk_invalid():
+	F = lambda x: [x[0], x[1]]
+	with pytest.raises(ValueError):
+		J_F(F, [1, 2], chunk = 0);
+	with pytest.raises(ValueError):
+		J_F(F, [1, 2], chunk = 1.5);
+
+def test_J_F_chunk_size():
+	from hotAD.ADfun import _chunk_size
+	for m in (1, 7, 1000, 10**5, 10**6):
+		k = _chunk_size(m)
+		passes = -(-m // k)
+		assert 1 <= k <= m and passes * k - m < passes;
+
+def test_J_F_cache_size_unknown(monkeypatch):
+	import os
+	from hotAD.ADfun import _cache_size, _chunk_size
+	def missing(path):
+		raise OSError
+	for reported in (0, -1):
+		monkeypatch.setattr(os, "sysconf", lambda name: reported)
+		_cache_size.cache_clear()
+		assert _cache_size() > 0 and _chunk_size(1000) > 1
+		monkeypatch.setattr(os, "listdir", missing)
+		_cache_size.cache_clear()
+		assert _cache_size() == 2**20
+		monkeypatch.undo()
+	_cache_size.cache_clear()
+
+# Testing J_F_batch against J_F at every point
+def test_J_F_batch():
+	F = lambda x: [x[0] * 3 + x[1] * x[2], ef.exp(x[2]) - x[0] / x[1], 7, x[1]]
+	X = np.array([[2, 3, 4], [0.5, -1, 0.2], [1, 1, 1]])
+	val, Jac = J_F_batch(F, X)
+	assert val.shape == (3, 4) and Jac.shape == (3, 4, 3)
+	for k in range(3):
+		ref = J_F(lambda x: [F(x)[0], F(x)[1]], X[k].tolist())
+		assert np.allclose(val[k], ref[0].tolist() + [7, X[k][1]])
+		assert np.allclose(Jac[k][:2], ref[1]) and np.allclose(Jac[k][2:], [[0, 0, 0], [0, 1, 0]]);
+
+def test_J_F_batch_invalid_X():
+	with pytest.raises(ValueError):
+		J_F_batch(lambda x: [x[0]], [1, 2, 3]);
+
+######## TESTING JACOBIAN-VECTOR AND VECTOR-JACOBIAN PRODUCTS
+
+def test_jvp_matches_J_F():
+	F = lambda x: [x[0] * 3 + x[1] * x[2], ef.sin(x[2]) - x[0] * x[1] + x[0], 5]
+	x, v = [2, 3, 4], [0.5, -1, 2]
+	val, Jv = jvp(F, x, v)
+	assert np.allclose(val, J_F(lambda x: F(x)[:2], x)[0].tolist() + [5])
+	assert np.allclose(Jv[:2], J_F(lambda x: F(x)[:2], x)[1].dot(v)) and Jv[2] == 0;
+
+def test_vjp_matches_J_F():
+	F = lambda x: [x[0] * 3 + x[1] * x[2], ef.sin(x[2]) - x[0] * x[1] + x[0]]
+	x, u = [2, 3, 4], [1.5, -2]
+	val, uJ = vjp(F, x, u)
+	Jac = J_F(F, x)
+	assert np.allclose(val, Jac[0]) and np.allclose(uJ, np.dot(u, Jac[1]));
+
+def test_jvp_vjp_invalid_length():
+	F = lambda x: [x[0] * x[1]]
+	with pytest.raises(ValueError):
+		jvp(F, [1, 2], [1]);
+	with pytest.raises(ValueError):
+		vjp(F, [1, 2], [1, 1]);
+
 
 ######## TESTING NEWTON ROOT FINDING METHOD Newton()
    
@@ -180,4 +264,92 @@ def test_Mini_GD_output_f_root_value():
     
 def test_Mini_GD_output_n_iter():
 	F3 = lambda x:[100*(x[1]-x[0]*x[0])*(x[1]-x[0]*x[0]) + (1-x[0])*(1-x[0])]
-	assert np.isclose(Mini(F3, [1, 0.9], method = "gradient-descent")['number of iter'], 5000);
\ No newline at end of file
+	assert np.isclose(Mini(F3, [1, 0.9], method = "gradient-descent")['number of iter'], 5000);
+## Trace
+
+def test_Mini_trace_all():
+	F3 = lambda x:[(x[0]-1)*(x[0]-1) + 10*(x[1]-x[0])*(x[1]-x[0])]
+	for method in ("newton", "quasi-newton-BFGS", "gradient-descent"):
+		result = Mini(F3, [0, 0.5], method = method, max_iter_GD = 40, rate = 0.01)
+		assert result['trace'].shape == (result['number of iter'] + 1, 2)
+		assert np.allclose(result['trace'][0], [0, 0.5]) and np.allclose(result['trace'][-1], result['x_min'])
+
+def test_Mini_trace_last():
+	F3 = lambda x:[(x[0]-1)*(x[0]-1) + 10*(x[1]-x[0])*(x[1]-x[0])]
+	full = Mini(F3, [0, 0.5], method = "gradient-descent", max_iter_GD = 40, rate = 0.01)
+	last = Mini(F3, [0, 0.5], method = "gradient-descent", max_iter_GD = 40, rate = 0.01, trace = 7)
+	assert np.array_equal(last['trace'], full['trace'][-7:]) and np.array_equal(last['x_min'], full['x_min'])
+	assert Mini(F3, [0, 0.5], method = "gradient-descent", max_iter_GD = 3, trace = 7)['trace'].shape == (4, 2)
+
+def test_Mini_trace_none():
+	F3 = lambda x:[(x[0]-1)*(x[0]-1) + 10*(x[1]-x[0])*(x[1]-x[0])]
+	result = Mini(F3, [0, 0.5], method = "newton", trace = False)
+	assert result['trace'] is None and np.allclose(result['x_min'], [1, 1])
+
+def test_Mini_trace_valid():
+	F3 = lambda x:[(x[0]-1)*(x[0]-1) + 10*(x[1]-x[0])*(x[1]-x[0])]
+	for trace in (0, -2, 2.5, "all"):
+		with pytest.raises(ValueError):
+			Mini(F3, [0, 0.5], trace = trace)
+	with pytest.raises(ValueError):
+		Mini(F3, [0, 0.5], trace = False, plot = True)
+
+## Registry
+
+def test_J_F_hessian_keeps_registry():
+	from hotAD.AutoDiffObject import registry
+	before = len(registry)
+	F = lambda x: [sum(v * v for v in x)]
+	assert np.allclose(J_F(F, list(range(300)), H = True)[2], 2 * np.eye(300))
+	assert len(registry) == before
+	x = AutoDiff(1.0, "jfregistry")
+	assert x._grad.shape[0] == before + 1 and (x * x).der['jfregistry'] == 2
+
+## Parameters read by F
+
+SHIFT = 2.0
+
+def shifted_root(x):
+	return [x[0] - SHIFT, x[1] - 1]
+
+def shifted_bowl(x):
+	return [(x[0] - SHIFT) * (x[0] - SHIFT) + x[1] * x[1]]
+
+def test_Newton_Mini_parameter_change():
+	global SHIFT
+	try:
+		for SHIFT in (2.0, 3.0, 5.0):
+			assert np.allclose(Newton(shifted_root, [0.5, 0.5])['x_min: '], [SHIFT, 1])
+			assert np.allclose(Mini(shifted_bowl, [0.5, 0.5], method = "newton")['x_min'], [SHIFT, 0])
+			assert np.allclose(Mini(shifted_bowl, [0.5, 0.5])['x_min'], [SHIFT, 0], atol = 1e-4)
+	finally:
+		SHIFT = 2.0
+
+def test_Newton_Mini_compile_after(monkeypatch):
+	from hotAD.ADfun import _COMPILE_AFTER
+	from hotAD.CodeGen import compiled
+	calls = []
+	def F(x):
+		calls.append(1)
+		return [x[0] * x[0], x[1] + x[0]]
+	#J_F at the first iterates, one trace, then generated code only
+	i = Newton(F, [0.2, 0.1])["number of iter: "]
+	assert i > _COMPILE_AFTER and len(calls) == 1 + _COMPILE_AFTER + 1
+	#tapes over the limit are never compiled
+	monkeypatch.setattr("hotAD.ADfun._COMPILE_NODES", 1)
+	del calls[:]
+	assert Newton(F, [0.2, 0.1])["number of iter: "] == i
+	assert len(calls) == 1 + _COMPILE_AFTER + 1 + (i + 1 - _COMPILE_AFTER)
+	monkeypatch.undo()
+	#gradients are replayed on the tape, and the code kept with cache = True is
+	#used from the first iterate of the next call
+	def G(x):
+		calls.append(1)
+		return [(x[0] - 1) * (x[0] - 1) + x[1] * x[1] * x[1] * x[1]]
+	del calls[:]
+	result = Mini(G, [0.5, 0.5], method = "gradient-descent", max_iter_GD = 50, rate = 0.01, cache = True)
+	assert len(calls) == 2 and compiled(G).compiles == 1
+	assert np.allclose(result["Jacobian F(x_min)"], [2 * (result["x_min"][0] - 1), 4 * result["x_min"][1]**3])
+	del calls[:]
+	Mini(G, [0.5, 0.5], method = "gradient-descent", max_iter_GD = 50, rate = 0.01, cache = True)
+	assert len(calls) == 0 and compiled(G).compiles == 1
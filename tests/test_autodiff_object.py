@@ -1,7 +1,10 @@
 # Tests for AutoDiffObject.py
+import functools
+import itertools
+import operator
 import numpy as np
 import pytest
-from hotAD.AutoDiffObject import AutoDiff
+from hotAD.AutoDiffObject import AutoDiff, VariableRegistry, registry, _hess_chain, _hess_combine, _hess_outer
 from hotAD.ElementaryFunctions import ElementaryFunctions as ef
 
 # Input args
@@ -17,9 +20,9 @@ def test_autodiff_hessian_args():
 	with pytest.raises(TypeError):
 		assert AutoDiff(5, 'x', H=3)
 
-def test_autodiff_variable_name_args():
-	with pytest.raises(TypeError):
-		assert AutoDiff(6, 'xy', H=True)
+def test_autodiff_variable_name_multichar():
+	xy = AutoDiff(6, 'xy', H=True)
+	assert xy.der['xy'] == 1
 
 def test_autodiff_variable_name_args_notAlpha_space():
 	with pytest.raises(TypeError):
@@ -137,3 +140,260 @@ def test_autodiff_sub_illegal_args():
 
 
 
+
+def test_autodiff_rsub():
+	a = AutoDiff(10, "a")
+	f = 3 - a
+	assert f.val == -7 and f.der['a'] == -1
+
+# Tangent vector storage
+def test_autodiff_grad_is_float_array():
+	a = AutoDiff(3, "a")
+	b = AutoDiff(1.5, "b")
+	f = a*b + a
+	assert f._grad.dtype == np.float64
+
+def test_autodiff_der_view_unused_variable():
+	a = AutoDiff(3, "a")
+	b = AutoDiff(1.5, "b")
+	f = a*a
+	assert f.der['b'] == 0
+
+def test_autodiff_der_view_unknown_variable():
+	a = AutoDiff(3, "a")
+	with pytest.raises(KeyError):
+		assert a.der['unregistered']
+
+# Variable registry
+def test_registry_index_stable():
+	a = AutoDiff(1, "alpha")
+	b = AutoDiff(2, "alpha")
+	assert registry.index("alpha") == registry.index("alpha")
+	assert a == AutoDiff(1, "alpha") and (a*b).der['alpha'] == 3
+
+def test_registry_names():
+	reg = VariableRegistry()
+	assert reg.index("speed") == 0 and reg.index("x") == 1
+	assert reg.name(0) == "speed" and "x" in reg and len(reg) == 2
+
+def test_autodiff_der2_tuple_keys():
+	a = AutoDiff(3, "alpha", H=True)
+	b = AutoDiff(1.5, "beta", H=True)
+	f = a*a*b
+	assert f.der2[('alpha', 'beta')] == f.der2[('beta', 'alpha')] == 6.0
+
+# Sparse symmetric Hessian storage
+def test_autodiff_hessian_skips_structural_zeros():
+	a = AutoDiff(3, "a", H=True)
+	b = AutoDiff(1.5, "b", H=True)
+	f = a*a + b*b
+	assert sorted(f._hess) == sorted([(registry.index("a"),)*2, (registry.index("b"),)*2])
+
+def test_autodiff_hessian_one_entry_per_pair():
+	a = AutoDiff(3, "a", H=True)
+	b = AutoDiff(1.5, "b", H=True)
+	f = a*b
+	assert len(f._hess) == 1 and f.der2[('a', 'b')] == 1
+
+# Batched AutoDiff: one object evaluated at N points
+def test_autodiff_batch_matches_pointwise():
+	xs, ys = np.array([0.5, 1.0, 2.0]), np.array([3.0, -1.0, 4.0])
+	x = AutoDiff(xs, "x", H=True)
+	y = AutoDiff(ys, "y", H=True)
+	f = (x*y - 2/x + y/x - 1) * x
+	for k in range(3):
+		xk = AutoDiff(xs[k], "x", H=True)
+		yk = AutoDiff(ys[k], "y", H=True)
+		g = (xk*yk - 2/xk + yk/xk - 1) * xk
+		assert np.isclose(f.val[k], g.val)
+		assert np.isclose(f.der['x'][k], g.der['x']) and np.isclose(f.der['y'][k], g.der['y'])
+		assert np.isclose(f.der2['x'][k], g.der2['x']) and np.isclose(f.der2[('x', 'y')][k], g.der2[('x', 'y')])
+
+def test_autodiff_batch_with_scalar_variable():
+	x = AutoDiff(np.array([1.0, 2.0]), "x")
+	c = AutoDiff(3, "c")
+	f = c*x + x*c
+	assert np.allclose(f.der['x'], [6, 6]) and np.allclose(f.der['c'], [2, 4])
+
+def test_autodiff_batch_der_shape():
+	x = AutoDiff(np.array([1.0, 2.0, 3.0]), "x")
+	assert x.der['x'].shape == (3,) and x._grad.shape[1] == 3
+
+def test_autodiff_batch_zero_division():
+	x = AutoDiff(np.array([1.0, 0.0]), "x")
+	with pytest.raises(ZeroDivisionError):
+		1/x
+
+def test_autodiff_batch_value_type():
+	with pytest.raises(TypeError):
+		AutoDiff(np.array([[1.0, 2.0]]), "x")
+
+# In-place methods
+def test_autodiff_inplace_matches_out_of_place():
+	x, y = AutoDiff(1.5, "x", H=True), AutoDiff(-0.5, "y", H=True)
+	s, t = x*y, x*y
+	s.add_inplace(ef.sin(x)); t = t + ef.sin(x)
+	s.sub_inplace(y*y); t = t - y*y
+	s.mul_inplace(x + y); t = t * (x + y)
+	s.mul_inplace(3); t = t * 3
+	s.add_inplace(2); t = t + 2
+	assert s.val == t.val and s.der == t.der and s.der2 == t.der2
+
+def test_autodiff_inplace_alias():
+	x = AutoDiff(2, "x", H=True)
+	s = x*x
+	a = s
+	assert s.add_inplace(x) is s
+	s.mul_inplace(x)
+	assert a.val == 12 and a.der['x'] == 16
+
+def test_autodiff_inplace_shared_storage():
+	x = AutoDiff(2, "x", H=True)
+	y = AutoDiff(3, "y", H=True)
+	s = x*x
+	u = s + 1.0
+	s.add_inplace(x*y)
+	assert u.der['x'] == 4 and u.der['y'] == 0 and u.der2[('x', 'y')] == 0
+	assert s.der['y'] == 2 and s.der2[('x', 'y')] == 1
+
+def test_autodiff_inplace_self():
+	x = AutoDiff(3, "x", H=True)
+	s = x*x
+	s.add_inplace(s)
+	assert s.val == 18 and s.der['x'] == 12 and s.der2['x'] == 4
+	s.sub_inplace(s)
+	assert s.val == 0 and s.der['x'] == 0
+	p = x*x
+	p.mul_inplace(p)
+	assert p.val == 81 and p.der['x'] == 108 and p.der2['x'] == 108
+
+def test_autodiff_inplace_batch():
+	x = AutoDiff(np.array([1.0, 2.0]), "x", H=True)
+	c = AutoDiff(3, "c", H=True)
+	s, t = c*c, c*c
+	s.add_inplace(x*c); t = t + x*c
+	s.mul_inplace(x); t = t * x
+	assert np.allclose(s.val, t.val) and np.allclose(s.der['x'], t.der['x'])
+	assert np.allclose(s.der['c'], t.der['c']) and np.allclose(s.der2[('x', 'c')], t.der2[('x', 'c')])
+
+def test_autodiff_inplace_illegal_leaves_value():
+	x = AutoDiff(1.0, "x", H=True)
+	s = x*x
+	for method in (s.add_inplace, s.sub_inplace, s.mul_inplace):
+		for other in (AutoDiff(2.0, "y"), "two"):
+			with pytest.raises(AttributeError):
+				method(other)
+	assert s.val == 1.0 and s.der == {'x': 2.0} and s.der2 == {'x': 2.0}
+
+# Augmented assignment keeps value semantics
+def test_autodiff_augmented_assignment_alias():
+	x = AutoDiff(2, "x", H=True)
+	s = x*x
+	a = s
+	s += x
+	s *= x
+	s -= 1
+	assert a.val == 4 and a.der['x'] == 4 and a.der2['x'] == 2
+	assert s.val == 11 and s.der['x'] == 16
+
+def test_autodiff_augmented_assignment_reduce():
+	x, y = AutoDiff(1.0, "x"), AutoDiff(2.0, "y")
+	terms = [x*y, x]
+	total = functools.reduce(operator.iadd, terms)
+	assert total.val == 3.0 and terms[0].val == 2.0 and terms[0].der['x'] == 2.0
+
+def test_autodiff_augmented_assignment_accumulate():
+	x, y = AutoDiff(1.0, "x"), AutoDiff(2.0, "y")
+	a = x*y
+	partial = list(itertools.accumulate([a, x, y], operator.iadd))
+	assert [p.val for p in partial] == [2.0, 3.0, 5.0] and a.val == 2.0
+
+# Power operator
+def test_autodiff_pow_integer():
+	x, y = AutoDiff(1.5, "x", H=True), AutoDiff(-0.5, "y", H=True)
+	for f, g in (((x*y) ** 3, x*y*x*y*x*y), ((x*y) ** -2, 1/(x*y*x*y)), ((x+y) ** 1, x+y)):
+		assert np.isclose(f.val, g.val)
+		for key in ('x', 'y'):
+			assert np.isclose(f.der[key], g.der[key]) and np.isclose(f.der2[key], g.der2[key])
+		assert np.isclose(f.der2[('x', 'y')], g.der2[('x', 'y')])
+
+def test_autodiff_pow_zero_base():
+	x = AutoDiff(0, "x", H=True)
+	f = x ** 2
+	assert f.val == 0 and f.der['x'] == 0 and f.der2['x'] == 2
+	g = x ** 0
+	assert g.val == 1 and g.der['x'] == 0 and g.der2['x'] == 0
+	with pytest.raises(ZeroDivisionError):
+		x ** -1
+
+def test_autodiff_pow_fractional():
+	x = AutoDiff(4, "x", H=True)
+	f, g = x ** 0.5, ef.sqrt(x)
+	assert np.isclose(f.val, g.val) and np.isclose(f.der['x'], g.der['x']) and np.isclose(f.der2['x'], g.der2['x'])
+	with pytest.raises(ValueError):
+		(-x) ** 0.5
+
+def test_autodiff_pow_autodiff_exponent():
+	x, y = AutoDiff(1.5, "x", H=True), AutoDiff(0.5, "y", H=True)
+	f, g = (x*y) ** (x+y), ef.exp((x+y) * ef.log(x*y))
+	assert np.isclose(f.val, g.val)
+	for key in ('x', 'y', ('x', 'y')):
+		assert np.isclose(f.der2[key], g.der2[key])
+	with pytest.raises(ValueError):
+		(-x) ** y
+
+def test_autodiff_rpow():
+	x = AutoDiff(1.5, "x", H=True)
+	f, g = 2 ** (x*x), ef.exp(x*x*np.log(2))
+	assert np.isclose(f.val, g.val) and np.isclose(f.der['x'], g.der['x']) and np.isclose(f.der2['x'], g.der2['x'])
+	with pytest.raises(ValueError):
+		(-2) ** x
+
+def test_autodiff_pow_batch():
+	x = AutoDiff(np.array([0.5, 2.0, 3.0]), "x", H=True)
+	for f, g in ((x ** 3, x*x*x), (x ** -1.5, 1/(x*ef.sqrt(x))), (x ** x, ef.exp(x*ef.log(x)))):
+		assert np.allclose(f.val, g.val) and np.allclose(f.der['x'], g.der['x']) and np.allclose(f.der2['x'], g.der2['x'])
+
+def test_autodiff_pow_illegal_arg():
+	with pytest.raises(AttributeError):
+		AutoDiff(2, "x") ** "three"
+
+# Internal results
+def test_autodiff_slots():
+	x = AutoDiff(2, "x", H=True)
+	f = x * x
+	assert not hasattr(f, "__dict__")
+	with pytest.raises(AttributeError):
+		f.name = "f"
+
+def test_autodiff_new():
+	x = AutoDiff(2, "x")
+	f = AutoDiff._new(3.0, 2 * x._grad)
+	assert f.val == 3.0 and f.der['x'] == 2 and f.varName == "dummy" and not f.H
+	g = AutoDiff._new(3.0, 2 * x._grad, {})
+	assert g.H and g.der2 == {} and g == AutoDiff(3.0, "dummy", {'x': 2.0}, {}, H=True)
+
+def test_hess_chain_matches_combine():
+	rng = np.random.RandomState(0)
+	for k in (3, 16, 40):
+		a = rng.randn(k) * (rng.rand(k) < 0.6)
+		hess = {(i, j): rng.randn() for i in range(k) for j in range(i, k) if rng.rand() < 0.3}
+		for d2 in (-1.5, 0.0):
+			chained = _hess_chain(hess, a, 0.7, d2)
+			expected = _hess_combine((0.7, hess), (d2, _hess_outer(a)))
+			assert all(np.isclose(chained.get(key, 0.0), expected.get(key, 0.0)) for key in set(chained) | set(expected))
+
+def test_hess_chain_batch():
+	a = np.array([[1.0, 2.0], [0.0, 3.0]])
+	d1, d2 = np.array([2.0, 0.5]), np.array([1.0, -1.0])
+	chained = _hess_chain({(0, 1): np.array([1.0, 1.0])}, a, d1, d2)
+	assert np.allclose(chained[(0, 0)], [1.0, -4.0]) and np.allclose(chained[(1, 1)], [0.0, -9.0])
+	assert np.allclose(chained[(0, 1)], [2.0, -5.5])
+
+def test_autodiff_chain():
+	x = AutoDiff(0.5, "x", H=True)
+	y = AutoDiff(2.0, "y", H=True)
+	u = x * y
+	f, g = u._chain(np.sin(u.val), np.cos(u.val), -np.sin(u.val)), ef.sin(u)
+	assert f == g
+	assert not AutoDiff(0.5, "x")._chain(1.0, 2.0, 3.0).H
@@ -0,0 +1,87 @@
+# Tests for CodeGen.py
+import gc
+import weakref
+import numpy as np
+import pytest
+from hotAD.CodeGen import CompiledFunction, compiled, generate_source
+from hotAD.ReverseAD import Tape
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F
+
+# Every recorded operation, with constant operands on either side
+F_all = lambda x: [x[0]*x[1] - x[1]/x[2] + 2/x[0] - (-x[2]) + ef.power(x[0], 3) + ef.power(2, x[1]) + ef.power(x[0], x[2])
+	+ ef.sin(x[0])*ef.cos(x[1]) + ef.tan(x[2]) + ef.log(x[1]) + ef.exp(x[2]*x[0]) + ef.sqrt(x[2])
+	+ ef.logit(x[0]) + ef.arcsin(x[0]/4) + ef.arccos(x[1]/5) + ef.arctan(x[0]*x[1])]
+
+def test_codegen_matches_j_f():
+	G = CompiledFunction(F_all)
+	for x in ([0.5, 1.5, 0.7], [1.2, 0.4, 1.1], [0.3, 2.0, 0.2]):
+		val, Jac, H = G.jacobian(x, H = True)
+		ref = J_F(F_all, x, H = True)
+		assert np.allclose(val, ref[0]) and np.allclose(Jac, ref[1]) and np.allclose(H, ref[2])
+	assert G.traces == 1 and G.compiles == 1 and G.runs == 2
+
+def test_codegen_vector_jacobian():
+	F = lambda x: [x[0]*x[1], x[1] - 3, x[0]]
+	G = CompiledFunction(F)
+	for x in ([1, 2], [3, -1]):
+		val, Jac = G.jacobian(x)
+		ref = J_F(F, x)
+		assert np.allclose(val, ref[0]) and np.allclose(Jac, ref[1])
+	assert G.runs == 1
+
+def test_codegen_guard_retraces():
+	F = lambda x: [x[0] * x[1] if x[0] < x[1] else x[0] + x[1]]
+	G = CompiledFunction(F)
+	for x in ([1, 2], [1.5, 3], [4, 2], [5, 1]):
+		assert np.allclose(G.jacobian(x)[1], J_F(F, x)[1])
+	assert G.traces == 2 and G.runs == 2
+
+def test_codegen_domain_error():
+	G = CompiledFunction(lambda x: [ef.log(x[0])])
+	G.jacobian([1])
+	with pytest.raises(ValueError):
+		G.jacobian([-1])
+
+def test_codegen_values_read_not_compiled():
+	G = CompiledFunction(lambda x: [x[0] * x[0] if x[0].val > 1 else -x[0]])
+	G.jacobian([2])
+	assert G.jacobian([0.5])[1][0, 0] == -1 and G.compiles == 0
+
+def test_codegen_source():
+	tape = Tape()
+	x, y = tape.variables([2, 3])
+	source = generate_source(tape, [ef.sin(x) * y])
+	assert "sin(v0)" in source and "AutoDiff" not in source and "tape" not in source
+
+def test_codegen_banded_hessian():
+	def F(x):
+		s = 0
+		for i in range(len(x) - 1):
+			s = s + x[i] * x[i+1] + ef.sin(x[i]) * x[i] + (x[i] - x[i+1]) * (x[i] - x[i+1])
+		return [s]
+	x = [0.1 * i for i in range(30)]
+	G = CompiledFunction(F)
+	G.jacobian(x, H = True)
+	val, Jac, H = G.jacobian(x[::-1], H = True)
+	ref = J_F(F, x[::-1], H = True)
+	assert G.runs == 1 and np.allclose(val, ref[0]) and np.allclose(Jac, ref[1]) and np.allclose(H, ref[2])
+
+def test_codegen_nonzero_entries():
+	tape = Tape()
+	x = tape.variables([1, 2, 3, 4])
+	namespace = {}
+	exec(generate_source(tape, [x[0] * x[1] + x[3] * x[3]], H = True), namespace)
+	result = namespace["traced"]([1.0, 2.0, 3.0, 4.0])
+	assert namespace["traced"].jacobian_index == ([0, 0, 0], [0, 1, 3])
+	assert result[1] == [2.0, 1.0, 8.0] and len(result[2]) == len(namespace["traced"].hessian_index[0]) == 3
+
+def test_compiled_cache():
+	F = lambda x: [x[0] ** 2]
+	G = compiled(F)
+	G.jacobian([1])
+	assert compiled(F) is G and compiled(lambda x: [x[0] ** 2]) is not G
+	ref = weakref.ref(F)
+	del F, G
+	gc.collect()
+	assert ref() is None
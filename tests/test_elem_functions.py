@@ -40,7 +40,7 @@ def test_sin_deriv2_xy():
 	x = AutoDiff(4, "x", H=True)
 	y = AutoDiff(5, "y", H=True)
 	f = ef.sin(x*y)
-	assert np.isclose(f.der2['xy'], -17.85082295273916);
+	assert np.isclose(f.der2[('x', 'y')], -17.85082295273916);
 
 def test_sin_no_sec_derivative_():
 	x = AutoDiff(4, "x")
@@ -59,9 +59,9 @@ def test_sin_illegal_arg():
 	with pytest.raises(AttributeError):
 		assert ef.sin("thirty");
 
-def test_illegal_len_varname():
-	with pytest.raises(TypeError):
-		assert AutoDiff(4, "variable1")
+def test_long_varname():
+	f = ef.sin(AutoDiff(4, "variable1"))
+	assert np.isclose(f.der['variable1'], np.cos(4))
 
 def test_numeric_value():
 	assert np.isclose(ef.sin(4), np.sin(4))
@@ -101,7 +101,7 @@ def test_cos_deriv2_xy():
 	x = AutoDiff(4, "x", H=True)
 	y = AutoDiff(5, "y", H=True)
 	f = ef.cos(x*y)
-	assert np.isclose(f.der2['xy'], -9.074586486995466);
+	assert np.isclose(f.der2[('x', 'y')], -9.074586486995466);
 
 def test_cos_no_sec_derivative_():
 	x = AutoDiff(4, "x")
@@ -164,7 +164,7 @@ def test_tan_deriv2_xy():
 	x = AutoDiff(4, "x", H=True)
 	y = AutoDiff(5, "y", H=True)
 	f = ef.tan(x*x*y*y)
-	assert np.isclose(f.der2['xy'], 376002.08725162304);
+	assert np.isclose(f.der2[('x', 'y')], 376002.08725162304);
 
 def test_tan_no_sec_derivative():
 	x = AutoDiff(4, "x")
@@ -175,7 +175,7 @@ def test_tan_no_sec_derivative_xy():
 	x = AutoDiff(4, "x")
 	y = AutoDiff(5, "y")
 	with pytest.raises(AttributeError):
-		assert ef.tan(x*y).der2['xy'];
+		assert ef.tan(x*y).der2[('x', 'y')];
 
 def test_tan_numeric_input_no_val():
 	with pytest.raises(AttributeError):
@@ -227,7 +227,7 @@ def test_power_deriv2_xy():
 	x = AutoDiff(1, "x", H=True)
 	y = AutoDiff(2, "y", H=True)
 	f = ef.power(x*y, x*y)
-	assert np.isclose(f.der2['xy'], 33.70656772254452);
+	assert np.isclose(f.der2[('x', 'y')], 33.70656772254452);
 
 def test_power_val2():
 	x = AutoDiff(1, "x")
@@ -263,7 +263,7 @@ def test_power_deriv2_xy2():
 	x = AutoDiff(1, "x", H=True)
 	y = AutoDiff(2, "y", H=True)
 	f = ef.power(x*y, 3)
-	assert np.isclose(f.der2['xy'], 36);
+	assert np.isclose(f.der2[('x', 'y')], 36);
 
 def test_power_val3():
 	x = AutoDiff(1, "x")
@@ -299,7 +299,7 @@ def test_power_deriv2_xy3():
 	x = AutoDiff(1, "x", H=True)
 	y = AutoDiff(2, "y", H=True)
 	f = ef.power(3, x*y)
-	assert np.isclose(f.der2['xy'], 31.612591892639465);
+	assert np.isclose(f.der2[('x', 'y')], 31.612591892639465);
 
 def test_power_no_sec_derivative():
 	x = AutoDiff(4, "x")
@@ -311,7 +311,7 @@ def test_power_no_sec_derivative_xy():
 	x = AutoDiff(4, "x")
 	y = AutoDiff(5, "y")
 	with pytest.raises(AttributeError):
-		assert ef.power(x*y,x*y).der2['xy'];
+		assert ef.power(x*y,x*y).der2[('x', 'y')];
 
 def test_power_numeric_input_no_val():
 	with pytest.raises(AttributeError):
@@ -383,7 +383,7 @@ def test_log_deriv2_xy():
 	x = AutoDiff(4, "x", H=True)
 	y = AutoDiff(5, "y", H=True)
 	f = ef.log(x*x*y*y)
-	assert np.isclose(f.der2['xy'], 0);
+	assert np.isclose(f.der2[('x', 'y')], 0);
 
 def test_log_no_sec_derivative_():
 	x = AutoDiff(4, "x")
@@ -446,7 +446,7 @@ def test_exp_deriv2_xy():
 	x = AutoDiff(0.5, "x", H=True)
 	y = AutoDiff(1.1, "y", H=True)
 	f = ef.exp(x*x*y*y)
-	assert np.isclose(f.der2['xy'], 3.877702561784869);
+	assert np.isclose(f.der2[('x', 'y')], 3.877702561784869);
 
 def test_exp_no_sec_derivative_():
 	x = AutoDiff(4, "x")
@@ -514,7 +514,7 @@ def test_sqrt_deriv2_xy():
 	x = AutoDiff(1.5, "x", H=True)
 	y = AutoDiff(2.5, "y", H=True)
 	f = ef.sqrt(x*x*y*y)
-	assert np.isclose(f.der2['xy'], 1.0);
+	assert np.isclose(f.der2[('x', 'y')], 1.0);
 
 def test_sqrt_no_sec_derivative():
 	x = AutoDiff(4, "x")
@@ -581,7 +581,7 @@ def test_logit_deriv2_xy():
 	x = AutoDiff(1.1, "x", H=True)
 	y = AutoDiff(2.2, "y", H=True)
 	f = ef.logit(x*x*y*y)
-	assert np.isclose(f.der2['xy'], -0.1328331881720229);
+	assert np.isclose(f.der2[('x', 'y')], -0.1328331881720229);
 
 def test_logit_no_sec_derivative_():
 	x = AutoDiff(4, "x")
@@ -614,8 +614,8 @@ def test_logit_numeric_value():
 def test_arcsin_val_error():
 	x = AutoDiff(1.1, "x")
 	y = AutoDiff(2.2, "y")
-	with pytest.warns(RuntimeWarning):
-		assert ef.arcsin(x*x*y*y);
+	with pytest.raises(RuntimeWarning):
+		ef.arcsin(x*x*y*y);
 
 def test_arcsin_val():
 	x = AutoDiff(0.5, "x")
@@ -651,7 +651,7 @@ def test_logit_deriv2_xy():
 	x = AutoDiff(0.5, "x", H=True)
 	y = AutoDiff(0.6, "y", H=True)
 	f = ef.arcsin(x*x*y*y)
-	assert np.isclose(f.der2['xy'], 1.2147290303591283);
+	assert np.isclose(f.der2[('x', 'y')], 1.2147290303591283);
 
 def test_arcsin_no_sec_derivative_():
 	x = AutoDiff(0.5, "x")
@@ -688,8 +688,8 @@ def test_arcsin_illegal_arg2():
 def test_arccos_val_error():
 	x = AutoDiff(1.1, "x")
 	y = AutoDiff(2.2, "y")
-	with pytest.warns(RuntimeWarning):
-		assert ef.arccos(x*x*y*y);
+	with pytest.raises(RuntimeWarning):
+		ef.arccos(x*x*y*y);
 
 def test_arccos_val():
 	x = AutoDiff(0.5, "x")
@@ -725,7 +725,7 @@ def test_arccos_deriv2_xy():
 	x = AutoDiff(0.5, "x", H=True)
 	y = AutoDiff(0.6, "y", H=True)
 	f = ef.arccos(x*x*y*y)
-	assert np.isclose(f.der2['xy'], -1.2147290303591283);
+	assert np.isclose(f.der2[('x', 'y')], -1.2147290303591283);
 
 def test_arccos_no_sec_derivative_():
 	x = AutoDiff(0.2, "x")
@@ -792,7 +792,7 @@ def test_arctan_deriv2_xy():
 	x = AutoDiff(0.5, "x", H=True)
 	y = AutoDiff(0.6, "y", H=True)
 	f = ef.arctan(x*x*y*y)
-	assert np.isclose(f.der2['xy'], 1.1712292419301682);
+	assert np.isclose(f.der2[('x', 'y')], 1.1712292419301682);
 
 def test_arctan_no_sec_derivative_():
 	x = AutoDiff(4, "x")
@@ -835,3 +835,158 @@ def test_arctan_numeric_value():
 # 70-80% coverage
 # need doctests and docstrings
 # for regular ad objects: multiple examples and edge cases
+
+# batched evaluation of every elementary function
+def test_batch_elementary_functions():
+	xs = np.array([0.1, 0.3, 0.6])
+	fns = [ef.sin, ef.cos, ef.tan, ef.log, ef.exp, ef.sqrt, ef.logit, ef.arcsin, ef.arccos, ef.arctan,
+		lambda x: ef.power(x, 3), lambda x: ef.power(2, x), lambda x: ef.power(x, x)]
+	for fn in fns:
+		f = fn(AutoDiff(xs, "x", H=True) * 1.5)
+		for k in range(3):
+			g = fn(AutoDiff(xs[k], "x", H=True) * 1.5)
+			assert np.isclose(f.val[k], g.val)
+			assert np.isclose(f.der['x'][k], g.der['x'])
+			assert np.isclose(f.der2['x'][k], g.der2['x'])
+
+def test_batch_log_domain():
+	with pytest.raises(AttributeError):
+		ef.log(AutoDiff(np.array([1.0, -1.0]), "x"))
+
+# fused reductions
+KEYS = ['x', 'y', ('x', 'y')]
+
+def test_sum_matches_add():
+	x = AutoDiff(1.5, "x", H=True)
+	y = AutoDiff(-0.5, "y", H=True)
+	terms = [x*y, ef.sin(x), 3, y*y*y]
+	f, g = ef.sum(terms), x*y + ef.sin(x) + 3 + y*y*y
+	assert np.isclose(f.val, g.val)
+	for key in KEYS:
+		assert np.isclose(f.der2[key], g.der2[key])
+	assert f.der == g.der
+
+def test_sum_numeric():
+	assert ef.sum([1, 2.5]) == 3.5 and ef.sum([]) == 0
+
+def test_sum_no_hessian():
+	x = AutoDiff(2, "x")
+	f = ef.sum([x*x, x])
+	assert f.der['x'] == 5 and not f.H
+
+def test_reductions_mixed_hessian():
+	x = AutoDiff(2, "x", H=True)
+	y = AutoDiff(3, "y")
+	for terms in ([x, y], [y, 1.0, x]):
+		with pytest.raises(AttributeError):
+			ef.sum(terms)
+		with pytest.raises(AttributeError):
+			ef.dot(terms, [1.0] * len(terms))
+		with pytest.raises(AttributeError):
+			ef.prod(terms)
+
+def test_sum_illegal_arg():
+	with pytest.raises(AttributeError):
+		ef.sum([AutoDiff(2, "x"), "thirty"])
+
+def test_dot_matches_weighted_sum():
+	x = AutoDiff(1.5, "x", H=True)
+	y = AutoDiff(-0.5, "y", H=True)
+	f, g = ef.dot([x*y, y, 2], [3, -1, 0.5]), 3*(x*y) - y + 1
+	assert np.isclose(f.val, g.val) and f.der == g.der
+	for key in KEYS:
+		assert np.isclose(f.der2[key], g.der2[key])
+
+def test_dot_length_mismatch():
+	with pytest.raises(ValueError):
+		ef.dot([AutoDiff(2, "x")], [1, 2])
+
+def test_prod_matches_mul():
+	x = AutoDiff(1.5, "x", H=True)
+	y = AutoDiff(-0.5, "y", H=True)
+	f, g = ef.prod([x, y, 2, x*y, ef.exp(y)]), x * y * 2 * (x*y) * ef.exp(y)
+	assert np.isclose(f.val, g.val)
+	for key in KEYS:
+		assert np.isclose(f.der2[key], g.der2[key])
+	assert np.isclose(f.der['x'], g.der['x']) and np.isclose(f.der['y'], g.der['y'])
+
+def test_prod_zero_factor():
+	x = AutoDiff(0, "x", H=True)
+	y = AutoDiff(3, "y", H=True)
+	f = ef.prod([x, y, x])
+	assert f.val == 0 and f.der['x'] == 0 and f.der2['x'] == 6
+
+def test_reductions_batch():
+	x = AutoDiff(np.array([0.5, 2.0, 3.0]), "x", H=True)
+	y = AutoDiff(1.5, "y", H=True)
+	for f, g in ((ef.sum([x, y, x*y]), x + y + x*y), (ef.prod([x, y, x*y]), x * y * (x*y))):
+		assert np.allclose(f.val, g.val)
+		for key in KEYS:
+			assert np.allclose(f.der2[key], g.der2[key])
+
+def test_prod_illegal_arg():
+	with pytest.raises(AttributeError):
+		ef.prod([AutoDiff(2, "x"), "thirty"])
+
+# dispatch on the type of the argument
+NAMES = ["sin", "cos", "tan", "log", "exp", "sqrt", "logit", "arcsin", "arccos", "arctan"]
+NUMPY = {"sin": np.sin, "cos": np.cos, "tan": np.tan, "log": np.log, "exp": np.exp, "sqrt": np.sqrt,
+	"logit": lambda v: 1 / (1 + np.exp(-v)), "arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan}
+
+def test_numeric_kinds_match_numpy():
+	class Real(float):
+		pass
+	values = [0.5, np.float64(0.5), np.float32(0.5), Real(0.5), 0.5 + 0j, np.array([0.25, 0.5])]
+	for name in NAMES:
+		for v in values:
+			assert np.allclose(getattr(ef, name)(v), NUMPY[name](np.real(v)))
+		assert np.isclose(getattr(ef, name)(1), NUMPY[name](1.0))
+
+def test_numeric_scalar_out_of_domain():
+	with pytest.raises(AttributeError):
+		ef.sqrt(-1.0)
+	with pytest.warns(RuntimeWarning):
+		assert ef.exp(1000.0) == np.inf
+	with pytest.raises(AttributeError):
+		ef.log(0.0)
+	with pytest.raises(AttributeError):
+		ef.sin([1.0, 2.0])
+
+def test_forward_out_of_domain():
+	for value in (-1.0, AutoDiff(-1.0, "x"), AutoDiff(-1.0, "x", H=True)):
+		with pytest.raises(AttributeError):
+			ef.sqrt(value)
+		with pytest.raises(AttributeError):
+			ef.log(value)
+	for value in (2.0, AutoDiff(2, "x"), AutoDiff(2, "x", H=True)):
+		with pytest.raises(RuntimeWarning, match=r"\[-1, 1\]"):
+			ef.arcsin(value)
+	#the error state of NumPy is left as it was
+	state = np.geterr()
+	with pytest.raises(RuntimeWarning):
+		ef.arcsin(2.0)
+	assert np.geterr() == state
+
+def test_batch_matches_pointwise():
+	xs = np.array([0.2, 0.4, 0.6])
+	for name in NAMES:
+		f = getattr(ef, name)(AutoDiff(xs, "x", H=True))
+		for i, v in enumerate(xs):
+			g = getattr(ef, name)(AutoDiff(v, "x", H=True))
+			assert np.isclose(f.val[i], g.val) and np.isclose(f.der['x'][i], g.der['x'])
+			assert np.isclose(f.der2['x'][i], g.der2['x'])
+
+def test_second_derivatives_many_variables():
+	xs = [AutoDiff(0.01 * (i + 1), "v%d" % i, H=True) for i in range(20)]
+	u = ef.sum([x * x for x in xs])
+	h = 1e-4
+	for name in NAMES:
+		f = getattr(ef, name)
+		g = f(u)
+		point = u.val
+		d1 = (NUMPY[name](point + h) - NUMPY[name](point - h)) / (2 * h)
+		d2 = (NUMPY[name](point + h) - 2 * NUMPY[name](point) + NUMPY[name](point - h)) / h**2
+		assert np.isclose(g.val, NUMPY[name](point))
+		assert np.isclose(g.der['v3'], d1 * 2 * xs[3].val)
+		assert np.isclose(g.der2['v3'], d1 * 2 + d2 * (2 * xs[3].val)**2, rtol = 1e-4)
+		assert np.isclose(g.der2[('v3', 'v17')], d2 * 4 * xs[3].val * xs[17].val, rtol = 1e-4)
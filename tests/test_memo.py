@@ -0,0 +1,131 @@
+# Tests for Memo.py
+import numpy as np
+import pytest
+from hotAD.Memo import EvaluationCache, memo
+from hotAD.Sparsity import CSRMatrix
+from hotAD.ADfun import J_F, Newton, Mini
+
+# F that counts its evaluations
+def counting():
+	calls = []
+	def F(x):
+		calls.append(1)
+		return [x[0] * x[1] + x[1], x[0] - x[1] * x[1]]
+	return F, calls
+
+# EvaluationCache
+def test_lru_eviction():
+	cache = EvaluationCache(maxsize=2)
+	keys = [cache.key([i], 1) for i in range(3)]
+	cache.put(keys[0], [np.array([0.0])])
+	cache.put(keys[1], [np.array([1.0])])
+	assert cache.get(keys[0]) is not None
+	cache.put(keys[2], [np.array([2.0])])
+	assert cache.get(keys[1]) is None and cache.get(keys[0]) is not None and len(cache) == 2
+	assert (cache.hits, cache.misses) == (2, 1)
+
+def test_resize_and_clear():
+	cache = EvaluationCache()
+	for i in range(5):
+		cache.put(cache.key([i], 1), [np.array([i])])
+	cache.resize(2)
+	assert len(cache) == 2 and cache.get(cache.key([4], 1)) is not None
+	cache.clear()
+	assert len(cache) == 0 and cache.hits == 0
+	with pytest.raises(ValueError):
+		cache.resize(-1)
+	with pytest.raises(ValueError):
+		EvaluationCache(maxsize=-1)
+
+def test_keys():
+	cache = EvaluationCache()
+	assert cache.key([1, 2], 1) == cache.key(np.array([1.0, 2.0]), 1)
+	assert cache.key([1, 2], 1) != cache.key([1, 2], 2)
+	assert cache.key([1, 2], 1, True) != cache.key([1, 2], 1, False)
+	assert cache.key([1, 2], 1) != cache.key([1, 2, 0], 1)
+	assert cache.key(["a"], 1) is None and cache.key([[1, 2]], 1) is None
+
+def test_results_are_copies():
+	cache = EvaluationCache()
+	key = cache.key([1.0], 1)
+	value = [np.array([1.0]), CSRMatrix([2.0], [0], [0, 1], (1, 1))]
+	cache.put(key, value)
+	value[0][0] = 5.0
+	first = cache.get(key)
+	first[1].data[0] = 7.0
+	second = cache.get(key)
+	assert second[0][0] == 1.0 and second[1].data[0] == 2.0
+
+def test_memo_per_function():
+	F = lambda x: [x[0]]
+	assert memo(F) is memo(F) and memo(F) is not memo(lambda x: [x[0]])
+
+def test_memo_without_weakref():
+	class G():
+		__slots__ = ()
+		def __call__(self, x):
+			return [x[0]]
+	F = G()
+	assert memo(F) is not memo(F)
+	assert J_F(F, [2])[1][0][0] == 1.0
+
+# J_F
+def test_j_f_hits():
+	F, calls = counting()
+	first = J_F(F, [1, 2], cache=True)
+	assert len(calls) == 2
+	second = J_F(F, [1, 2], cache=True)
+	assert len(calls) == 2 and memo(F).hits == 1 and memo(F).misses == 1
+	assert all(np.array_equal(a, b) for a, b in zip(first, second))
+	second[1][0, 0] = 100.0
+	assert J_F(F, [1, 2], cache=True)[1][0, 0] == first[1][0, 0]
+
+def test_j_f_new_point_evaluates_once():
+	F, calls = counting()
+	J_F(F, [1, 2], cache=True)
+	del calls[:]
+	J_F(F, [3, 4], cache=True)
+	assert len(calls) == 1
+
+def test_j_f_orders_kept_apart():
+	F = lambda x: [x[0] * x[0] * x[1]]
+	assert len(J_F(F, [1, 2], cache=True)) == 2
+	assert len(J_F(F, [1, 2], H=True, cache=True)) == 3
+	assert isinstance(J_F(F, [1, 2], sparse=True, cache=True)[1], CSRMatrix)
+	assert isinstance(J_F(F, [1, 2], H=True, sparse=True, cache=True)[2], CSRMatrix)
+	assert memo(F).hits == 0 and len(memo(F)) == 4
+
+def test_j_f_without_cache():
+	F, calls = counting()
+	J_F(F, [1, 2], cache=False)
+	J_F(F, [1, 2])
+	assert len(calls) == 4 and len(memo(F)) == 0
+
+def test_j_f_hessian_vector_function():
+	F, calls = counting()
+	with pytest.raises(ValueError):
+		J_F(F, [1, 2], H=True)
+
+# Newton and Mini check the length of F(x) once per call, and with cache=True once per function
+def test_validation_evaluates_once():
+	F, calls = counting()
+	i = Newton(F, [1.0, 1.0])["number of iter: "]
+	assert len(calls) == 1 + (i + 1) and len(memo(F)) == 0
+	Newton(F, [1.0, 1.0], cache=True)
+	del calls[:]
+	Newton(F, [1.0, 1.0], cache=True)
+	assert len(calls) == i + 1
+	G = lambda x: [(x[0] - 1) * (x[0] - 1) + x[1] * x[1]]
+	Mini(G, [0.5, 0.5], method="newton", cache=True)
+	assert memo(G).outputs == {2: 1}
+
+# Parameters read by F
+def test_parameter_change():
+	scale = [2.0]
+	F = lambda x: [scale[0] * x[0] * x[0]]
+	assert J_F(F, [1.0])[1][0, 0] == 4.0 and J_F(F, [1.0], cache=True)[1][0, 0] == 4.0
+	scale[0] = 3.0
+	assert J_F(F, [1.0])[1][0, 0] == 6.0 and J_F(F, [1.0], H=True)[2][0, 0] == 6.0
+	assert J_F(F, [1.0], sparse=True)[1].toarray()[0, 0] == 6.0
+	#cached results are keyed on x alone
+	assert J_F(F, [1.0], cache=True)[1][0, 0] == 4.0
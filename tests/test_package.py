@@ -0,0 +1,48 @@
+# Tests for __init__.py and Plot.py
+import os
+import sys
+import subprocess
+import numpy as np
+import pytest
+import hotAD
+from hotAD.AutoDiffObject import AutoDiff
+from hotAD.ElementaryFunctions import ElementaryFunctions
+from hotAD.ADfun import J_F, Mini
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(hotAD.__file__)))
+
+def fresh(code):
+	env = dict(os.environ, PYTHONPATH = ROOT)
+	return subprocess.check_output([sys.executable, "-c", code], env = env).decode().split()
+
+# Lazy public API
+def test_package_exports():
+	assert hotAD.AutoDiff is AutoDiff and hotAD.J_F is J_F and hotAD.ef is ElementaryFunctions
+	assert set(hotAD.__all__) <= set(dir(hotAD))
+	for name in hotAD.__all__:
+		assert getattr(hotAD, name) is not None
+
+def test_package_unknown_name():
+	with pytest.raises(AttributeError):
+		hotAD.plt
+
+def test_package_import_is_lazy():
+	assert fresh("import sys, hotAD; print('numpy' in sys.modules, 'hotAD.ADfun' in sys.modules)") == ["False", "False"]
+
+def test_adfun_skips_matplotlib():
+	assert fresh("import sys, hotAD; hotAD.J_F; print('matplotlib' in sys.modules)") == ["False"]
+
+def test_import_keeps_warning_filters():
+	assert fresh("import warnings, hotAD.ElementaryFunctions; print(warnings.filters[0][0])") != ["error"]
+
+# Plots
+def test_plot_trace():
+	plt = pytest.importorskip("matplotlib.pyplot")
+	plt.switch_backend("Agg")
+	F = lambda x: [(x[0] - 1)**2 + (x[1] - 2)**2]
+	result = Mini(F, [0, 0], method = "gradient-descent", max_iter_GD = 20, rate = 0.1, plot = True)
+	assert "hotAD.Plot" in sys.modules and len(plt.gca().lines) == 3
+	plt.close("all")
+	Mini(lambda x: [(x[0] - 1)**2], [0.5], method = "newton", plot = True)
+	assert len(plt.gca().lines) == 4
+	plt.close("all")
@@ -0,0 +1,208 @@
+# Tests for ReverseAD.py
+import numpy as np
+import pytest
+from hotAD.AutoDiffObject import AutoDiff, registry
+from hotAD.ReverseAD import Tape, ReverseAD, TracedFunction
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F, hvp
+
+# Forward mode reference for the same function
+def forward_gradient(F, x):
+	names = ["r{}".format(i) for i in range(len(x))]
+	return F([AutoDiff(v, name) for v, name in zip(x, names)])._gradient(registry.indices(names))
+
+def test_reverse_operators():
+	F = lambda x: (x[0] * x[1] - x[1] / x[0] + 3 - x[0]) / (2 + x[1]) * 4 - (-x[0]) + 1 / x[1]
+	tape = Tape()
+	x = tape.variables([1.5, 2.5])
+	assert np.allclose(tape.gradient(F(x)), forward_gradient(F, [1.5, 2.5]))
+
+def test_reverse_elementary_functions():
+	F = lambda x: ef.sin(x[0]) * ef.cos(x[1]) + ef.tan(x[0]) + ef.log(x[1]) + ef.exp(x[0] * x[1]) \
+		+ ef.sqrt(x[1]) + ef.logit(x[0]) + ef.arcsin(x[0]) + ef.arccos(x[0]) + ef.arctan(x[1])
+	tape = Tape()
+	x = tape.variables([0.3, 0.7])
+	f = F(x)
+	assert np.isclose(f.val, F([AutoDiff(0.3, "r0"), AutoDiff(0.7, "r1")]).val)
+	assert np.allclose(tape.gradient(f), forward_gradient(F, [0.3, 0.7]))
+
+def test_reverse_power():
+	F = lambda x: ef.power(x[0], x[1]) + ef.power(x[0], 3) + ef.power(2, x[1])
+	tape = Tape()
+	x = tape.variables([1.7, 0.6])
+	assert np.allclose(tape.gradient(F(x)), forward_gradient(F, [1.7, 0.6]))
+
+def test_reverse_reused_node():
+	tape = Tape()
+	x = tape.variable(3)
+	y = x * x
+	assert np.allclose(tape.gradient(y * y + y), [4 * 27 + 6])
+
+def test_reverse_gradient_subset():
+	tape = Tape()
+	x, y, z = tape.variables([1, 2, 3])
+	assert np.allclose(tape.gradient(x * z, [z, y]), [1, 0])
+
+def test_reverse_tape_layout():
+	tape = Tape()
+	x, y = tape.variables([2, 5])
+	f = x * y + 1
+	assert len(tape) == 5
+	assert list(tape.arg0)[2:] == [0, -1, 2] and list(tape.arg1)[2:] == [1, -1, 3]
+	assert list(tape.d0)[2:4] == [5.0, 0.0]
+
+def test_reverse_divide_by_zero():
+	tape = Tape()
+	x = tape.variable(0)
+	with pytest.raises(ZeroDivisionError):
+		1 / x
+	with pytest.raises(ZeroDivisionError):
+		tape.variable(1) / x
+
+def test_reverse_illegal_argument():
+	tape = Tape()
+	x = tape.variable(1)
+	with pytest.raises(AttributeError):
+		x * "a"
+	with pytest.raises(TypeError):
+		tape.variable("a")
+
+def test_reverse_different_tapes():
+	with pytest.raises(ValueError):
+		Tape().variable(1) + Tape().variable(2)
+
+def test_J_F_scalar_uses_reverse_mode():
+	F = lambda x: [ef.exp(x[0]) * x[1] + x[2] * x[2]]
+	val, jac = J_F(F, [0.5, 2, 3])
+	assert np.isclose(val[0], np.exp(0.5) * 2 + 9)
+	assert jac.shape == (1, 3)
+	assert np.allclose(jac[0], [np.exp(0.5) * 2, np.exp(0.5), 6])
+
+def test_J_F_scalar_constant():
+	val, jac = J_F(lambda x: [4], [1, 2])
+	assert val[0] == 4 and np.all(jac == 0)
+
+# Hessian-vector products against the forward mode Hessian
+def test_hvp_matches_hessian():
+	F = lambda x: [ef.sin(x[0] * x[1]) + ef.exp(x[1]) / x[2] + ef.power(x[0], x[2]) + ef.log(x[2]) * ef.sqrt(x[0]) \
+		+ ef.arctan(x[0]) - 3 / x[1] + ef.power(x[1], 3) + ef.power(2, x[2]) + ef.logit(x[1]) + ef.tan(x[2]) \
+		+ ef.arcsin(x[1] / 4) + ef.arccos(x[1] / 4) - ef.cos(x[0])]
+	x = [1.3, 0.7, 0.4]
+	H = J_F(F, x, H = True)[2]
+	for v in np.eye(3).tolist() + [[0.3, -1.2, 2.0]]:
+		assert np.allclose(hvp(F, x, v), H.dot(v))
+
+def test_hvp_subset_inputs():
+	tape = Tape()
+	x, y, z = tape.variables([1, 2, 3])
+	assert np.allclose(tape.hvp(x * y * z, [1, 1], [z, x]), [2, 2])
+
+def test_hvp_invalid_length():
+	with pytest.raises(ValueError):
+		hvp(lambda x: [x[0] * x[1]], [1, 2], [1])
+	with pytest.raises(ValueError):
+		hvp(lambda x: [x[0], x[1]], [1, 2], [1, 0])
+
+# Replaying a recorded tape at new inputs
+def test_replay_matches_trace():
+	F = lambda x: ef.sin(x[0] * x[1]) / x[2] + ef.power(x[0], x[2]) + ef.power(x[1], 2) + ef.power(2, x[0]) + ef.logit(x[2])
+	tape = Tape()
+	f = F(tape.variables([0.5, 1.5, 2.0]))
+	for x in ([1.0, 2.0, 3.0], [0.2, -0.7, 0.4]):
+		assert tape.replay(x)
+		ref = Tape()
+		g = F(ref.variables(x))
+		assert np.isclose(tape.value(f), ref.value(g))
+		assert np.allclose(tape.gradient(f), ref.gradient(g))
+		assert np.allclose(tape.hvp(f, [1, 2, 3]), ref.hvp(g, [1, 2, 3]))
+
+def test_replay_refused():
+	tape = Tape()
+	x, y = tape.variables([1, 2])
+	f = x / y + ef.log(x)
+	assert not tape.replay([1, 0]) and not tape.replay([-1, 2])
+	assert not tape.replay([1])
+
+def test_replay_guards():
+	tape = Tape()
+	x = tape.variable(2)
+	f = x * x if x > 1 else -x
+	assert tape.guards == [(">", 0, 1, True)]
+	assert tape.replay([3]) and not tape.replay([0.5])
+
+def test_replay_values_read():
+	tape = Tape()
+	x = tape.variable(2)
+	f = x * x if x.val > 1 else -x
+	assert tape.values_read and not tape.replay([3])
+
+def test_traced_function():
+	F = lambda x: [x[0] * x[1] if x[0] < x[1] else x[0] + x[1], ef.exp(x[0])]
+	G = TracedFunction(F)
+	for x in ([1, 2], [1.5, 3], [4, 2], [5, 1]):
+		val, Jac = G.jacobian(x)
+		ref = J_F(F, x)
+		assert np.allclose(val, ref[0]) and np.allclose(Jac, ref[1])
+	assert G.traces == 2 and G.replays == 2
+
+def test_traced_function_hessian():
+	F = lambda x: [ef.sin(x[0]) * x[1] * x[1] + x[2] / x[0]]
+	G = TracedFunction(F)
+	for x in ([1, 2, 3], [0.5, -1, 2]):
+		val, Jac, H = G.jacobian(x, H = True)
+		ref = J_F(F, x, H = True)
+		assert np.allclose(val, ref[0]) and np.allclose(Jac, ref[1]) and np.allclose(H, ref[2])
+	assert G.replays == 1
+
+def test_traced_function_tall_jacobian():
+	F = lambda x: [x[0], x[0] * x[0], ef.sin(x[0])]
+	val, Jac = TracedFunction(F).jacobian([0.5])
+	assert np.allclose(Jac[:, 0], [1, 1, np.cos(0.5)])
+	with pytest.raises(ValueError):
+		TracedFunction(F).jacobian([0.5], H = True)
+
+def test_reverse_domain_errors():
+	tape = Tape()
+	with pytest.raises(ValueError):
+		ef.log(tape.variable(-1))
+	with pytest.raises(ValueError):
+		ef.power(tape.variable(-1), tape.variable(2))
+
+# Common subexpression elimination
+def test_reverse_cse_merges_repeats():
+	tape = Tape()
+	x, y = tape.variables([2, 3])
+	f = (x * y + 1) * (y * x + 1)
+	assert len(tape) == 6 and tape.deduplicated == 3
+	assert np.allclose(tape.gradient(f), [2 * 7 * 3, 2 * 7 * 2])
+
+def test_reverse_cse_off():
+	F = lambda x: (x[0] * x[0] - x[1]) * (x[0] * x[0] - x[1]) + ef.sin(x[0] * x[0])
+	tapes = [Tape(), Tape(cse = False)]
+	grads = [tape.gradient(F(tape.variables([0.5, 2])), None) for tape in tapes]
+	assert len(tapes[0]) < len(tapes[1]) and tapes[1].deduplicated == 0
+	assert np.allclose(grads[0], grads[1])
+
+# Constant folding, identities and pruning
+def test_reverse_identities():
+	tape = Tape()
+	x = tape.variable(3)
+	assert (x * 1).index == (1 * x).index == (x + 0).index == (x - 0).index == (x / 1).index == (x ** 1).index == x.index
+	zero = x * 0
+	assert tape.value(zero) == 0 and tape.op[zero.index] == 1 and tape.simplified == 7
+
+def test_reverse_constant_folding():
+	tape = Tape()
+	x = tape.variable(0.5)
+	c = x * 0 + 2
+	f = ef.sin(c) * x + c ** 2
+	assert len(tape) == 7 and np.isclose(tape.gradient(f)[0], np.sin(2))
+
+def test_reverse_prune_keeps_guards():
+	tape = Tape()
+	x, y = tape.variables([1, 2])
+	unused = ef.exp(x * y)
+	flag = x + y > 1
+	f, = tape.prune([x * x])
+	assert tape.pruned == 2 and len(tape) == 5
+	assert tape.replay([3, 4]) and tape.value(f) == 9 and not tape.replay([-3, 1])
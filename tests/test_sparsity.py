@@ -0,0 +1,175 @@
+# Tests for Sparsity.py
+import numpy as np
+import pytest
+from hotAD.Sparsity import (CSRMatrix, jacobian_pattern, color_columns, seed_matrix, recover_jacobian,
+	hessian_pattern, color_star, recover_hessian)
+from hotAD.ReverseAD import Tape, TracedFunction
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import J_F, Newton, Mini
+
+# Discretized boundary value problem: each residual depends on three neighbours
+def F_band(x):
+	m = len(x)
+	return [2*x[i] - (x[i-1] if i > 0 else 0) - (x[i+1] if i < m-1 else 0) + 0.1*ef.exp(x[i]) - 1 for i in range(m)]
+
+# Chained Rosenbrock function: partially separable, with a tridiagonal Hessian
+def F_chain(x):
+	f = 0
+	for i in range(len(x) - 1):
+		f = f + 100*(x[i+1] - x[i]*x[i])*(x[i+1] - x[i]*x[i]) + (1 - x[i])*(1 - x[i])
+	return [f]
+
+# CSRMatrix
+def test_csr_toarray_matmul():
+	A = CSRMatrix([1.0, 2.0, 3.0, 4.0], [1, 3, 0, 2], [0, 2, 2, 4], (3, 4))
+	dense = np.array([[0, 1, 0, 2], [0, 0, 0, 0], [3, 0, 4, 0]], dtype=float)
+	assert np.array_equal(A.toarray(), dense) and A.nnz == 4
+	assert np.allclose(A @ [1, 2, 3, 4], dense @ [1, 2, 3, 4])
+
+def test_csr_inconsistent():
+	with pytest.raises(ValueError):
+		CSRMatrix([1.0], [0, 1], [0, 1], (1, 2))
+	with pytest.raises(ValueError):
+		CSRMatrix([1.0], [0], [0, 1], (1, 2)) @ [1, 2, 3]
+
+# pattern detection
+def test_jacobian_pattern_band():
+	tape = Tape()
+	x = tape.variables([0.1] * 6)
+	pattern = jacobian_pattern(tape, F_band(x))
+	assert pattern.nnz == 16
+	assert np.array_equal(pattern.toarray(), (np.abs(np.subtract.outer(range(6), range(6))) <= 1).astype(float))
+
+def test_jacobian_pattern_large():
+	m = 20000
+	tape = Tape()
+	x = tape.variables([0.1] * m)
+	pattern = jacobian_pattern(tape, F_band(x))
+	assert pattern.nnz == 3*m - 2 and pattern.indices[:5].tolist() == [0, 1, 0, 1, 2]
+	assert pattern.indices[-2:].tolist() == [m-2, m-1]
+
+def test_jacobian_pattern_dense_sum():
+	tape = Tape()
+	x = tape.variables([0.1] * 50)
+	f = 0
+	for v in x:
+		f = f + v * v
+	g = x[0] * 2
+	assert jacobian_pattern(tape, [f, g, f * x[3]]).toarray().sum(axis=1).tolist() == [50, 1, 50]
+
+def test_jacobian_pattern_constant_output():
+	tape = Tape()
+	x, y = tape.variables([1, 2])
+	pattern = jacobian_pattern(tape, [x * 0 + 3, ef.sin(y)])
+	assert pattern.toarray().tolist() == [[0, 0], [0, 1]]
+
+# coloring
+def test_color_columns_valid():
+	rng = np.random.RandomState(0)
+	dense = rng.rand(30, 40) < 0.1
+	pattern = CSRMatrix.from_rows([list(np.flatnonzero(row)) for row in dense], 40)
+	colors = color_columns(pattern)
+	for row in dense:
+		assert len(set(colors[row])) == row.sum()
+	S = seed_matrix(colors)
+	assert S.shape == (40, colors.max() + 1) and np.all(S.sum(axis=1) == 1)
+
+def test_recover_jacobian():
+	J = np.array([[1.0, 0, 2], [0, 3, 0]])
+	pattern = CSRMatrix.from_rows([[0, 2], [1]], 3)
+	colors = color_columns(pattern)
+	assert np.array_equal(recover_jacobian(pattern, colors, J @ seed_matrix(colors)).toarray(), J)
+
+# sparse Jacobian
+def test_sparse_jacobian_matches_dense():
+	G = TracedFunction(F_band)
+	for x in ([0.1] * 20, list(np.linspace(-1, 1, 20))):
+		val, J = G.sparse_jacobian(x)
+		ref = J_F(F_band, x)
+		assert np.allclose(val, ref[0]) and np.allclose(J.toarray(), ref[1])
+	assert G.sparsity[1].max() + 1 == 3 and G.traces == 1
+
+def test_sparse_jacobian_retrace():
+	F = lambda x: [x[0] * x[1] if x[0] > 0 else x[1] + 0.0 * x[0], x[1]]
+	G = TracedFunction(F)
+	assert G.sparse_jacobian([1, 2])[1].nnz == 3
+	assert G.sparse_jacobian([-1, 2])[1].nnz == 2 and G.traces == 2
+
+def test_j_f_sparse():
+	x = list(np.linspace(0, 1, 12))
+	val, J = J_F(F_band, x, sparse=True)
+	assert isinstance(J, CSRMatrix) and np.allclose(J.toarray(), J_F(F_band, x)[1])
+
+def test_newton_sparse():
+	x = [0.0] * 10
+	dense, sparse = Newton(F_band, x), Newton(F_band, x, sparse=True)
+	assert np.allclose(dense['x_min: '], sparse['x_min: ']) and dense['number of iter: '] == sparse['number of iter: ']
+
+# sparse Hessian
+def test_hessian_pattern():
+	tape = Tape()
+	x = tape.variables([1, 2, 3, 4, 5])
+	f = x[0] * x[1] + ef.sin(x[2]) + x[3] / x[4] + 3 * x[1] + x[0] ** 1.0
+	assert hessian_pattern(tape, f).toarray().tolist() == [[0, 1, 0, 0, 0], [1, 0, 0, 0, 0],
+		[0, 0, 1, 0, 0], [0, 0, 0, 0, 1], [0, 0, 0, 1, 1]]
+
+def test_hessian_pattern_large():
+	m = 20000
+	tape = Tape()
+	x = tape.variables([0.1] * m)
+	f = 0
+	for i in range(m - 1):
+		f = f + (x[i+1] - x[i]) * (x[i+1] - x[i]) + ef.exp(x[i])
+	pattern = hessian_pattern(tape, f)
+	assert pattern.nnz == 3*m - 2 and pattern.indices[-2:].tolist() == [m-2, m-1]
+
+def test_hessian_pattern_unused_nonlinear():
+	tape = Tape()
+	x, y = tape.variables([1, 2])
+	f = x + y
+	unused = ef.exp(x * y)
+	assert hessian_pattern(tape, f).nnz == 0
+
+def test_color_star_recovers_random():
+	rng = np.random.RandomState(1)
+	for trial in range(50):
+		m = rng.randint(2, 25)
+		A = rng.rand(m, m) < rng.uniform(0.05, 0.4)
+		A = A | A.T
+		H = np.where(A, rng.randn(m, m), 0)
+		H = H + H.T
+		pattern = CSRMatrix.from_rows([list(np.flatnonzero(row)) for row in A], m)
+		colors = color_star(pattern)
+		for i, j in zip(*np.nonzero(A)):
+			assert i == j or colors[i] != colors[j]
+		assert np.allclose(recover_hessian(pattern, colors, H @ seed_matrix(colors)).toarray(), H)
+
+def test_color_star_band():
+	tape = Tape()
+	x = tape.variables([0.5] * 30)
+	colors = color_star(hessian_pattern(tape, F_chain(x)[0]))
+	assert colors.max() + 1 == 3
+
+def test_sparse_hessian_matches_dense():
+	G = TracedFunction(F_chain)
+	for x in ([0.5] * 12, list(np.linspace(-1, 2, 12))):
+		val, J, H = G.sparse_jacobian(x, H=True)
+		ref = J_F(F_chain, x, H=True)
+		assert np.allclose(val, ref[0]) and np.allclose(J.toarray(), ref[1]) and np.allclose(H.toarray(), ref[2])
+	assert G.hessian_sparsity[0].nnz == 34 and G.traces == 1
+
+def test_sparse_hessian_vector_function():
+	with pytest.raises(ValueError):
+		TracedFunction(F_band).sparse_jacobian([1, 2], H=True)
+
+def test_j_f_sparse_hessian():
+	val, J, H = J_F(F_chain, [0.3] * 8, H=True, sparse=True)
+	assert isinstance(J, CSRMatrix) and isinstance(H, CSRMatrix)
+	assert np.allclose(H.toarray(), J_F(F_chain, [0.3] * 8, H=True)[2])
+
+def test_mini_newton_sparse():
+	x = [-1.0, 1.5, 0.5, 1.2]
+	dense, sparse = Mini(F_chain, x, method="newton"), Mini(F_chain, x, method="newton", sparse=True)
+	assert np.allclose(dense['x_min'], sparse['x_min']) and dense['number of iter'] == sparse['number of iter']
+	assert np.allclose(dense['Jacobian F(x_min)'], sparse['Jacobian F(x_min)'])
+	assert np.allclose(dense['Hessian F(x_min)'], sparse['Hessian F(x_min)'].toarray())
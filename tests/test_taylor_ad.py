@@ -0,0 +1,82 @@
+# Tests for TaylorAD.py
+import math
+import numpy as np
+import pytest
+from hotAD.TaylorAD import TaylorAD
+from hotAD.AutoDiffObject import AutoDiff
+from hotAD.ElementaryFunctions import ElementaryFunctions as ef
+from hotAD.ADfun import taylor, J_F
+
+K = 6
+orders = np.arange(K + 1)
+
+# Input args
+def test_taylor_args():
+	with pytest.raises(TypeError):
+		TaylorAD.variable("two", 3)
+	with pytest.raises(TypeError):
+		TaylorAD.variable(2, -1)
+	with pytest.raises(TypeError):
+		TaylorAD([[1, 2]])
+
+def test_taylor_order_mismatch():
+	with pytest.raises(ValueError):
+		TaylorAD.variable(1, 2) + TaylorAD.variable(1, 3)
+
+def test_taylor_illegal_arg():
+	with pytest.raises(AttributeError):
+		TaylorAD.variable(1, 2) * "two"
+
+# Derivatives of any order against closed forms
+def test_taylor_exp_sin():
+	x = TaylorAD.variable(0.3, K)
+	assert np.allclose(ef.exp(x).derivatives(), np.exp(0.3))
+	assert np.allclose(ef.sin(x).derivatives(), [math.sin(0.3 + k * math.pi / 2) for k in orders])
+
+def test_taylor_log_div():
+	x = TaylorAD.variable(0.7, K)
+	assert np.allclose(ef.log(x).derivatives()[1:], [(-1)**(k-1) * math.factorial(k-1) / 0.7**k for k in orders[1:]])
+	assert np.allclose((1 / x).derivatives(), [(-1)**k * math.factorial(k) / 0.7**(k+1) for k in orders])
+
+def test_taylor_power():
+	x = TaylorAD.variable(0.7, K)
+	for r in (2.5, -3, 4):
+		ref = [np.prod([r - j for j in range(k)]) * 0.7**(r - k) for k in orders]
+		assert np.allclose((x ** r).derivatives(), ref) and np.allclose(ef.power(x, r).derivatives(), ref)
+	assert np.allclose((2 ** x).derivatives(), [2**0.7 * math.log(2)**k for k in orders])
+	assert np.allclose((x ** x).coef, ef.exp(x * ef.log(x)).coef)
+	assert np.allclose((TaylorAD.variable(0, 4) ** 3).derivatives(), [0, 0, 0, 6, 0])
+
+def test_taylor_inverse_functions():
+	x = TaylorAD.variable(0.4, K)
+	assert np.allclose(ef.arcsin(ef.sin(x)).coef, x.coef)
+	assert np.allclose(ef.arccos(ef.cos(x)).coef, x.coef)
+	assert np.allclose(ef.arctan(ef.tan(x)).coef, x.coef)
+	assert np.allclose(ef.sqrt(x * x).coef, x.coef)
+	assert np.allclose(ef.logit(x).coef, (1 / (1 + ef.exp(-x))).coef)
+
+def test_taylor_matches_second_order_autodiff():
+	f = lambda z: ef.arctan(z * z) * ef.sqrt(z) + ef.logit(z) * ef.arcsin(z) / ef.cos(z)
+	a = f(AutoDiff(0.3, "a", H=True))
+	assert np.allclose(f(TaylorAD.variable(0.3, 2)).derivatives(), [a.val, a.der['a'], a.der2['a']])
+
+# Domain errors
+def test_taylor_domain_errors():
+	x = TaylorAD.variable(-1, 3)
+	with pytest.raises(ValueError):
+		ef.log(x)
+	with pytest.raises(ValueError):
+		ef.sqrt(x)
+	with pytest.raises(ValueError):
+		ef.arcsin(x * 2)
+	with pytest.raises(ZeroDivisionError):
+		1 / (x + 1)
+
+# Directional derivatives
+def test_taylor_directional():
+	F = lambda x: [x[0] * x[0] * x[1] + ef.sin(x[1]), 3.0]
+	x, v = [1.0, 2.0], [0.5, -1.0]
+	D = taylor(F, x, v, 3)
+	val, Jac, H = J_F(lambda x: [F(x)[0]], x, H = True)
+	assert np.isclose(D[0, 1], Jac[0] @ v) and np.isclose(D[0, 2], np.array(v) @ H @ v)
+	assert np.isclose(D[0, 3], 6 * 0.5 * 0.5 * -1 + math.cos(2.0)) and np.allclose(D[1], [3, 0, 0, 0])